@@ -1,14 +1,19 @@
 import os
+import functools
+import hashlib
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import httpx
 import logging
 import asyncio
 import time
 import uuid
-from typing import Dict, Any, List, Optional
+import weakref
+import orjson
+from typing import Dict, Any, List, Optional, Iterator, Union, Callable, Awaitable
 from redis.asyncio import Redis
-import html2text
-import logging
+from selectolax.lexbor import LexborHTMLParser as HTMLParser
 # BeautifulSoup for HTML parsing
 
 logger = logging.getLogger(__name__)
@@ -20,6 +25,59 @@ except ImportError:
     HAS_BS4 = False
     logger.warning("BeautifulSoup4 not installed. HTML parsing for AI Overview will not be available. Install with: pip install beautifulsoup4")
 
+# HTML -> markdown conversion for AI Overview responses
+_HTML_SKIP_TAGS = frozenset({'script', 'style', 'noscript', 'svg', 'head', 'template', 'iframe', 'button'})
+_HTML_HEADING_TAGS = {'h1': '#', 'h2': '##', 'h3': '###', 'h4': '####', 'h5': '#####', 'h6': '######'}
+_HTML_BLOCK_TAGS = frozenset({'p', 'div', 'section', 'article', 'main', 'ul', 'ol', 'table', 'tr',
+                              'br', 'blockquote', 'pre', 'header', 'footer', 'body', 'html'})
+
+def _html_to_markdown_lines(root) -> List[str]:
+    """Walk a selectolax tree once and return one markdown line per heading, list item or text block"""
+    lines = []
+    inline = []
+
+    def flush():
+        text = ' '.join(''.join(inline).split())
+        if text:
+            lines.append(text)
+        inline.clear()
+
+    def walk(node):
+        for child in node.iter(include_text=True):
+            tag = child.tag
+            if tag == '-text':
+                inline.append(child.text_content or '')
+            elif tag in _HTML_SKIP_TAGS:
+                continue
+            elif tag in _HTML_HEADING_TAGS:
+                flush()
+                text = ' '.join(child.text(separator=' ').split())
+                if text:
+                    lines.append(f"{_HTML_HEADING_TAGS[tag]} {text}")
+            elif tag == 'li':
+                flush()
+                text = ' '.join(child.text(separator=' ').split())
+                if text:
+                    lines.append(f"- {text}")
+            elif tag in _HTML_BLOCK_TAGS:
+                flush()
+                walk(child)
+                flush()
+            else:
+                walk(child)
+
+    walk(root)
+    flush()
+    return lines
+
+_INCR_WITH_EXPIRE_LUA = """
+local v = redis.call('INCR', KEYS[1])
+if v == 1 then
+    redis.call('PEXPIRE', KEYS[1], ARGV[1])
+end
+return v
+"""
+
 # Redis Fixed Window Rate Limiter for distributed RPS control
 class RedisFixedWindowRPS:
     """
@@ -30,32 +88,133 @@ class RedisFixedWindowRPS:
         self.r = redis
         self.base_key = base_key      # e.g. "rate:scrapingdog"
         self.rps = int(rps)
-        self.window_ms = 1500
+        self.window_ms = 1000
+        # INCR + first-hit PEXPIRE in a single atomic round-trip
+        self._incr_script = redis.register_script(_INCR_WITH_EXPIRE_LUA)
 
     async def acquire(self):
         while True:
-            now_ms = int(time.time() * 1500)
+            now_ms = int(time.time() * 1000)
             bucket = now_ms // self.window_ms
             key = f"{self.base_key}:{bucket}"
 
             try:
                 # increment this second's counter and ensure it expires
-                val = await self.r.incr(key)
-                if val == 1:
-                    # expire slightly after 1s so keys don't accumulate
-                    await self.r.pexpire(key, self.window_ms + 100)
+                # slightly after 1s so keys don't accumulate
+                val = await self._incr_script(keys=[key], args=[self.window_ms + 100])
 
                 if val <= self.rps:
-                    logging.info(f"Rate limiter allowed request {val}/{self.rps} in current window")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Rate limiter allowed request %d/%d in current window", val, self.rps)
                     return  # allowed this second
 
                 # too many this second -> sleep to next second boundary
                 wait_ms = self.window_ms - (now_ms % self.window_ms)
-                await asyncio.sleep(wait_ms / 1500.0)
+                await asyncio.sleep(wait_ms / 1000.0)
             except Exception as e:
                 logger.warning(f"Rate limiter error: {e}, proceeding without rate limit")
                 return  # Fail open - don't block on Redis errors
 
+# redis.asyncio pools are bound to the loop that opened them; tools run each call
+# under a fresh asyncio.run, so the pool and limiter are kept per running loop
+_scrapingdog_redis_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Redis]" = weakref.WeakKeyDictionary()
+_scrapingdog_limiters: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, RedisFixedWindowRPS]" = weakref.WeakKeyDictionary()
+
+@functools.lru_cache(maxsize=1)
+def _get_scrapingdog_redis_url() -> Optional[str]:
+    redis_url = os.getenv('REDIS_URL')
+    if not redis_url:
+        logger.warning("REDIS_URL not set, ScrapingDog rate limiting disabled")
+    return redis_url
+
+def _get_scrapingdog_redis() -> Optional[Redis]:
+    """Redis connection pool for ScrapingDog rate limiting and caching on the running loop, or None without REDIS_URL"""
+    redis_url = _get_scrapingdog_redis_url()
+    if not redis_url:
+        return None
+
+    loop = asyncio.get_running_loop()
+    redis = _scrapingdog_redis_pools.get(loop)
+    if redis is None:
+        try:
+            redis = Redis.from_url(redis_url, max_connections=50)
+        except Exception as e:
+            logger.warning(f"Failed to initialize Redis rate limiter: {e}")
+            return None
+        _scrapingdog_redis_pools[loop] = redis
+    return redis
+
+def _get_scrapingdog_limiter() -> Optional[RedisFixedWindowRPS]:
+    """ScrapingDog rate limiter shared by every ScrapingDogClient on the running loop"""
+    redis = _get_scrapingdog_redis()
+    if redis is None:
+        return None
+
+    loop = asyncio.get_running_loop()
+    limiter = _scrapingdog_limiters.get(loop)
+    if limiter is None:
+        rps_limit = int(os.getenv('SCRAPING_DOG_RPS_LIMIT', '5'))  # Default 5 RPS
+        logger.info(f"ScrapingDog rate limiter initialized with {rps_limit} RPS limit")
+        limiter = _scrapingdog_limiters[loop] = RedisFixedWindowRPS(redis, "rate:scrapingdog", rps_limit)
+    return limiter
+
+# Keep-alive HTTP clients for the async ScrapingDog methods, one per running loop: callers
+# build a ScrapingDogClient per call, so a per-instance client never reused a connection
+_scrapingdog_http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+def _get_scrapingdog_http_client() -> httpx.AsyncClient:
+    """HTTP client shared by every ScrapingDogClient on the running loop"""
+    loop = asyncio.get_running_loop()
+    client = _scrapingdog_http_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=30,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+            http2=True
+        )
+        _scrapingdog_http_clients[loop] = client
+    return client
+
+async def close_scrapingdog_clients():
+    """Close the shared ScrapingDog HTTP clients and Redis pools (call once on application shutdown)"""
+    http_clients = list(_scrapingdog_http_clients.values())
+    _scrapingdog_http_clients.clear()
+    for client in http_clients:
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.warning(f"Error closing ScrapingDog HTTP client: {e}")
+
+    pools = list(_scrapingdog_redis_pools.values())
+    _scrapingdog_limiters.clear()
+    _scrapingdog_redis_pools.clear()
+    for redis in pools:
+        try:
+            await redis.close()
+            logger.debug("ScrapingDog Redis connection pool closed")
+        except Exception as e:
+            logger.warning(f"Error closing Redis connection: {e}")
+
+@functools.lru_cache(maxsize=1)
+def _get_requests_session() -> requests.Session:
+    """Process-wide keep-alive session for the synchronous ScrapingDog and Bright Data methods"""
+    session = requests.Session()
+    # Retry connection failures only; a retried read could bill the same scrape twice
+    adapter = HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=64,
+        max_retries=Retry(total=3, read=0, backoff_factor=0.3)
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+SCRAPINGDOG_SCRAPE_URL = "https://api.scrapingdog.com/scrape"
+SCRAPINGDOG_AI_MODE_URL = "https://api.scrapingdog.com/google/ai_mode"
+SCRAPINGDOG_GOOGLE_URL = "https://api.scrapingdog.com/google/"
+# Seconds to cache google_search / AI Overview results per (query, country); 0 disables
+SCRAPINGDOG_CACHE_TTL = int(os.getenv('SCRAPINGDOG_CACHE_TTL', '900'))
+
 class ScrapingDogClient:
     """Simple Scraping Dog API client"""
 
@@ -64,28 +223,18 @@ class ScrapingDogClient:
         if not self.api_key:
             logger.warning("SCRAPING_DOG_API_KEY not found in environment variables")
 
-        # Initialize rate limiter
-        self.rate_limiter = None
-        self.redis = None  # Track Redis connection for cleanup
-        redis_url = os.getenv('REDIS_URL')
-        rps_limit = int(os.getenv('SCRAPING_DOG_RPS_LIMIT', '5'))  # Default 5 RPS
+        # Max concurrent in-flight HTTP requests from this client's async methods
+        self._inflight = asyncio.Semaphore(int(os.getenv('SCRAPINGDOG_MAX_INFLIGHT', '20')))
 
-        if redis_url:
-            try:
-                # Create Redis connection and rate limiter
-                self.redis = Redis.from_url(redis_url)
-                self.rate_limiter = RedisFixedWindowRPS(
-                    self.redis,
-                    "rate:scrapingdog",
-                    rps_limit
-                )
-                logger.info(f"ScrapingDog rate limiter initialized with {rps_limit} RPS limit")
-            except Exception as e:
-                logger.warning(f"Failed to initialize Redis rate limiter: {e}")
-                self.rate_limiter = None
-                self.redis = None
-        else:
-            logger.warning("REDIS_URL not set, ScrapingDog rate limiting disabled")
+    @property
+    def _client(self) -> httpx.AsyncClient:
+        """Shared keep-alive HTTP client for the running loop (see _get_scrapingdog_http_client)"""
+        return _get_scrapingdog_http_client()
+
+    @property
+    def rate_limiter(self) -> Optional[RedisFixedWindowRPS]:
+        """Shared rate limiter for the running loop (see _get_scrapingdog_limiter)"""
+        return _get_scrapingdog_limiter()
         
     def scrape_page(self, url: str, js_rendering: bool = False) -> Dict[str, Any]:
         """Scrape a page using Scraping Dog API"""
@@ -94,31 +243,38 @@ class ScrapingDogClient:
 
         # Note: Rate limiting is handled in the async wrapper methods
         try:
-            logger.info(f"Scraping URL via Scraping Dog API: {url}")
-            response = requests.get("https://api.scrapingdog.com/scrape", params={
-                'api_key': self.api_key,
-                'url': url,
-                'dynamic': 'true' if js_rendering else 'false',
-            }, timeout=30)
-            
-            if response.status_code == 200:
-                return {
-                    'html_content': response.text,
-                    'success': True,
-                    'error': None
-                }
-            else:
-                return {
-                    'html_content': '',
-                    'success': False,
-                    'error': f"HTTP {response.status_code}"
-                }
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Scraping URL via Scraping Dog API: %s", url)
+            response = _get_requests_session().get(SCRAPINGDOG_SCRAPE_URL, params=self._scrape_params(url, js_rendering), timeout=30)
+            return self._scrape_result(response)
         except Exception as e:
             return {
                 'html_content': '',
                 'success': False,
                 'error': str(e)
             }
+
+    def _scrape_params(self, url: str, js_rendering: bool) -> Dict[str, str]:
+        return {
+            'api_key': self.api_key,
+            'url': url,
+            'dynamic': 'true' if js_rendering else 'false',
+        }
+
+    def _scrape_result(self, response) -> Dict[str, Any]:
+        """Build the scrape_page result from a requests/httpx response"""
+        if response.status_code == 200:
+            return {
+                'html_content': response.text,
+                'success': True,
+                'error': None
+            }
+        else:
+            return {
+                'html_content': '',
+                'success': False,
+                'error': f"HTTP {response.status_code}"
+            }
     
     def get_ai_overview(self, query: str, country: str = "us", return_html: bool = False) -> Dict[str, Any]:
         """
@@ -144,58 +300,61 @@ class ScrapingDogClient:
         # Note: Rate limiting is handled in the async wrapper methods
 
         try:
-            # Build request parameters
-            params = {
-                'api_key': self.api_key,
-                'query': query,
-                'country': country,
+            response = _get_requests_session().get(SCRAPINGDOG_AI_MODE_URL,
+                                                   params=self._ai_overview_params(query, country, return_html), timeout=30)
+            return self._ai_overview_result(response, return_html)
+        except Exception as e:
+            logging.error(f"Error getting AI overview: {e}")
+            return {
+                'ai_overview': '',
+                'full_response': {},
+                'success': False,
+                'error': str(e)
             }
 
-            # Add html parameter if HTML format is requested
+    def _ai_overview_params(self, query: str, country: str, return_html: bool) -> Dict[str, str]:
+        params = {
+            'api_key': self.api_key,
+            'query': query,
+            'country': country,
+        }
+
+        # Add html parameter if HTML format is requested
+        if return_html:
+            params['html'] = 'true'
+        return params
+
+    def _ai_overview_result(self, response, return_html: bool) -> Dict[str, Any]:
+        """Build the get_ai_overview result from a requests/httpx response"""
+        if response.status_code == 200:
             if return_html:
-                params['html'] = 'true'
-
-            response = requests.get("https://api.scrapingdog.com/google/ai_mode",
-                                   params=params, timeout=30)
-
-            if response.status_code == 200:
-                if return_html:
-                    # Parse HTML response with BeautifulSoup
-                    html_content = response.text
-                    ai_overview = self._parse_ai_overview_html(html_content)
-
-                    return {
-                        'ai_overview': ai_overview,
-                        # 'full_response': {'html': html_content},  # Store raw HTML for debugging
-                        'success': True,
-                        'error': None
-                    }
-                else:
-                    # Parse JSON response (existing logic)
-                    data = response.json()
-                    ai_overview = self._format_ai_overview(data)
-
-                    return {
-                        'ai_overview': ai_overview,
-                        'full_response': data,
-                        'success': True,
-                        'error': None
-                    }
+                # Parse the raw HTML bytes directly, skipping a str decode
+                ai_overview = self._parse_ai_overview_html(response.content)
+
+                return {
+                    'ai_overview': ai_overview,
+                    # 'full_response': {'html': html_content},  # Store raw HTML for debugging
+                    'success': True,
+                    'error': None
+                }
             else:
-                logging.error(f"Scraping Dog AI overview error: HTTP {response.status_code}")
+                # Parse JSON response (existing logic)
+                data = response.json()
+                ai_overview = self._format_ai_overview(data)
+
                 return {
-                    'ai_overview': '',
-                    'full_response': {},
-                    'success': False,
-                    'error': f"HTTP {response.status_code}"
+                    'ai_overview': ai_overview,
+                    'full_response': data,
+                    'success': True,
+                    'error': None
                 }
-        except Exception as e:
-            logging.error(f"Error getting AI overview: {e}")
+        else:
+            logging.error(f"Scraping Dog AI overview error: HTTP {response.status_code}")
             return {
                 'ai_overview': '',
                 'full_response': {},
                 'success': False,
-                'error': str(e)
+                'error': f"HTTP {response.status_code}"
             }
 
     def google_search(self, query: str, num: int = 10, country: str = "us") -> List[Dict[str, Any]]:
@@ -218,39 +377,13 @@ class ScrapingDogClient:
             return []
 
         try:
-            params = {
-                'api_key': self.api_key,
-                'query': query,
-                'results': 10,  # Cap at API max
-                'country': country,
-                "domain": "google.com"
-            }
-
             logger.info(f"Executing ScrapingDog Google search for query: '{query}' (country: {country})")
-            response = requests.get(
-                "https://api.scrapingdog.com/google/",
-                params=params,
+            response = _get_requests_session().get(
+                SCRAPINGDOG_GOOGLE_URL,
+                params=self._google_search_params(query, country),
                 timeout=30
             )
-
-            response.raise_for_status()
-            data = response.json()
-
-            # Parse organic_data results
-            organic_results = data.get('organic_results', [])
-            candidates = []
-
-            for item in organic_results:
-                candidate = {
-                    'url': item.get('link', ''),
-                    'title': item.get('title', ''),
-                    'snippet': item.get('snippet', ''),
-                    'position': item.get('rank', len(candidates) + 1)
-                }
-                candidates.append(candidate)
-
-            logger.info(f"ScrapingDog Google search returned {len(candidates)} results for '{query}'")
-            return candidates[:num]
+            return self._google_search_result(response, query, num)
 
         except Exception as e:
             logger.error(f"ScrapingDog Google search failed for query '{query}': {e}")
@@ -258,7 +391,7 @@ class ScrapingDogClient:
 
     async def async_google_search(self, query: str, num: int = 10, country: str = "us") -> List[Dict[str, Any]]:
         """
-        Async wrapper for google_search with rate limiting support
+        Async version of google_search with rate limiting and Redis result caching
 
         Args:
             query: Search query string
@@ -268,93 +401,133 @@ class ScrapingDogClient:
         Returns:
             List of search results with url, title, snippet, and position
         """
-        # Apply rate limiting if available
-        if self.rate_limiter:
+        if not self.api_key:
+            logger.warning("ScrapingDog API key not configured for google_search")
+            return []
+
+        key = self._cache_key("search", query, country, str(num))
+        return await self._cached(key, lambda: self._fetch_google_search(query, num, country))
+
+    async def _fetch_google_search(self, query: str, num: int, country: str) -> List[Dict[str, Any]]:
+        """Rate-limited ScrapingDog Google search request (uncached)"""
+        # Cap local in-flight requests before contending on the Redis limiter
+        async with self._inflight:
+            # Apply rate limiting if available
+            if self.rate_limiter:
+                try:
+                    await self.rate_limiter.acquire()
+                except Exception as e:
+                    logger.warning(f"Rate limiter error in async_google_search: {e}, proceeding without rate limit")
+
             try:
-                await self.rate_limiter.acquire()
+                logger.info(f"Executing ScrapingDog Google search for query: '{query}' (country: {country})")
+                response = await self._client.get(
+                    SCRAPINGDOG_GOOGLE_URL,
+                    params=self._google_search_params(query, country)
+                )
+                return self._google_search_result(response, query, num)
+
             except Exception as e:
-                logger.warning(f"Rate limiter error in async_google_search: {e}, proceeding without rate limit")
+                logger.error(f"ScrapingDog Google search failed for query '{query}': {e}")
+                return []
+
+    def _google_search_params(self, query: str, country: str) -> Dict[str, Any]:
+        return {
+            'api_key': self.api_key,
+            'query': query,
+            'results': 10,  # Cap at API max
+            'country': country,
+            "domain": "google.com"
+        }
+
+    def _google_search_result(self, response, query: str, num: int) -> List[Dict[str, Any]]:
+        """Parse organic results from a requests/httpx google_search response"""
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+
+        # Parse organic_data results
+        candidates = [
+            {
+                'url': item.get('link', ''),
+                'title': item.get('title', ''),
+                'snippet': item.get('snippet', ''),
+                'position': item.get('rank', idx + 1)
+            }
+            for idx, item in enumerate(data.get('organic_results', []))
+        ]
 
-        # Call synchronous google_search method
-        return self.google_search(query=query, num=num, country=country)
+        logger.info(f"ScrapingDog Google search returned {len(candidates)} results for '{query}'")
+        return candidates[:num]
 
     def _format_ai_overview(self, data: Dict[str, Any]) -> str:
         """Format the AI overview response into a comprehensive string"""
-        formatted_text = []
-        
+        return "\n".join(self._iter_ai_overview_lines(data))
+
+    def _iter_ai_overview_lines(self, data: Dict[str, Any]) -> Iterator[str]:
+        """Yield the formatted AI overview lines (text blocks, then references) in order"""
         # Process text blocks
-        text_blocks = data.get('text_blocks', [])
-        for block in text_blocks:
+        for block in data.get('text_blocks', []):
             block_type = block.get('type', '')
-            
+
             if block_type == 'paragraph':
-                snippet = block.get('snippet', '').strip()
+                snippet = (block.get('snippet') or '').strip()
                 if snippet:
-                    formatted_text.append(f"Paragraph:\n{snippet}\n")
-            
+                    yield f"Paragraph:\n{snippet}\n"
+
             elif block_type == 'list':
                 items = block.get('items', [])
                 if items:
-                    formatted_text.append("List:")
+                    yield "List:"
                     for item in items:
-                        snippet = item.get('snippet', '').strip()
+                        snippet = (item.get('snippet') or '').strip()
                         if snippet:
-                            formatted_text.append(f"- {snippet}")
-                    formatted_text.append("")  # Add empty line after list
-        
+                            yield f"- {snippet}"
+                    yield ""  # Add empty line after list
+
         # Process references
         references = data.get('references', [])
         if references:
-            formatted_text.append("References:")
+            yield "References:"
             for ref in references:
-                title = ref.get('title', '').strip()
-                snippet = ref.get('snippet', '').strip()
-                source = ref.get('source', '').strip()
-                
-                if title or snippet or source:
-                    ref_parts = []
-                    if title:
-                        ref_parts.append(f"Title: {title}")
-                    if snippet:
-                        ref_parts.append(f"Snippet: {snippet}")
-                    if source:
-                        ref_parts.append(f"Source: {source}")
-                    
-                    formatted_text.append(" | ".join(ref_parts))
-        
-        return "\n".join(formatted_text)
+                title = (ref.get('title') or '').strip()
+                snippet = (ref.get('snippet') or '').strip()
+                source = (ref.get('source') or '').strip()
 
-    def _parse_ai_overview_html(self, html_content: str) -> str:
+                if title or snippet or source:
+                    yield " | ".join(
+                        part for part in (
+                            f"Title: {title}" if title else "",
+                            f"Snippet: {snippet}" if snippet else "",
+                            f"Source: {source}" if source else "",
+                        ) if part
+                    )
+
+    def _parse_ai_overview_html(self, html_content: Union[str, bytes]) -> str:
         """
-        Parse HTML AI overview response and convert to markdown using html2text
+        Parse HTML AI overview response and convert to markdown using selectolax
 
         This method parses the raw HTML returned by ScrapingDog's AI Overview API
-        when html=true parameter is used. It converts the HTML to clean markdown.
+        when html=true parameter is used. It converts the HTML to clean markdown
+        (headings, paragraphs and list items; links, images and scripts dropped).
 
         Args:
-            html_content: Raw HTML response from ScrapingDog
+            html_content: Raw HTML response from ScrapingDog (str or undecoded bytes)
 
         Returns:
             Markdown-formatted AI overview text with sources
         """
-        # Convert HTML to markdown using html2text
-        h = html2text.HTML2Text()
-        h.ignore_links = True
-        h.body_width = 0  # Don't wrap lines
-        h.ignore_images = True
-        h.ignore_emphasis = False
-
-        markdown = h.handle(html_content)
+        tree = HTMLParser(html_content)
+        markdown = "\n\n".join(_html_to_markdown_lines(tree.root)) if tree.root else ""
 
-        if not markdown.strip():
+        if not markdown:
             logger.warning("HTML to markdown conversion produced empty result")
 
-        return markdown.strip()
+        return markdown
 
-    # Async wrapper methods for parallel processing
+    # Async methods for parallel processing
     async def scrape_page_async(self, url: str, js_rendering: bool = False) -> Dict[str, Any]:
         """
-        Async wrapper for scrape_page method with rate limiting
+        Async version of scrape_page with rate limiting
 
         Args:
             url: URL to scrape
@@ -363,16 +536,31 @@ class ScrapingDogClient:
         Returns:
             Dict with html_content, success status, and error if any
         """
-        # Apply rate limiting if available
-        if self.rate_limiter:
-            await self.rate_limiter.acquire()
-        # If no rate limiter, proceed without it
+        if not self.api_key:
+            return {'html_content': '', 'success': False, 'error': 'API key not configured'}
+
+        # Cap local in-flight requests before contending on the Redis limiter
+        async with self._inflight:
+            # Apply rate limiting if available
+            if self.rate_limiter:
+                await self.rate_limiter.acquire()
+            # If no rate limiter, proceed without it
+
+            try:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Scraping URL via Scraping Dog API: %s", url)
+                response = await self._client.get(SCRAPINGDOG_SCRAPE_URL, params=self._scrape_params(url, js_rendering))
+                return self._scrape_result(response)
+            except Exception as e:
+                return {
+                    'html_content': '',
+                    'success': False,
+                    'error': str(e)
+                }
 
-        return await asyncio.to_thread(self.scrape_page, url, js_rendering)
-    
     async def get_ai_overview_async(self, query: str, country: str = "us", return_html: bool = False) -> Dict[str, Any]:
         """
-        Async wrapper for get_ai_overview method with rate limiting
+        Async version of get_ai_overview with rate limiting and Redis result caching
 
         Args:
             query: Search query
@@ -382,25 +570,77 @@ class ScrapingDogClient:
         Returns:
             Dict with ai_overview text, success status, and error if any
         """
-        # Apply rate limiting if available
-        if self.rate_limiter:
-            await self.rate_limiter.acquire()
-        # If no rate limiter, proceed without it
+        if not self.api_key:
+            return {'ai_overview': '', 'success': False, 'error': 'API key not configured'}
 
-        return await asyncio.to_thread(self.get_ai_overview, query, country, return_html)
+        key = self._cache_key("ai_overview", query, country, "html" if return_html else "json")
+        return await self._cached(
+            key,
+            lambda: self._fetch_ai_overview(query, country, return_html),
+            should_cache=lambda result: result.get('success', False)
+        )
+
+    async def _fetch_ai_overview(self, query: str, country: str, return_html: bool) -> Dict[str, Any]:
+        """Rate-limited ScrapingDog AI Overview request (uncached)"""
+        # Cap local in-flight requests before contending on the Redis limiter
+        async with self._inflight:
+            # Apply rate limiting if available
+            if self.rate_limiter:
+                await self.rate_limiter.acquire()
+            # If no rate limiter, proceed without it
 
-    async def cleanup(self):
-        """Clean up Redis connections to prevent memory leaks"""
-        if self.redis:
             try:
-                await self.redis.close()
-                logger.debug("ScrapingDogClient Redis connection closed")
+                response = await self._client.get(SCRAPINGDOG_AI_MODE_URL,
+                                                  params=self._ai_overview_params(query, country, return_html))
+                return self._ai_overview_result(response, return_html)
+            except Exception as e:
+                logging.error(f"Error getting AI overview: {e}")
+                return {
+                    'ai_overview': '',
+                    'full_response': {},
+                    'success': False,
+                    'error': str(e)
+                }
+
+    @staticmethod
+    def _cache_key(kind: str, *parts: str) -> str:
+        digest = hashlib.blake2b("\x00".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+        return f"sd:{kind}:{digest}"
+
+    async def _cached(self, key: str, producer: Callable[[], Awaitable[Any]],
+                      should_cache: Callable[[Any], bool] = bool) -> Any:
+        """
+        Return the Redis-cached value for `key`, or await `producer()` and cache it
+
+        Reads and writes go through the running loop's pool (see _get_scrapingdog_redis).
+        Redis errors fall through to the producer; results rejected by
+        `should_cache` (failures, empty results) are not stored.
+        """
+        redis = _get_scrapingdog_redis() if SCRAPINGDOG_CACHE_TTL > 0 else None
+        if redis is None:
+            return await producer()
+
+        try:
+            hit = await redis.get(key)
+            if hit:
+                return orjson.loads(hit)
+        except Exception as e:
+            logger.warning(f"ScrapingDog cache read failed: {e}")
+
+        value = await producer()
+
+        if should_cache(value):
+            try:
+                await redis.set(key, orjson.dumps(value), ex=SCRAPINGDOG_CACHE_TTL)
             except Exception as e:
-                logger.warning(f"Error closing Redis connection: {e}")
-            finally:
-                self.redis = None
-                self.rate_limiter = None
+                logger.warning(f"ScrapingDog cache write failed: {e}")
+        return value
+
+    async def cleanup(self):
+        """No per-instance resources: the shared HTTP client and Redis pool stay open until close_scrapingdog_clients()"""
+
 
+BRIGHTDATA_REQUEST_URL = "https://api.brightdata.com/request"
 
 class BrightDataClient:
     """Bright Data API client using web unlocker"""
@@ -413,6 +653,46 @@ class BrightDataClient:
         if not self.api_token:
             logger.warning("BRIGHT_DATA_API_TOKEN not found in environment variables. Bright Data will not work.")
 
+        # Keep-alive HTTP client for the async methods (closed in cleanup)
+        self._client = httpx.AsyncClient(
+            headers=self._headers(),
+            timeout=httpx.Timeout(connect=10, read=20, write=10, pool=10),
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=25),
+            http2=True
+        )
+
+    def _headers(self) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self.api_token}",
+            "Content-Type": "application/json"
+        }
+
+    def _request_body(self, url: str, format_type: str) -> Dict[str, str]:
+        return {
+            "zone": self.zone,
+            "url": url,
+            "format": format_type
+        }
+
+    def _scrape_result(self, response, url: str) -> Dict[str, Any]:
+        """Build the scrape_page result from a requests/httpx response"""
+        if response.status_code == 200:
+            html_content = response.text
+            logger.info(f"Successfully scraped page via Bright Data API: {url}, html length: {len(html_content)}")
+            
+            return {
+                'html_content': html_content,
+                'success': True,
+                'error': None
+            }
+        else:
+            error_msg = f"HTTP {response.status_code}: {response.text}"
+            logger.error(f"Bright Data API error: {error_msg}")
+            return {
+                'html_content': '',
+                'success': False,
+                'error': error_msg
+            }
     
     def scrape_page(self, url: str, format_type: str = "raw") -> Dict[str, Any]:
         """Scrape a page using Bright Data API"""
@@ -422,41 +702,13 @@ class BrightDataClient:
         try:
             logger.info(f"Scraping URL via Bright Data API: {url}")
             
-            headers = {
-                "Authorization": f"Bearer {self.api_token}",
-                "Content-Type": "application/json"
-            }
-            
-            data = {
-                "zone": self.zone,
-                "url": url,
-                "format": format_type
-            }
-            
-            response = requests.post(
-                "https://api.brightdata.com/request",
-                json=data,
-                headers=headers,
+            response = _get_requests_session().post(
+                BRIGHTDATA_REQUEST_URL,
+                json=self._request_body(url, format_type),
+                headers=self._headers(),
                 timeout=(10, 20)
             )
-            
-            if response.status_code == 200:
-                html_content = response.text
-                logger.info(f"Successfully scraped page via Bright Data API: {url}, html length: {len(html_content)}")
-                
-                return {
-                    'html_content': html_content,
-                    'success': True,
-                    'error': None
-                }
-            else:
-                error_msg = f"HTTP {response.status_code}: {response.text}"
-                logger.error(f"Bright Data API error: {error_msg}")
-                return {
-                    'html_content': '',
-                    'success': False,
-                    'error': error_msg
-                }
+            return self._scrape_result(response, url)
             
         except requests.exceptions.Timeout:
             return {
@@ -477,7 +729,43 @@ class BrightDataClient:
                 'error': str(e)
             }
     
-    # Async wrapper methods for parallel processing
+    # Async methods for parallel processing
     async def scrape_page_async(self, url: str, format_type: str = "raw") -> Dict[str, Any]:
-        """Async wrapper for scrape_page method"""
-        return await asyncio.to_thread(self.scrape_page, url, format_type)
\ No newline at end of file
+        """Async version of scrape_page over the persistent HTTP client"""
+        if not self.api_token:
+            return {'html_content': '', 'success': False, 'error': 'Bright Data API token not configured'}
+        
+        try:
+            logger.info(f"Scraping URL via Bright Data API: {url}")
+            
+            response = await self._client.post(
+                BRIGHTDATA_REQUEST_URL,
+                json=self._request_body(url, format_type)
+            )
+            return self._scrape_result(response, url)
+            
+        except httpx.TimeoutException:
+            return {
+                'html_content': '',
+                'success': False,
+                'error': "Request timeout"
+            }
+        except httpx.RequestError as e:
+            return {
+                'html_content': '',
+                'success': False,
+                'error': f"Request error: {str(e)}"
+            }
+        except Exception as e:
+            return {
+                'html_content': '',
+                'success': False,
+                'error': str(e)
+            }
+
+    async def cleanup(self):
+        """Close the HTTP client to prevent connection leaks"""
+        try:
+            await self._client.aclose()
+        except Exception as e:
+            logger.warning(f"Error closing Bright Data HTTP client: {e}")
@@ -865,14 +865,20 @@ class CrawlAdapter:
             finally:
                 self.crawler = None
 
-        # Clean up ScrapingDog Redis connections
+        # Clean up ScrapingDog HTTP connections
         if hasattr(self, 'scraping_dog') and self.scraping_dog:
             try:
                 await self.scraping_dog.cleanup()
             except Exception as e:
                 logger.warning(f"Error cleaning up ScrapingDog client: {e}")
 
-        # Note: BrightDataClient doesn't have persistent connections to clean up
+        # Clean up Bright Data HTTP connections
+        if hasattr(self, 'bright_data') and self.bright_data:
+            try:
+                await self.bright_data.cleanup()
+            except Exception as e:
+                logger.warning(f"Error cleaning up Bright Data client: {e}")
+
         logger.debug("CrawlAdapter cleanup completed")
 
 
@@ -1,14 +1,99 @@
-from apify_client import ApifyClient
+from apify_client import ApifyClientAsync
+import aiohttp
+import asyncio
+import hmac
 import json
+import logging
 import os
-import requests
+import time
 import urllib.parse
-from typing import List, Dict, Optional
+import weakref
+from collections import OrderedDict
+from typing import List, Dict, Optional, Tuple
 from dotenv import load_dotenv
 from pathlib import Path
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Public URL of the /webhooks/apify endpoint and the shared secret it requires; when both are set,
+# actor runs are awaited via webhook instead of polling
+APIFY_WEBHOOK_URL = os.getenv("APIFY_WEBHOOK_URL")
+APIFY_WEBHOOK_SECRET = os.getenv("APIFY_WEBHOOK_SECRET")
+
+# Seconds to wait for the finish webhook before falling back to polling the run
+APIFY_WEBHOOK_TIMEOUT = int(os.getenv("APIFY_WEBHOOK_TIMEOUT", "900"))
+
+# Apify run statuses after which a run no longer changes
+APIFY_TERMINAL_STATUSES = frozenset({"SUCCEEDED", "FAILED", "TIMED-OUT", "ABORTED"})
+
+# Actor runs waiting for their finish webhook, by run ID. Each future belongs to the loop of the
+# scrape that started the run, which is usually not the web server's loop (tools run under
+# asyncio.run in worker threads)
+_apify_run_futures: Dict[str, asyncio.Future] = {}
+
+# Advertiser lookups cached per (domain, region): seconds to keep an entry and max entries kept
+ADVERTISER_CACHE_TTL = int(os.getenv("ADVERTISER_CACHE_TTL", "3600"))
+ADVERTISER_CACHE_SIZE = 1024
+
+# Items per Apify dataset page when collecting scraped ads
+DATASET_PAGE_SIZE = 256
+
+# (domain, region) -> (expiry timestamp, search_advertiser result), in least-recently-used order
+_advertiser_cache: "OrderedDict[Tuple[str, str], Tuple[float, Dict]]" = OrderedDict()
+
+# SerpAPI sessions, one per running loop (a ClientSession belongs to the loop that opened it);
+# google_ads_tool builds a pipeline per call, so a per-instance session never reused a connection
+_serpapi_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = weakref.WeakKeyDictionary()
+
+
+def _get_serpapi_session() -> aiohttp.ClientSession:
+    """SerpAPI session shared by every pipeline on the running loop"""
+    loop = asyncio.get_running_loop()
+    session = _serpapi_sessions.get(loop)
+    if session is None or session.closed:
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300, keepalive_timeout=60)
+        )
+        _serpapi_sessions[loop] = session
+    return session
+
+
+async def close_google_ads_resources():
+    """Close the running loop's shared SerpAPI session (call once on application shutdown)"""
+    session = _serpapi_sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
+
+
+def verify_apify_webhook_secret(token: Optional[str]) -> bool:
+    """True if token matches APIFY_WEBHOOK_SECRET (always False when no secret is configured)"""
+    if not APIFY_WEBHOOK_SECRET or not token:
+        return False
+    return hmac.compare_digest(token.encode(), APIFY_WEBHOOK_SECRET.encode())
+
+
+def _wake(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+
+def resolve_apify_run(run_id: Optional[str]):
+    """
+    Wake the scrape waiting on an actor run reported finished by an Apify webhook
+    
+    Only the run ID is passed on; the waiter re-fetches the run from the Apify API
+    rather than trusting the webhook payload. Safe to call from any thread or loop.
+    
+    Args:
+        run_id: ID of the finished run
+    """
+    future = _apify_run_futures.get(run_id)
+    if future is not None:
+        future.get_loop().call_soon_threadsafe(_wake, future)
+
+
 class GoogleAdsScraperPipeline:
     """Pipeline for searching and scraping Google Ads Transparency data"""
     
@@ -22,26 +107,42 @@ class GoogleAdsScraperPipeline:
         """
         self.serpapi_key = os.getenv("SERPAPI_API_KEY")
         self.apify_token = os.getenv("APIFY_API_TOKEN")
-        self.apify_client = ApifyClient(self.apify_token)
+        self.apify_client = ApifyClientAsync(self.apify_token)
+    
+    def _get_http(self) -> aiohttp.ClientSession:
+        """Return the running loop's shared SerpAPI session (see _get_serpapi_session)"""
+        return _get_serpapi_session()
     
-    async def search_advertiser(self, domain: str, region: str = "RO") -> Dict:
+    async def close(self):
+        """No per-instance resources: the shared SerpAPI session stays open until close_google_ads_resources()"""
+    
+    async def search_advertiser(self, domain: str, region: str = "RO", force_refresh: bool = False) -> Dict:
         """
         Search for advertiser using SerpAPI
         
         Args:
             domain: Domain to search for (e.g., "hubspot.com")
+            force_refresh: Skip the advertiser cache and query SerpAPI again
             
         Returns:
-            Dict with advertiser_id, region, and full API response
+            Dict with advertiser_id, region, and response_summary: the API response trimmed to its
+            search metadata and first ad creative (the same dict is cached for later lookups)
         """
+        key = (domain, region)
+        cached = _advertiser_cache.get(key)
+        if cached is not None and not force_refresh and cached[0] > time.time():
+            _advertiser_cache.move_to_end(key)
+            return cached[1]
+        
+        if not self.serpapi_key:
+            raise ValueError("SERPAPI_API_KEY not found in environment")
         
-        response = requests.get("https://serpapi.com/search", params={
+        async with self._get_http().get("https://serpapi.com/search", params={
             "engine": "google_ads_transparency_center",
             "text": domain,
             "api_key": self.serpapi_key
-        })
-        
-        data = response.json()
+        }) as response:
+            data = await response.json(content_type=None)
         
         if "ad_creatives" not in data or len(data["ad_creatives"]) == 0:
             raise ValueError(f"No ads found for {domain}!")
@@ -51,11 +152,63 @@ class GoogleAdsScraperPipeline:
         advertiser_id = first_ad["advertiser_id"]
         details_url = first_ad.get("details_link", "")
         
-        return {
+        # Keep only the advertiser ID and a trimmed response; full responses for hot domains are
+        # large. Hits and misses return the same shape, so callers see no difference.
+        result = {
             "advertiser_id": advertiser_id,
             "region": region,
-            "full_response": data
+            "response_summary": {
+                "search_metadata": data.get("search_metadata", {}),
+                "ad_creatives": [first_ad]
+            }
         }
+        if ADVERTISER_CACHE_TTL > 0:
+            _advertiser_cache[key] = (time.time() + ADVERTISER_CACHE_TTL, result)
+            _advertiser_cache.move_to_end(key)
+            while len(_advertiser_cache) > ADVERTISER_CACHE_SIZE:
+                _advertiser_cache.popitem(last=False)
+        
+        return result
+    
+    async def _run_actor_with_webhook(self, actor, input_data: Dict) -> Dict:
+        """
+        Start the actor and wait for its finish webhook instead of polling the run status
+        
+        The run is always re-fetched from the Apify API once woken. Falls back to waiting on
+        the run through the API if the webhook does not arrive within APIFY_WEBHOOK_TIMEOUT
+        (e.g. it was delivered to another worker).
+        """
+        separator = "&" if "?" in APIFY_WEBHOOK_URL else "?"
+        request_url = f"{APIFY_WEBHOOK_URL}{separator}token={urllib.parse.quote(APIFY_WEBHOOK_SECRET)}"
+        run = await actor.start(run_input=input_data, webhooks=[{
+            "event_types": [
+                "ACTOR.RUN.SUCCEEDED",
+                "ACTOR.RUN.FAILED",
+                "ACTOR.RUN.TIMED_OUT",
+                "ACTOR.RUN.ABORTED"
+            ],
+            "request_url": request_url
+        }])
+        run_id = run["id"]
+        run_client = self.apify_client.run(run_id)
+        future = asyncio.get_running_loop().create_future()
+        _apify_run_futures[run_id] = future
+        
+        try:
+            # A fast run may have finished (and fired its webhook) before the waiter was registered
+            run = await run_client.get()
+            if run is None or run.get("status") not in APIFY_TERMINAL_STATUSES:
+                try:
+                    await asyncio.wait_for(future, timeout=APIFY_WEBHOOK_TIMEOUT)
+                except asyncio.TimeoutError:
+                    logger.warning(f"No Apify webhook for run {run_id} after {APIFY_WEBHOOK_TIMEOUT}s, polling run status")
+                    return await run_client.wait_for_finish()
+                run = await run_client.get()
+            if run is None or run.get("status") not in APIFY_TERMINAL_STATUSES:
+                return await run_client.wait_for_finish()
+            return run
+        finally:
+            _apify_run_futures.pop(run_id, None)
     
     async def scrape_ads(
         self,
@@ -98,16 +251,23 @@ class GoogleAdsScraperPipeline:
                 "useApifyProxy": True
             }
         }
-        # Run the Actor
-        run = self.apify_client.actor("silva95gustavo/google-ads-scraper").call(run_input=input_data)
+        # Run the Actor (awaited, so other scrapes progress while this run is in flight)
+        actor = self.apify_client.actor("silva95gustavo/google-ads-scraper")
+        if APIFY_WEBHOOK_URL and APIFY_WEBHOOK_SECRET:
+            run = await self._run_actor_with_webhook(actor, input_data)
+        else:
+            run = await actor.call(run_input=input_data)
         
-        # Extract results
-        results = []
-        for item in self.apify_client.dataset(run["defaultDatasetId"]).iterate_items():
-            if "variations" in item:
-                results.append(item["variations"])
+        # Extract results: the first page reports the dataset total, the remaining pages are fetched concurrently
+        dataset = self.apify_client.dataset(run["defaultDatasetId"])
+        first_page = await dataset.list_items(offset=0, limit=DATASET_PAGE_SIZE, fields=["variations"])
+        pages = [first_page] + list(await asyncio.gather(*(
+            dataset.list_items(offset=offset, limit=DATASET_PAGE_SIZE, fields=["variations"])
+            for offset in range(DATASET_PAGE_SIZE, first_page.total, DATASET_PAGE_SIZE)
+        )))
+        results = [item["variations"] for page in pages for item in page.items if "variations" in item]
 
-        print(results)
+        logger.debug(f"Fetched {len(results)} ad variation sets from dataset {run['defaultDatasetId']}")
         return results
     
     
\ No newline at end of file
@@ -3,13 +3,125 @@ from google import genai
 from google.genai import types
 import os
 import asyncio
-import requests
+import aiohttp
+import hashlib
 import tempfile
-from typing import Dict, Any
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Set, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+try:
+    import aiofiles
+    HAS_AIOFILES = True
+except ImportError:
+    # Fallback to blocking writes from the event loop if aiofiles is not available
+    HAS_AIOFILES = False
+
+# Read size for streaming PDF downloads to disk
+DOWNLOAD_CHUNK_SIZE = 65536
+
+# Largest PDF downloaded; bigger bodies are rejected from the headers or as soon as the limit is crossed
+MAX_PDF_BYTES = int(os.getenv("MAX_PDF_BYTES", str(100 * 1024 * 1024)))
+
+# Leading bytes searched for the %PDF- magic before the rest of the body is downloaded
+PDF_SNIFF_BYTES = 1024
+
+# Upload polling: exponential backoff from the initial delay up to the cap, bounded by the timeout
+UPLOAD_POLL_INITIAL_DELAY = 0.1
+UPLOAD_POLL_MAX_DELAY = 4.0
+UPLOAD_POLL_BACKOFF = 1.7
+UPLOAD_TIMEOUT = 120
+
+# Max uploaded PDFs kept in File Search Stores; the least recently used store is deleted beyond this
+PDF_STORE_CACHE_SIZE = int(os.getenv("PDF_STORE_CACHE_SIZE", "8"))
+
+# Seconds a cached File Search Store is reused before it is torn down
+PDF_STORE_TTL = int(os.getenv("PDF_STORE_TTL", "3600"))
+
+# Max concurrent file deletions while tearing down a File Search Store
+CLEANUP_MAX_CONCURRENT_DELETES = 16
+
+# File Search Stores by sha256 of the PDF URL -> (expiry timestamp, store), in least-recently-used
+# order. Process-wide because pdf_tool builds a new adapter (and event loop) for every call
+_store_cache: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+# Guards _store_cache: tool calls run in worker threads, each on its own event loop
+_store_cache_lock = threading.Lock()
+
+# Store creations in flight by URL hash, per event loop (a task belongs to the loop running it),
+# so concurrent misses for one PDF share a single upload
+_store_pending: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Task]]" = weakref.WeakKeyDictionary()
+
+# PDF download sessions, one per running loop (a ClientSession belongs to the loop that opened it)
+_http_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = weakref.WeakKeyDictionary()
+
+# Gemini client shared by all adapters so its HTTP connections are reused across PDFs
+_client: Optional[genai.Client] = None
+
+
+def _get_client() -> genai.Client:
+    """Return the shared Gemini client, creating it on first use"""
+    global _client
+    if _client is None:
+        api_key = os.getenv("GEMINI_API_KEY") or os.getenv("GENAI_API_KEY")
+        if not api_key:
+            raise ValueError("GEMINI_API_KEY not found in environment")
+        _client = genai.Client(api_key=api_key)
+    return _client
+
+
+def _cache_store(key: str, store: Any) -> Tuple[Any, List[Any]]:
+    """
+    Cache a newly uploaded store under key
+
+    Returns the store to use and the stores to delete: expired and evicted entries, or the
+    new store itself when another event loop cached the same PDF first.
+    """
+    now = time.time()
+    with _store_cache_lock:
+        expired = [k for k, (expiry, _) in _store_cache.items() if expiry <= now]
+        stale = [_store_cache.pop(k)[1] for k in expired]
+
+        existing = _store_cache.get(key)
+        if existing is not None:
+            _store_cache.move_to_end(key)
+            return existing[1], stale + [store]
+
+        _store_cache[key] = (now + PDF_STORE_TTL, store)
+        while len(_store_cache) > PDF_STORE_CACHE_SIZE:
+            stale.append(_store_cache.popitem(last=False)[1][1])
+        return store, stale
+
+
+def _get_http_session() -> aiohttp.ClientSession:
+    """Download session shared by every adapter on the running loop"""
+    loop = asyncio.get_running_loop()
+    session = _http_sessions.get(loop)
+    if session is None or session.closed:
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=32, limit_per_host=8, ttl_dns_cache=300, keepalive_timeout=60
+            )
+        )
+        _http_sessions[loop] = session
+    return session
+
+
+async def close_pdf_resources():
+    """Delete the cached File Search Stores and close the download session (call once on application shutdown)"""
+    session = _http_sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
+    with _store_cache_lock:
+        stores = [store for _, store in _store_cache.values()]
+        _store_cache.clear()
+    if stores and _client is not None:
+        await asyncio.gather(*(PDFAdapter._delete_store(_client, store) for store in stores))
+
+
 class PDFAdapter:
     """
     Adapter for processing PDF documents using Google GenAI File Search
@@ -17,119 +129,288 @@ class PDFAdapter:
     Downloads PDFs, uploads to File Search Store, and queries using Gemini
     """
 
-    async def process_pdf(self, url: str, query: str) -> str:
-        """
-        Process a PDF from URL and extract information based on query
+    def __init__(self):
+        # Background store deletions (evicted or expired stores), referenced until they finish
+        # and awaited by close()
+        self._cleanup_tasks: Set["asyncio.Task[None]"] = set()
 
-        Args:
-            url: URL of the PDF document
-            query: Question or extraction task to perform on the PDF
+    def _get_http(self) -> aiohttp.ClientSession:
+        """Return the running loop's shared download session (see _get_http_session)"""
+        return _get_http_session()
 
-        Returns:
-            Extracted information as text
-        """
-        temp_pdf_path = None
-        store = None
-        client = None
+    async def close(self):
+        """Finish this adapter's store deletions (cached stores and the shared session stay open)"""
+        # Wait for the deletions: tasks still pending when the loop shuts down would be cancelled
+        if self._cleanup_tasks:
+            await asyncio.gather(*self._cleanup_tasks, return_exceptions=True)
 
-        try:
-            logger.info(f"PDFAdapter: Downloading PDF from {url}")
+    async def _wait_for_upload(self, client, upload_op):
+        """Poll an upload operation with exponential backoff until it is done"""
+        delay = UPLOAD_POLL_INITIAL_DELAY
+        while not upload_op.done:
+            await asyncio.sleep(delay)
+            upload_op = client.operations.get(upload_op)
+            logger.debug("PDFAdapter: Waiting for upload to complete...")
+            delay = min(delay * UPLOAD_POLL_BACKOFF, UPLOAD_POLL_MAX_DELAY)
+        return upload_op
+
+    async def _download_pdf(self, url: str) -> str:
+        """Stream a PDF to a temporary file and return its path"""
+        logger.info(f"PDFAdapter: Downloading PDF from {url}")
 
-            # Download PDF with streaming
-            response = requests.get(url, timeout=30, stream=True)
+        # Download PDF with streaming
+        download_timeout = aiohttp.ClientTimeout(sock_connect=30, sock_read=30)
+        async with self._get_http().get(url, timeout=download_timeout) as response:
             response.raise_for_status()
 
-            # Validate content type
+            # Validate size and content before streaming the body, so non-PDF pages
+            # (e.g. HTML error or login pages) are abandoned after the first bytes
+            if response.content_length is not None and response.content_length > MAX_PDF_BYTES:
+                raise ValueError(f"PDF too large: {response.content_length} bytes (max {MAX_PDF_BYTES})")
+
             content_type = response.headers.get('Content-Type', '')
-            if 'pdf' not in content_type.lower() and not url.lower().endswith('.pdf'):
-                logger.warning(f"URL may not be a PDF. Content-Type: {content_type}")
+            head = await self._read_head(response.content, PDF_SNIFF_BYTES)
+            if b'%PDF-' not in head:
+                if 'pdf' not in content_type.lower():
+                    raise ValueError(f"URL does not point to a PDF. Content-Type: {content_type}")
+                logger.warning(f"PDF magic bytes not found, trusting Content-Type: {content_type}")
 
-            # Save to temporary file
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-                temp_pdf_path = temp_file.name
-                for chunk in response.iter_content(chunk_size=8192):
-                    temp_file.write(chunk)
+            # Save to temporary file; aiofiles keeps disk writes off the event loop
+            fd, temp_pdf_path = tempfile.mkstemp(suffix='.pdf')
+            self._preallocate(fd, response.content_length)
+            os.close(fd)
+            try:
+                # Opened r+b so the preallocation is kept; the file is truncated to the bytes written
+                # since Content-Length counts encoded bytes when the body is compressed
+                written = 0
+                if HAS_AIOFILES:
+                    async with aiofiles.open(temp_pdf_path, 'r+b') as temp_file:
+                        async for chunk in self._iter_body(response.content, head):
+                            written += len(chunk)
+                            await temp_file.write(chunk)
+                        await temp_file.truncate(written)
+                else:
+                    with open(temp_pdf_path, 'r+b') as temp_file:
+                        async for chunk in self._iter_body(response.content, head):
+                            written += len(chunk)
+                            temp_file.write(chunk)
+                        temp_file.truncate(written)
+            except BaseException:
+                self._remove_temp_file(temp_pdf_path)
+                raise
 
-            logger.info(f"PDFAdapter: Downloaded PDF to {temp_pdf_path}")
+        logger.info(f"PDFAdapter: Downloaded PDF to {temp_pdf_path}")
+        return temp_pdf_path
 
-            # Initialize Gemini client
-            api_key = os.getenv("GEMINI_API_KEY") or os.getenv("GENAI_API_KEY")
-            if not api_key:
-                raise ValueError("GEMINI_API_KEY not found in environment")
+    def _preallocate(self, fd: int, length: Optional[int]):
+        """Reserve length bytes for a download so the filesystem allocates its blocks once"""
+        if not length or not hasattr(os, 'posix_fallocate'):
+            return
+        try:
+            os.posix_fallocate(fd, 0, length)
+        except OSError as e:
+            # Not supported by every filesystem; the file then simply grows as it is written
+            logger.debug(f"PDFAdapter: posix_fallocate failed: {e}")
+
+    async def _read_head(self, content: aiohttp.StreamReader, size: int) -> bytes:
+        """Read up to size bytes from the start of a response body"""
+        head = b''
+        while len(head) < size:
+            chunk = await content.read(size - len(head))
+            if not chunk:
+                break
+            head += chunk
+        return head
+
+    async def _iter_body(self, content: aiohttp.StreamReader, head: bytes):
+        """Yield the already-read head and then the rest of the body, enforcing MAX_PDF_BYTES"""
+        total = len(head)
+        yield head
+        async for chunk in content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+            total += len(chunk)
+            if total > MAX_PDF_BYTES:
+                raise ValueError(f"PDF too large: over {MAX_PDF_BYTES} bytes")
+            yield chunk
 
-            client = genai.Client(api_key=api_key)
+    def _remove_temp_file(self, temp_pdf_path: str):
+        """Delete a downloaded PDF, logging failures"""
+        if os.path.exists(temp_pdf_path):
+            try:
+                os.unlink(temp_pdf_path)
+                logger.info(f"PDFAdapter: Cleaned up temp file {temp_pdf_path}")
+            except Exception as e:
+                logger.warning(f"PDFAdapter: Failed to delete temp file: {e}")
+
+    async def _get_store(self, url: str):
+        """
+        Return a File Search Store holding the PDF at url, uploading it on a cache miss
 
+        Stores are cached process-wide by URL hash for PDF_STORE_TTL seconds, so repeated
+        queries against the same PDF skip the download, store creation, upload and teardown
+        round trips. Concurrent misses for the same URL on one loop wait on a single creation.
+        """
+        key = hashlib.sha256(url.encode()).hexdigest()
+        with _store_cache_lock:
+            entry = _store_cache.get(key)
+            if entry is not None and entry[0] > time.time():
+                _store_cache.move_to_end(key)
+                logger.info(f"PDFAdapter: Reusing File Search Store for {url}")
+                return entry[1]
+
+        pending_by_key = _store_pending.setdefault(asyncio.get_running_loop(), {})
+        pending = pending_by_key.get(key)
+        if pending is None:
+            pending = asyncio.create_task(self._create_store(url, key))
+            pending_by_key[key] = pending
+            pending.add_done_callback(lambda _: pending_by_key.pop(key, None))
+        else:
+            logger.info(f"PDFAdapter: Waiting for in-flight File Search Store for {url}")
+        # Shielded: one waiter being cancelled must not abort the upload the others wait on
+        return await asyncio.shield(pending)
+
+    async def _create_store(self, url: str, key: str):
+        """Download the PDF, upload it to a new File Search Store and cache the store"""
+        client = _get_client()
+        temp_pdf_path = await self._download_pdf(url)
+        store = None
+        try:
             # Create File Search Store
             logger.info("PDFAdapter: Creating File Search Store")
-            store = client.file_search_stores.create()
+            store = await asyncio.to_thread(client.file_search_stores.create)
 
             # Upload PDF to store
             logger.info("PDFAdapter: Uploading PDF to File Search Store")
-            upload_op = client.file_search_stores.upload_to_file_search_store(
+            upload_op = await asyncio.to_thread(
+                client.file_search_stores.upload_to_file_search_store,
                 file_search_store_name=store.name,
                 file=temp_pdf_path
             )
 
-            # Wait for upload to complete
-            while not upload_op.done:
-                await asyncio.sleep(5)
-                upload_op = client.operations.get(upload_op)
-                logger.debug("PDFAdapter: Waiting for upload to complete...")
-
-            logger.info(f"PDFAdapter: Upload complete, executing query: '{query[:100]}...'")
-
-            # Query the PDF using the provided query parameter
-            response = client.models.generate_content(
-                model='gemini-2.5-flash',
-                contents=query,  # Use the query parameter, not hardcoded text
-                config=types.GenerateContentConfig(
-                    tools=[types.Tool(
-                        file_search=types.FileSearch(
-                            file_search_store_names=[store.name]
-                        )
-                    )]
+            # Wait for upload to complete; a stuck upload fails fast and the store is cleaned up below
+            await asyncio.wait_for(
+                self._wait_for_upload(client, upload_op),
+                timeout=UPLOAD_TIMEOUT
+            )
+        except BaseException:
+            if store is not None:
+                self._schedule_store_deletion(client, store)
+            raise
+        finally:
+            self._remove_temp_file(temp_pdf_path)
+
+        store, stale = _cache_store(key, store)
+        for old in stale:
+            self._schedule_store_deletion(client, old)
+        return store
+
+    def _schedule_store_deletion(self, client, store):
+        """Delete a File Search Store in the background so callers don't wait on teardown"""
+        if not client:
+            return
+        task = asyncio.create_task(self._delete_store(client, store))
+        self._cleanup_tasks.add(task)
+        task.add_done_callback(self._cleanup_tasks.discard)
+
+    @staticmethod
+    async def _delete_store(client, store):
+        """Delete a File Search Store and the files uploaded to it"""
+        try:
+            # First, list and delete all files in the store
+            try:
+                # List files using the correct API
+                files = await asyncio.to_thread(
+                    lambda: list(client.files.list(filter=f"file_search_stores/{store.name.split('/')[-1]}"))
                 )
+
+                # Delete the files concurrently, bounded to avoid flooding the Gemini control plane
+                semaphore = asyncio.Semaphore(CLEANUP_MAX_CONCURRENT_DELETES)
+
+                async def delete_file(file):
+                    async with semaphore:
+                        try:
+                            await asyncio.to_thread(client.files.delete, name=file.name)
+                            logger.debug(f"PDFAdapter: Deleted file {file.name}")
+                        except Exception as file_err:
+                            logger.warning(f"PDFAdapter: Failed to delete file {file.name}: {file_err}")
+
+                await asyncio.gather(*(delete_file(file) for file in files))
+            except Exception as list_err:
+                logger.debug(f"PDFAdapter: Could not list/delete files: {list_err}")
+
+            # Now delete the store (may still fail if files weren't deleted)
+            await asyncio.to_thread(client.file_search_stores.delete, name=store.name)
+            logger.info("PDFAdapter: Deleted File Search Store successfully")
+        except Exception as e:
+            # This is non-critical - Google will eventually clean up old stores
+            logger.debug(f"PDFAdapter: Could not delete File Search Store (non-critical): {e}")
+
+    async def _query_store(self, store, query: str) -> str:
+        """Run a query against a File Search Store with Gemini"""
+        logger.info(f"PDFAdapter: Executing query: '{query[:100]}...'")
+
+        # Query the PDF using the provided query parameter
+        response = await asyncio.to_thread(
+            _get_client().models.generate_content,
+            model='gemini-2.5-flash',
+            contents=query,  # Use the query parameter, not hardcoded text
+            config=types.GenerateContentConfig(
+                tools=[types.Tool(
+                    file_search=types.FileSearch(
+                        file_search_store_names=[store.name]
+                    )
+                )]
             )
+        )
+
+        result_text = response.text
+        logger.info(f"PDFAdapter: Query successful, result length: {len(result_text)} chars")
+        logger.info(f"PDFAdapter: Gemini response: {result_text}")
+        return result_text
+
+    async def process_pdf(self, url: str, query: str) -> str:
+        """
+        Process a PDF from URL and extract information based on query
 
-            result_text = response.text
-            logger.info(f"PDFAdapter: Query successful, result length: {len(result_text)} chars")
-            logger.info(f"PDFAdapter: Gemini response: {result_text}")
-            return result_text
+        Args:
+            url: URL of the PDF document
+            query: Question or extraction task to perform on the PDF
+
+        Returns:
+            Extracted information as text
+        """
+        try:
+            store = await self._get_store(url)
+            return await self._query_store(store, query)
 
         except Exception as e:
             logger.error(f"PDFAdapter: Error processing PDF: {e}", exc_info=True)
             raise
 
-        finally:
-            # Cleanup temp file
-            if temp_pdf_path and os.path.exists(temp_pdf_path):
-                try:
-                    os.unlink(temp_pdf_path)
-                    logger.info(f"PDFAdapter: Cleaned up temp file {temp_pdf_path}")
-                except Exception as e:
-                    logger.warning(f"PDFAdapter: Failed to delete temp file: {e}")
-
-            # Cleanup File Search Store
-            if client and store:
-                try:
-                    # First, list and delete all files in the store
-                    try:
-                        # List files using the correct API
-                        files = client.files.list(filter=f"file_search_stores/{store.name.split('/')[-1]}")
-
-                        # Delete each file
-                        for file in files:
-                            try:
-                                client.files.delete(name=file.name)
-                                logger.debug(f"PDFAdapter: Deleted file {file.name}")
-                            except Exception as file_err:
-                                logger.warning(f"PDFAdapter: Failed to delete file {file.name}: {file_err}")
-                    except Exception as list_err:
-                        logger.debug(f"PDFAdapter: Could not list/delete files: {list_err}")
-
-                    # Now delete the store (may still fail if files weren't deleted)
-                    client.file_search_stores.delete(name=store.name)
-                    logger.info("PDFAdapter: Deleted File Search Store successfully")
-                except Exception as e:
-                    # This is non-critical - Google will eventually clean up old stores
-                    logger.debug(f"PDFAdapter: Could not delete File Search Store (non-critical): {e}")
\ No newline at end of file
+    async def process_pdfs(self, batch: List[Dict[str, str]]) -> List[str]:
+        """
+        Process several PDF queries, uploading each distinct PDF only once
+
+        Args:
+            batch: List of {"url": ..., "query": ...} dicts
+
+        Returns:
+            Extracted information as text, in the same order as batch
+        """
+        try:
+            # Upload each unique PDF once, then run its queries concurrently against the shared store.
+            # URLs are handled in groups no larger than the cache so a store is never evicted mid-batch.
+            urls = list(dict.fromkeys(item["url"] for item in batch))
+            results: Dict[int, str] = {}
+            for start in range(0, len(urls), PDF_STORE_CACHE_SIZE):
+                group = urls[start:start + PDF_STORE_CACHE_SIZE]
+                stores = dict(zip(group, await asyncio.gather(*(self._get_store(url) for url in group))))
+                indexed = [(i, item) for i, item in enumerate(batch) if item["url"] in stores]
+                texts = await asyncio.gather(
+                    *(self._query_store(stores[item["url"]], item["query"]) for _, item in indexed)
+                )
+                results.update((i, text) for (i, _), text in zip(indexed, texts))
+            return [results[i] for i in range(len(batch))]
+
+        except Exception as e:
+            logger.error(f"PDFAdapter: Error processing PDF batch: {e}", exc_info=True)
+            raise
@@ -5,10 +5,21 @@ import logging
 from urllib.parse import urlparse
 import time
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import HTTPError
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+# Keep-alive session shared by all SerpAdapter instances so Serper searches reuse pooled connections.
+# Only connection failures are retried (read=0) so a search is never billed twice.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=64,
+    max_retries=Retry(total=3, read=0, backoff_factor=0.3)
+))
+
 class SerpAdapter:
     """Google Serper.dev API adapter for web search. Use domain and DP name for logging context."""
 
@@ -57,9 +68,9 @@ class SerpAdapter:
                 'Content-Type': 'application/json'
             }
 
-            # Make API request using requests library
+            # Make API request over the shared keep-alive session
             start_time = time.time()
-            response = requests.post(
+            response = _SESSION.post(
                 f"{self.base_url}/search",
                 json=payload,
                 headers=headers,
@@ -136,7 +147,10 @@ class SerpAdapter:
 
             logger.info(f"Using ScrapingDog fallback for query: '{query}'", extra=self._get_log_extra())
             scraping_dog = ScrapingDogClient()
-            results = await scraping_dog.async_google_search(query=query, num=num, country=country_code)
+            try:
+                results = await scraping_dog.async_google_search(query=query, num=num, country=country_code)
+            finally:
+                await scraping_dog.cleanup()
 
             logger.info(f"ScrapingDog fallback returned {len(results)} results", extra=self._get_log_extra())
             return results
@@ -531,7 +545,10 @@ Return only the top {max_candidates} URLs in ranked order (most relevant first),
 
             # Get AI Overview via Scraping Dog with HTML format (async with rate limiting)
             scraping_dog = ScrapingDogClient()
-            overview_result = await scraping_dog.get_ai_overview_async(query, return_html=True)
+            try:
+                overview_result = await scraping_dog.get_ai_overview_async(query, return_html=True)
+            finally:
+                await scraping_dog.cleanup()
 
             if overview_result.get("success", False) and overview_result.get("ai_overview"):
                 ai_content = {
@@ -628,7 +645,7 @@ Return only the top {max_candidates} URLs in ranked order (most relevant first),
         return "\n".join(output_lines)
 
     def close(self):
-        """Close the connection - no-op for requests-based implementation"""
+        """Close the connection - no-op, the requests session is shared process-wide"""
         pass
 
     def cleanup(self):
@@ -1,11 +1,15 @@
 # Utility modules
 from .content_utils import content_utils, deduplicate_paragraphs, aggregate_and_dedup, spam_removal
-from .telemetry import TelemetryCollector
+from .telemetry import TelemetryCollector, TelemetryEvent
+from .log_queue import start_log_listener, stop_log_listener
 
 __all__ = [
     'content_utils',
     'deduplicate_paragraphs', 
     'aggregate_and_dedup',
     'spam_removal',
-    'TelemetryCollector'
+    'TelemetryCollector',
+    'TelemetryEvent',
+    'start_log_listener',
+    'stop_log_listener'
 ]
\ No newline at end of file
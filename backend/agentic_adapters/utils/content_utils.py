@@ -6,22 +6,135 @@ while preserving valuable business information.
 """
 
 import re
+import hashlib
 import logging
-from typing import List, Dict, Any, Tuple, Optional
+from functools import lru_cache
+from typing import List, Dict, Any, Tuple, Optional, Iterable, Iterator
+
+import numpy as np
 
 try:
     from simhash import Simhash
 except ImportError:
     # Fallback if simhash is not available
     class Simhash:
-        def __init__(self, text):
-            self.value = hash(text) % (2**64)
+        def __init__(self, features):
+            if isinstance(features, str):
+                features = [features]
+            weights = [0] * 64
+            for feature in features:
+                h = int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+                for i in range(64):
+                    weights[i] += 1 if (h >> i) & 1 else -1
+            self.value = sum(1 << i for i in range(64) if weights[i] > 0)
         
         def distance(self, other):
             return bin(self.value ^ other.value).count('1')
 
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    # Fallback to per-keyword substring checks if pyahocorasick is not available
+    HAS_AHOCORASICK = False
+
 logger = logging.getLogger(__name__)
 
+if HAS_NUMBA:
+    @njit(cache=True)
+    def _popcount64(v):
+        """SWAR population count of a 64-bit word"""
+        v = v - ((v >> np.uint64(1)) & np.uint64(0x5555555555555555))
+        v = (v & np.uint64(0x3333333333333333)) + ((v >> np.uint64(2)) & np.uint64(0x3333333333333333))
+        v = (v + (v >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+        return (v * np.uint64(0x0101010101010101)) >> np.uint64(56)
+
+    @njit(cache=True)
+    def _find_near(seen, count, x, max_hd):
+        """Return the index of the first of `count` fingerprints within `max_hd` bits of `x`, or -1"""
+        for i in range(count):
+            if _popcount64(seen[i] ^ x) <= max_hd:
+                return i
+        return -1
+else:
+    # Fallback if numba is not available
+    def _find_near(seen, count, x, max_hd):
+        x = int(x)
+        for i, fp in enumerate(seen[:count].tolist()):
+            if (fp ^ x).bit_count() <= max_hd:
+                return i
+        return -1
+
+
+def _shingles(text: str, k: int = 3) -> Tuple[str, ...]:
+    """Split normalized text into overlapping k-word shingles"""
+    words = text.split()
+    if len(words) <= k:
+        return (' '.join(words),) if words else ()
+    return tuple(' '.join(words[i:i + k]) for i in range(len(words) - k + 1))
+
+
+@lru_cache(maxsize=4096)
+def _simhash_fingerprint(normalized: str) -> int:
+    """64-bit SimHash of a normalized paragraph, built from its word shingles"""
+    return Simhash(_shingles(normalized)).value
+
+
+def _max_hamming_distance(similarity_threshold: float) -> int:
+    """Largest 64-bit Hamming distance that still meets the similarity threshold"""
+    max_hd = -1
+    for hd in range(65):
+        if 1 - (hd / 64.0) >= similarity_threshold:
+            max_hd = hd
+    return max_hd
+
+
+class _FingerprintIndex:
+    """
+    Seen paragraphs stored as parallel arrays: a dense uint64 fingerprint buffer
+    (grown 2x) that the Hamming scan sweeps, plus paragraph/URL lists that are
+    only touched on a hit.
+    """
+    __slots__ = ('fps', 'paragraphs', 'urls', 'max_hd')
+
+    def __init__(self, similarity_threshold: float):
+        self.fps = np.empty(0, dtype=np.uint64)
+        self.paragraphs: List[str] = []
+        self.urls: List[str] = []
+        self.max_hd = _max_hamming_distance(similarity_threshold)
+
+    def find_near(self, fp: np.uint64) -> int:
+        """Index of the first stored paragraph similar to `fp`, or -1"""
+        return _find_near(self.fps, len(self.paragraphs), fp, self.max_hd)
+
+    def add(self, fp: np.uint64, paragraph: str, url: str = '') -> None:
+        count = len(self.paragraphs)
+        if count == len(self.fps):
+            grown = np.empty(max(16, 2 * count), dtype=np.uint64)
+            grown[:count] = self.fps[:count]
+            self.fps = grown
+        self.fps[count] = fp
+        self.paragraphs.append(paragraph)
+        self.urls.append(url)
+
+
+def _build_automaton(keywords: List[str]):
+    """Build an Aho-Corasick automaton mapping each keyword to its index, or None without pyahocorasick"""
+    if not HAS_AHOCORASICK:
+        return None
+    automaton = ahocorasick.Automaton()
+    for idx, keyword in enumerate(keywords):
+        automaton.add_word(keyword, idx)
+    automaton.make_automaton()
+    return automaton
+
+
 class ContentUtils:
     """Utility class for content deduplication and spam removal"""
     
@@ -121,6 +234,10 @@ class ContentUtils:
             '.newsletter', '.subscribe', '.signup', '.login-form',
             '.contact-form', '.search-form', '.filter-form'
         ]
+        
+        # Multi-pattern matchers so each line is scanned once per keyword set
+        self._spam_ac = _build_automaton(self.spam_keywords)
+        self._preserve_ac = _build_automaton(self.preserve_keywords)
 
     def deduplicate_paragraphs(
         self, 
@@ -148,8 +265,8 @@ class ContentUtils:
         if len(paragraphs) <= 1:
             return content
         
-        # Track seen hashes and deduplicated paragraphs
-        seen_hashes = []  # List of (hash, paragraph) tuples
+        # Track seen paragraphs and deduplicated paragraphs
+        seen = _FingerprintIndex(similarity_threshold)
         deduplicated = []
         duplicates_removed = 0
         
@@ -162,35 +279,25 @@ class ContentUtils:
             # Normalize paragraph for hashing
             normalized = self._normalize_text(paragraph)
             
-            # Generate SimHash
-            paragraph_hash = Simhash(normalized)
+            # Generate SimHash fingerprint
+            paragraph_fp = np.uint64(_simhash_fingerprint(normalized))
             
-            # Check for duplicates
-            is_duplicate = False
-            for existing_hash, existing_para in seen_hashes:
-                hamming_distance = paragraph_hash.distance(existing_hash)
-                # Calculate similarity (lower hamming distance = higher similarity)
-                similarity = 1 - (hamming_distance / 64.0)  # 64-bit hash
-                
-                if similarity >= similarity_threshold:
-                    is_duplicate = True
-                    # Keep the longer version
-                    if len(paragraph) > len(existing_para):
-                        # Replace with longer version
-                        for i, dedup_para in enumerate(deduplicated):
-                            if dedup_para == existing_para:
-                                deduplicated[i] = paragraph
-                                # Update in seen_hashes
-                                for j, (h, p) in enumerate(seen_hashes):
-                                    if p == existing_para:
-                                        seen_hashes[j] = (existing_hash, paragraph)
-                                        break
-                                break
-                    duplicates_removed += 1
-                    break
+            # Check for duplicates (lower hamming distance = higher similarity)
+            match = seen.find_near(paragraph_fp)
             
-            if not is_duplicate:
-                seen_hashes.append((paragraph_hash, paragraph))
+            if match >= 0:
+                existing_para = seen.paragraphs[match]
+                # Keep the longer version
+                if len(paragraph) > len(existing_para):
+                    # Replace with longer version
+                    for i, dedup_para in enumerate(deduplicated):
+                        if dedup_para == existing_para:
+                            deduplicated[i] = paragraph
+                            seen.paragraphs[match] = paragraph
+                            break
+                duplicates_removed += 1
+            else:
+                seen.add(paragraph_fp, paragraph)
                 deduplicated.append(paragraph)
         
         result = '\n\n'.join(deduplicated)
@@ -211,7 +318,7 @@ class ContentUtils:
         Each paragraph appears only once across all pages.
         
         Args:
-            pages: List of page dictionaries with content
+            pages: List of page dictionaries with content (updated in place)
             similarity_threshold: Threshold for paragraph similarity
             content_key: Key containing the content to deduplicate
             
@@ -221,17 +328,36 @@ class ContentUtils:
         if not pages or len(pages) <= 1:
             return pages
         
-        # Track all unique paragraphs across all pages
-        global_paragraph_hashes = []  # List of (hash, paragraph, source_url) tuples
+        return list(self.aggregate_and_dedup_iter(pages, similarity_threshold, content_key))
+
+    def aggregate_and_dedup_iter(
+        self, 
+        pages: Iterable[Dict[str, Any]], 
+        similarity_threshold: float = 0.85,
+        content_key: str = 'fit_markdown'
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Streaming variant of aggregate_and_dedup.
+        Each page's content is replaced in place and the page is yielded as soon
+        as it has been deduplicated against all pages before it.
+        
+        Args:
+            pages: Iterable of page dictionaries with content
+            similarity_threshold: Threshold for paragraph similarity
+            content_key: Key containing the content to deduplicate
+            
+        Yields:
+            Pages with cross-page duplicate paragraphs removed
+        """
+        # Track all unique paragraphs across all pages with their source URLs
+        global_paragraphs = _FingerprintIndex(similarity_threshold)
         
-        # Process each page and update with deduplicated content
-        updated_pages = []
         total_paragraphs_removed = 0
         
         for page in pages:
             content = page.get(content_key, "")
             if not content or not content.strip():
-                updated_pages.append(page)
+                yield page
                 continue
             
             # Split into paragraphs
@@ -247,38 +373,30 @@ class ContentUtils:
                 
                 # Normalize and hash
                 normalized = self._normalize_text(paragraph)
-                paragraph_hash = Simhash(normalized)
+                paragraph_fp = np.uint64(_simhash_fingerprint(normalized))
                 
                 # Check against all previously seen paragraphs
-                is_duplicate = False
-                for existing_hash, existing_para, source_url in global_paragraph_hashes:
-                    hamming_distance = paragraph_hash.distance(existing_hash)
-                    similarity = 1 - (hamming_distance / 64.0)
-                    
-                    if similarity >= similarity_threshold:
-                        is_duplicate = True
-                        local_removed += 1
-                        logger.debug(f"Removed duplicate paragraph from {page.get('url')} (originally from {source_url})")
-                        break
+                match = global_paragraphs.find_near(paragraph_fp)
                 
-                if not is_duplicate:
+                if match >= 0:
+                    local_removed += 1
+                    logger.debug(f"Removed duplicate paragraph from {page.get('url')} (originally from {global_paragraphs.urls[match]})")
+                else:
                     # Add to global tracking and keep in page
-                    global_paragraph_hashes.append((paragraph_hash, paragraph, page.get('url', 'unknown')))
+                    global_paragraphs.add(paragraph_fp, paragraph, page.get('url', 'unknown'))
                     deduplicated_paragraphs.append(paragraph)
             
-            # Update page with deduplicated content
-            updated_page = page.copy()
-            updated_page[content_key] = '\n\n'.join(deduplicated_paragraphs)
-            updated_pages.append(updated_page)
+            # Update page in place with deduplicated content
+            page[content_key] = '\n\n'.join(deduplicated_paragraphs)
             
             if local_removed > 0:
                 total_paragraphs_removed += local_removed
                 logger.info(f"Removed {local_removed} duplicate paragraphs from {page.get('url')}")
+            
+            yield page
         
         if total_paragraphs_removed > 0:
             logger.info(f"Cross-page deduplication: removed {total_paragraphs_removed} duplicate paragraphs total")
-        
-        return updated_pages
 
     def spam_removal(
         self, 
@@ -320,6 +438,11 @@ class ContentUtils:
             if not line:
                 continue
             
+            # Business-valuable lines skip the spam checks entirely
+            if self._has_preserve_keyword(line.lower()):
+                filtered_lines.append(line)
+                continue
+            
             # Check for spam patterns
             if self._is_spam_line(line, aggressive):
                 continue
@@ -378,7 +501,7 @@ class ContentUtils:
         line_lower = line.lower()
         
         # Preserve lines with business value keywords
-        if any(keyword in line_lower for keyword in self.preserve_keywords):
+        if self._has_preserve_keyword(line_lower):
             return True
         
         # Preserve lines with financial data patterns
@@ -391,12 +514,24 @@ class ContentUtils:
         
         return False
 
+    def _has_preserve_keyword(self, line_lower: str) -> bool:
+        """Check if a lowercased line contains any business value keyword"""
+        if self._preserve_ac is not None:
+            return next(self._preserve_ac.iter(line_lower), None) is not None
+        return any(keyword in line_lower for keyword in self.preserve_keywords)
+
+    def _count_spam_keywords(self, line_lower: str) -> int:
+        """Count the distinct spam keywords contained in a lowercased line"""
+        if self._spam_ac is not None:
+            return len({idx for _, idx in self._spam_ac.iter(line_lower)})
+        return sum(1 for keyword in self.spam_keywords if keyword in line_lower)
+
     def _is_spam_line(self, line: str, aggressive: bool = True) -> bool:
         """Check if a line is spam content"""
         line_lower = line.lower()
         
         # Check spam keywords
-        spam_matches = sum(1 for keyword in self.spam_keywords if keyword in line_lower)
+        spam_matches = self._count_spam_keywords(line_lower)
         
         if aggressive:
             # Aggressive: any spam keyword triggers removal
@@ -451,8 +586,7 @@ class ContentUtils:
         
         for line in lines:
             # Check if line should start new paragraph
-            if (line.endswith('.') or line.endswith('!') or line.endswith('?') or 
-                line.startswith('#') or len(line) > 150):
+            if line and (line[-1] in '.!?' or line[0] == '#' or len(line) > 150):
                 # Complete current paragraph
                 if current_paragraph:
                     paragraphs.append(' '.join(current_paragraph))
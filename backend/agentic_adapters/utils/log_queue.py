@@ -0,0 +1,58 @@
+import logging
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Background listener that owns the root handlers while the app is running
+_log_listener: Optional[QueueListener] = None
+_log_queue_handler: Optional[QueueHandler] = None
+_queued_root_handlers: List[logging.Handler] = []
+_log_listener_lock = threading.Lock()
+
+
+def start_log_listener() -> None:
+    """
+    Move the root logger's handlers behind a queue drained by a background thread.
+
+    Callers keep logging through the usual hierarchy; only the final stream I/O moves
+    off the calling thread. The stock QueueHandler.prepare() formats each record before
+    it is enqueued, so later mutation of log arguments cannot change the output.
+    Idempotent; undo with stop_log_listener().
+    """
+    global _log_listener, _log_queue_handler, _queued_root_handlers
+    with _log_listener_lock:
+        if _log_listener is not None:
+            return
+        root = logging.getLogger()
+        handlers = list(root.handlers)
+        if not handlers:
+            return
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        _log_queue_handler = QueueHandler(log_queue)
+        for handler in handlers:
+            root.removeHandler(handler)
+        root.addHandler(_log_queue_handler)
+        _queued_root_handlers = handlers
+        _log_listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _log_listener.start()
+
+
+def stop_log_listener() -> None:
+    """Flush queued records and hand the original handlers back to the root logger."""
+    global _log_listener, _log_queue_handler, _queued_root_handlers
+    with _log_listener_lock:
+        if _log_listener is None:
+            return
+        root = logging.getLogger()
+        # Restore the direct handlers first so root is never left without a handler
+        for handler in _queued_root_handlers:
+            root.addHandler(handler)
+        root.removeHandler(_log_queue_handler)
+        # stop() drains everything already enqueued before the thread exits
+        _log_listener.stop()
+        _log_listener = None
+        _log_queue_handler = None
+        _queued_root_handlers = []
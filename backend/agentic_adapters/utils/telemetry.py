@@ -1,16 +1,126 @@
 import time
+import asyncio
 import logging
-from typing import Dict, Any, Optional
+import queue
+import threading
+from collections import defaultdict, deque
+from typing import Dict, Any, NamedTuple, Optional
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Max events the writer thread drains before emitting their log lines as one record
+WRITER_BATCH_SIZE = 256
+
+# One daemon writer thread serves every collector in the process, so creating collectors never
+# spawns threads; it is started on the first recorded event
+_writer_queue = queue.SimpleQueue()
+_writer_thread: Optional[threading.Thread] = None
+_writer_lock = threading.Lock()
+
+
+def _ensure_writer() -> threading.Thread:
+    """The shared writer thread, (re)started if it is not running"""
+    global _writer_thread
+    writer = _writer_thread
+    if writer is not None and writer.is_alive():
+        return writer
+    with _writer_lock:
+        if _writer_thread is None or not _writer_thread.is_alive():
+            _writer_thread = threading.Thread(target=_write_loop, name="telemetry-writer", daemon=True)
+            _writer_thread.start()
+        return _writer_thread
+
+
+def _write_loop():
+    """Writer thread: drain queued events in batches, ingest them per collector and log each batch at once"""
+    q = _writer_queue
+    while True:
+        items = [q.get()]
+        while len(items) < WRITER_BATCH_SIZE:
+            try:
+                items.append(q.get_nowait())
+            except queue.Empty:
+                break
+        
+        flushed = []
+        # Insertion-ordered, so each collector sees its events in recording order
+        by_collector: Dict["TelemetryCollector", list] = {}
+        for item in items:
+            if isinstance(item, threading.Event):
+                flushed.append(item)
+            else:
+                collector, event = item
+                by_collector.setdefault(collector, []).append(event)
+        
+        # Skip building log messages entirely when INFO is disabled
+        log_enabled = logger.isEnabledFor(logging.INFO)
+        lines = []
+        for collector, events in by_collector.items():
+            # One lock acquisition per collector per batch, not per event
+            with collector._lock:
+                for event in events:
+                    collector._ingest(event)
+                    if log_enabled:
+                        lines.append(collector._log_line(event))
+        
+        # End of batch: one logging call for everything drained
+        if lines:
+            logger.info("\n".join(lines))
+        for done in flushed:
+            done.set()
+
+
+class TelemetryEvent(NamedTuple):
+    """A recorded telemetry event; converted to a dict only when exported by get_summary"""
+    timestamp: float
+    stage: str
+    event: str
+    data: Optional[Dict[str, Any]]  # None when the event carries no data (most stage starts)
+    duration_ms: Optional[float]
+
+
 class TelemetryCollector:
     """Collects performance metrics and usage data"""
     
-    def __init__(self):
-        self.start_time = time.time()
-        self.events = []
+    def __init__(self, capacity: int = 100_000):
+        """
+        Args:
+            capacity: Max events kept; once full, the oldest event is dropped for each new one
+        """
+        self.start_time = time.perf_counter()  # monotonic; only used for elapsed time
+        self.capacity = capacity
+        # Ring buffer (flight recorder): bounded memory, O(1) append
+        self.events = deque(maxlen=capacity)
+        self.dropped_events = 0
+        
+        # Running aggregates updated once per event, so get_summary never rescans the events.
+        # They cover every recorded event, including ones since dropped from the ring buffer.
+        self._stage_counts = defaultdict(int)
+        self._stage_durations = defaultdict(float)
+        self._total_tokens = 0
+        self._total_cost = 0.0
+        self._error_count = 0
+        self._crawling_metrics = {
+            "crawl4ai_urls": 0,
+            "scraping_dog_urls": 0, 
+            "oxylabs_urls": 0,
+            "total_urls": 0,
+            "cost_efficiency": "unknown"
+        }
+        
+        # get_summary result minus the elapsed time, rebuilt only after new events are ingested
+        self._summary_cache: Optional[Dict[str, Any]] = None
+        self._dirty = True
+        
+        # Guards the events, the aggregates, _dirty and _summary_cache: the writer thread
+        # ingests while get_summary snapshots them from the caller's thread
+        self._lock = threading.Lock()
+        
+        # record_event only enqueues; the shared writer thread buffers, aggregates and logs
+        # events so callers on the pipeline's hot path never wait on logging I/O.
+        # Once closed, events are processed inline on the caller's thread instead.
+        self._closed = False
     
     def record_event(
         self,
@@ -18,7 +128,7 @@ class TelemetryCollector:
         event_type: str,
         data: Optional[Dict[str, Any]] = None,
         duration: Optional[float] = None
-    ) -> Dict[str, Any]:
+    ) -> TelemetryEvent:
         """
         Record a telemetry event
         
@@ -29,25 +139,87 @@ class TelemetryCollector:
             duration: Duration in seconds
             
         Returns:
-            Telemetry event dictionary
+            Telemetry event
         """
-        event = {
-            "timestamp": time.time(),
-            "stage": stage,
-            "event": event_type,
-            "data": data or {},
-            "duration_ms": round(duration * 1000, 2) if duration else None
-        }
+        event = TelemetryEvent(
+            time.time(),
+            stage,
+            event_type,
+            data,
+            round(duration * 1000, 2) if duration else None
+        )
         
+        if self._closed:
+            with self._lock:
+                self._ingest(event)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(self._log_line(event))
+        else:
+            _ensure_writer()
+            _writer_queue.put_nowait((self, event))
+        return event
+    
+    def _ingest(self, event: TelemetryEvent):
+        """Buffer an event and add it to the running aggregates (caller holds _lock)"""
+        if len(self.events) == self.capacity:
+            self.dropped_events += 1
         self.events.append(event)
+        self._aggregate(event)
+        self._dirty = True
+    
+    @staticmethod
+    def _log_line(event: TelemetryEvent) -> str:
+        """Log message for an event"""
+        if event.duration_ms:
+            return "%s.%s completed in %.3fs" % (event.stage, event.event, event.duration_ms / 1000)
+        return "%s.%s" % (event.stage, event.event)
+    
+    def flush(self):
+        """Block until every event recorded so far has been processed by the writer thread"""
+        writer = _writer_thread
+        if writer is None:
+            return  # Nothing was ever queued
+        done = threading.Event()
+        _writer_queue.put_nowait(done)
+        while not done.wait(0.1):
+            if not writer.is_alive():
+                return
+    
+    def close(self):
+        """Process pending events; later events are then ingested inline instead of queued"""
+        self._closed = True
+        self.flush()
+    
+    def _aggregate(self, event: TelemetryEvent):
+        """Add an event's contribution to the running summary aggregates"""
+        # Unpack once instead of repeated attribute loads
+        _, stage, event_type, data, duration_ms = event
+        self._stage_counts[stage] += 1
         
-        # Log the event
-        if duration:
-            logger.info(f"{stage}.{event_type} completed in {duration:.3f}s")
-        else:
-            logger.info(f"{stage}.{event_type}")
+        if duration_ms:
+            self._stage_durations[stage] += duration_ms / 1000
         
-        return event
+        if event_type == "error":
+            self._error_count += 1
+        
+        # Aggregate tokens and costs
+        if data is None:
+            return
+        tokens_used = data.get("tokens_used")
+        if tokens_used:
+            self._total_tokens += tokens_used
+        cost_estimate = data.get("cost_estimate")
+        if cost_estimate:
+            self._total_cost += cost_estimate
+        
+        # Aggregate crawling service usage
+        if event_type == "service_usage" and stage == "crawl":
+            crawling_metrics = self._crawling_metrics
+            crawling_metrics["crawl4ai_urls"] += data.get("crawl4ai_urls", 0)
+            crawling_metrics["scraping_dog_urls"] += data.get("scraping_dog_urls", 0)
+            crawling_metrics["oxylabs_urls"] += data.get("oxylabs_urls", 0)
+            crawling_metrics["total_urls"] += data.get("total_urls", 0)
+            crawling_metrics["cost_efficiency"] = data.get("cost_efficiency", "unknown")
     
     def record_api_call(
         self,
@@ -57,7 +229,7 @@ class TelemetryCollector:
         tokens_used: Optional[int] = None,
         cost_estimate: Optional[float] = None,
         success: bool = True
-    ) -> Dict[str, Any]:
+    ) -> TelemetryEvent:
         """Record API call metrics"""
         return self.record_event(
             stage="api_call",
@@ -72,7 +244,7 @@ class TelemetryCollector:
             duration=duration
         )
     
-    def record_stage_start(self, stage: str) -> Dict[str, Any]:
+    def record_stage_start(self, stage: str) -> TelemetryEvent:
         """Record the start of a pipeline stage"""
         return self.record_event(stage, "start")
     
@@ -82,7 +254,7 @@ class TelemetryCollector:
         duration: float,
         output_count: Optional[int] = None,
         success: bool = True
-    ) -> Dict[str, Any]:
+    ) -> TelemetryEvent:
         """Record the completion of a pipeline stage"""
         return self.record_event(
             stage=stage,
@@ -99,7 +271,7 @@ class TelemetryCollector:
         stage: str,
         error: Exception,
         context: Optional[Dict[str, Any]] = None
-    ) -> Dict[str, Any]:
+    ) -> TelemetryEvent:
         """Record an error event"""
         return self.record_event(
             stage=stage,
@@ -118,7 +290,7 @@ class TelemetryCollector:
         bright_data_count: int = 0,
         total_urls: int = 0,
         duration: Optional[float] = None
-    ) -> Dict[str, Any]:
+    ) -> TelemetryEvent:
         """Record crawling service usage metrics"""
         return self.record_event(
             stage="crawl",
@@ -136,93 +308,91 @@ class TelemetryCollector:
         )
     
     def get_summary(self) -> Dict[str, Any]:
-        """Get summary of all telemetry data"""
-        total_duration = time.time() - self.start_time
-        
-        # Count events by stage
-        stage_counts = {}
-        stage_durations = {}
-        total_tokens = 0
-        total_cost = 0.0
-        
-        # Crawling service metrics
-        crawling_metrics = {
-            "crawl4ai_urls": 0,
-            "scraping_dog_urls": 0, 
-            "oxylabs_urls": 0,
-            "total_urls": 0,
-            "cost_efficiency": "unknown"
-        }
+        """
+        Get summary of all telemetry data
         
-        for event in self.events:
-            stage = event["stage"]
-            stage_counts[stage] = stage_counts.get(stage, 0) + 1
-            
-            if event["duration_ms"]:
-                stage_durations[stage] = stage_durations.get(stage, 0) + (event["duration_ms"] / 1000)
-            
-            # Aggregate tokens and costs
-            data = event.get("data", {})
-            if data.get("tokens_used"):
-                total_tokens += data["tokens_used"]
-            if data.get("cost_estimate"):
-                total_cost += data["cost_estimate"]
-            
-            # Aggregate crawling service usage
-            if event["event"] == "service_usage" and stage == "crawl":
-                crawling_metrics["crawl4ai_urls"] += data.get("crawl4ai_urls", 0)
-                crawling_metrics["scraping_dog_urls"] += data.get("scraping_dog_urls", 0)
-                crawling_metrics["oxylabs_urls"] += data.get("oxylabs_urls", 0)
-                crawling_metrics["total_urls"] += data.get("total_urls", 0)
-                crawling_metrics["cost_efficiency"] = data.get("cost_efficiency", "unknown")
+        Waits for the writer thread to process the events recorded so far; coroutines should
+        use aget_summary() instead so the event loop isn't blocked on that wait.
+        The summary is memoized until the next event is ingested; only the elapsed time is
+        recomputed per call. Callers must not mutate the nested dicts or the events list.
+        """
+        self.flush()
+        return self._summary()
+    
+    async def aget_summary(self) -> Dict[str, Any]:
+        """get_summary() for coroutines: the writer thread is awaited from a worker thread"""
+        await asyncio.to_thread(self.flush)
+        return self._summary()
+    
+    def _summary(self) -> Dict[str, Any]:
+        """The memoized summary plus the current elapsed time"""
+        total_duration = time.perf_counter() - self.start_time
         
-        # Count errors
-        error_count = len([e for e in self.events if e["event"] == "error"])
+        # The writer marks the cache dirty under the same lock, so a rebuild can't miss events
+        with self._lock:
+            if self._dirty or self._summary_cache is None:
+                self._summary_cache = self._build_summary()
+            summary = self._summary_cache
         
+        return {"total_duration_s": round(total_duration, 3), **summary}
+    
+    def _build_summary(self) -> Dict[str, Any]:
+        """Summary fields that only change when events are ingested (caller holds _lock)"""
+        self._dirty = False
         return {
-            "total_duration_s": round(total_duration, 3),
             "total_events": len(self.events),
-            "error_count": error_count,
-            "stage_counts": stage_counts,
-            "stage_durations": {k: round(v, 3) for k, v in stage_durations.items()},
-            "total_tokens": total_tokens,
-            "estimated_cost": round(total_cost, 4),
-            "crawling_services": crawling_metrics,
-            "events": self.events
+            "dropped_events": self.dropped_events,
+            "error_count": self._error_count,
+            "stage_counts": dict(self._stage_counts),
+            "stage_durations": {k: round(v, 3) for k, v in self._stage_durations.items()},
+            "total_tokens": self._total_tokens,
+            "estimated_cost": round(self._total_cost, 4),
+            "crawling_services": dict(self._crawling_metrics),
+            "events": list(map(TelemetryEvent._asdict, self.events))
         }
     
     def log_summary(self):
-        """Log a summary of telemetry data"""
+        """Log a summary of telemetry data as a single multi-line record"""
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        
         summary = self.get_summary()
         
-        logger.info("=== QIA Pipeline Summary ===")
-        logger.info(f"Total Duration: {summary['total_duration_s']}s")
-        logger.info(f"Total Events: {summary['total_events']}")
-        logger.info(f"Errors: {summary['error_count']}")
-        logger.info(f"Total Tokens: {summary['total_tokens']}")
-        logger.info(f"Estimated Cost: ${summary['estimated_cost']}")
+        lines = [
+            "=== QIA Pipeline Summary ===",
+            f"Total Duration: {summary['total_duration_s']}s",
+            f"Total Events: {summary['total_events']}",
+        ]
+        if summary['dropped_events']:
+            lines.append(f"Dropped Events: {summary['dropped_events']} (capacity {self.capacity})")
+        lines += [
+            f"Errors: {summary['error_count']}",
+            f"Total Tokens: {summary['total_tokens']}",
+            f"Estimated Cost: ${summary['estimated_cost']}",
+        ]
         
-        # Log crawling service usage
+        # Crawling service usage
         crawling = summary['crawling_services']
         if crawling['total_urls'] > 0:
-            logger.info("=== Crawling Services Usage ===")
-            logger.info(f"Total URLs Crawled: {crawling['total_urls']}")
-            logger.info(f"Crawl4AI (Free): {crawling['crawl4ai_urls']} URLs")
-            logger.info(f"Scraping Dog: {crawling['scraping_dog_urls']} URLs")
-            logger.info(f"Oxylabs: {crawling['oxylabs_urls']} URLs")
-            logger.info(f"Cost Efficiency: {crawling['cost_efficiency']}")
-            
-            # Calculate percentages
-            if crawling['total_urls'] > 0:
-                crawl4ai_pct = (crawling['crawl4ai_urls'] / crawling['total_urls']) * 100
-                api_pct = ((crawling['scraping_dog_urls'] + crawling['oxylabs_urls']) / crawling['total_urls']) * 100
-                logger.info(f"Free Service Usage: {crawl4ai_pct:.1f}%")
-                logger.info(f"Paid API Usage: {api_pct:.1f}%")
+            crawl4ai_pct = (crawling['crawl4ai_urls'] / crawling['total_urls']) * 100
+            api_pct = ((crawling['scraping_dog_urls'] + crawling['oxylabs_urls']) / crawling['total_urls']) * 100
+            lines += [
+                "=== Crawling Services Usage ===",
+                f"Total URLs Crawled: {crawling['total_urls']}",
+                f"Crawl4AI (Free): {crawling['crawl4ai_urls']} URLs",
+                f"Scraping Dog: {crawling['scraping_dog_urls']} URLs",
+                f"Oxylabs: {crawling['oxylabs_urls']} URLs",
+                f"Cost Efficiency: {crawling['cost_efficiency']}",
+                f"Free Service Usage: {crawl4ai_pct:.1f}%",
+                f"Paid API Usage: {api_pct:.1f}%",
+            ]
         
         for stage, duration in summary['stage_durations'].items():
             count = summary['stage_counts'].get(stage, 0)
-            logger.info(f"  {stage}: {duration}s ({count} events)")
-
+            lines.append(f"  {stage}: {duration}s ({count} events)")
+        
+        # One handler invocation (one lock, one write) instead of one per line
+        logger.info("\n".join(lines))
 
 class StageTimer:
     """Context manager for timing pipeline stages"""
@@ -233,12 +403,12 @@ class StageTimer:
         self.start_time = None
     
     def __enter__(self):
-        self.start_time = time.time()
+        self.start_time = time.perf_counter()
         self.telemetry.record_stage_start(self.stage)
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        duration = time.time() - self.start_time
+        duration = time.perf_counter() - self.start_time
         
         if exc_type is None:
             self.telemetry.record_stage_complete(self.stage, duration)
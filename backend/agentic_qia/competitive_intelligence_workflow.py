@@ -20,17 +20,106 @@ Author: Competitive Intelligence Platform
 
 from typing import Dict, Any, List, Optional, Tuple
 from .graph import ReactGraph
+from .utils import fill_prompt
+from agentic_adapters.utils.telemetry import TelemetryCollector
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from functools import lru_cache
 import logging
 import asyncio
-import json
-from datetime import datetime
+import copy
+import orjson
+import re
+from datetime import datetime, timezone
 import os
+import threading
+import time
+from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# "1. Name (domain.com)": leading list markers are skipped, the name runs up to the first
+# parenthesised group and the domain is that group's content; both must start with a
+# non-space character, so blank names or domains never match
+_NUMBERED_RE = re.compile(r'^[\d.\- ]*(\S.*?)\s*\(\s*([^()\s][^()]*?)\s*\)')
+
+# Bare domains mentioned anywhere in the text (fallback extraction)
+_DOMAIN_RE = re.compile(r'[\w\-]+\.[\w\-]+\.?[\w]*')
+
+# Prompt templates, shared by every workflow instance
+PROMPTS_DIR = os.path.join(os.path.dirname(__file__), "prompts", "competitive_intelligence")
+
+# Separator line around step banners in the logs
+_BANNER = "=" * 80
+
+# Default seconds before one step 3 agent (one datapoint) is abandoned
+DATAPOINT_TIMEOUT = float(os.getenv("CI_DATAPOINT_TIMEOUT", "90"))
+
+# Step 1/2 results are reused across workflow instances for the same company (0 disables)
+PLAN_CACHE_TTL = int(os.getenv("CI_PLAN_CACHE_TTL", "21600"))
+PLAN_CACHE_SIZE = 256
+
+# (company name, domain, industry, step params...) -> (expires_at, result); LRU order.
+# Workflows may run on several threads' event loops, so every access holds the lock.
+_plan_cache: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+_plan_cache_lock = threading.Lock()
+
+
+def _plan_cache_get(key: Tuple) -> Optional[Any]:
+    """Private copy of the cached step result for key, or None if missing or expired"""
+    with _plan_cache_lock:
+        cached = _plan_cache.get(key)
+        if cached is None:
+            return None
+        if cached[0] <= time.time():
+            del _plan_cache[key]
+            return None
+        _plan_cache.move_to_end(key)
+        value = cached[1]
+    # Workflows mutate their results; callers must never share the cached objects
+    return copy.deepcopy(value)
+
+
+def _plan_cache_put(key: Tuple, value: Any):
+    """Store a copy of a step result, evicting the least recently used entries past PLAN_CACHE_SIZE"""
+    if PLAN_CACHE_TTL <= 0:
+        return
+    value = copy.deepcopy(value)
+    with _plan_cache_lock:
+        _plan_cache[key] = (time.time() + PLAN_CACHE_TTL, value)
+        _plan_cache.move_to_end(key)
+        while len(_plan_cache) > PLAN_CACHE_SIZE:
+            _plan_cache.popitem(last=False)
+
+
+def _log_banner(title: str):
+    """Log a title between separator lines as one record (one handler dispatch)"""
+    logger.info("%s\n%s\n%s", _BANNER, title, _BANNER)
+
+
+@lru_cache(maxsize=32)
+def _load_prompt_cached(prompt_path: str) -> str:
+    """Read a prompt file once per process; the templates are static"""
+    with open(prompt_path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+@dataclass(slots=True)
+class AnalysisMetadata:
+    """Run metadata; serialize() returns it as a plain dict"""
+    company_name: str
+    company_domain: str
+    analysis_date: str
+    duration_seconds: float
+    num_competitors_analyzed: int
+
 
 class CompetitorAnalysisResult:
     """Container for competitor analysis results"""
+    __slots__ = (
+        'competitor_name', 'competitor_domain', 'products_analysis', 'product_comparison',
+        'customer_reviews', 'strategy_analysis', 'news_monitoring'
+    )
 
     def __init__(self, competitor_name: str, competitor_domain: str):
         self.competitor_name = competitor_name
@@ -54,6 +143,16 @@ class CompetitorAnalysisResult:
         }
 
 
+# CompetitorAnalysisResult fields, in the order step 3 gathers its agents
+_ANALYSIS_FIELDS = (
+    "products_analysis",
+    "product_comparison",
+    "customer_reviews",
+    "strategy_analysis",
+    "news_monitoring"
+)
+
+
 class MultiAgentCompetitiveIntelligence:
     """
     Orchestrates multiple ReactGraph instances for comprehensive competitive intelligence.
@@ -70,13 +169,23 @@ class MultiAgentCompetitiveIntelligence:
     4. Aggregation: Create comprehensive comparison report
     5. Alerts: Generate critical threat alerts
     """
+    __slots__ = (
+        'company_name', 'company_domain', 'company_industry', 'company_size', 'max_competitors',
+        'competitor_concurrency', 'per_datapoint_timeout', '_competitor_sem', 'telemetry',
+        'company_research_result', '_company_research_json', 'competitors_discovered',
+        'competitor_analyses', '_competitor_analyses_dicts', '_competitor_analyses_json',
+        'final_report', 'alerts', 'analysis_metadata', 'prompts_dir'
+    )
 
     def __init__(self,
                  company_name: str,
                  company_domain: str,
                  company_industry: str = "",
                  company_size: str = "",
-                 max_competitors: int = 5):
+                 max_competitors: int = 5,
+                 competitor_concurrency: int = 4,
+                 per_datapoint_timeout: Optional[float] = DATAPOINT_TIMEOUT,
+                 telemetry: Optional[TelemetryCollector] = None):
         """
         Initialize Multi-Agent Competitive Intelligence Workflow
 
@@ -86,26 +195,43 @@ class MultiAgentCompetitiveIntelligence:
             company_industry: Industry/sector
             company_size: Company size (employees/revenue)
             max_competitors: Maximum number of competitors to analyze
+            competitor_concurrency: Max competitors analyzed at once in step 3 (5 LLM agents each)
+            per_datapoint_timeout: Seconds before one step 3 agent (one datapoint) is abandoned;
+                defaults to DATAPOINT_TIMEOUT (90s, env CI_DATAPOINT_TIMEOUT), None disables it
+            telemetry: Collector for per-competitor progress events; if omitted they are
+                only logged at DEBUG
         """
         self.company_name = company_name
         self.company_domain = company_domain
         self.company_industry = company_industry
         self.company_size = company_size
         self.max_competitors = max_competitors
+        self.competitor_concurrency = competitor_concurrency
+        self.per_datapoint_timeout = per_datapoint_timeout
+
+        # Caps step 3 fan-out so provider rate limits aren't hit by every competitor at once
+        self._competitor_sem = asyncio.Semaphore(competitor_concurrency)
+
+        # Per-agent progress goes through the caller's collector when one is given, keeping
+        # log formatting and I/O off the event loop during the step 3 fan-out
+        self.telemetry = telemetry
 
         # Results storage
         self.company_research_result = None
+        # company_research_result encoded once for the step 4/5 prompts
+        self._company_research_json = "null"
         self.competitors_discovered = []
         self.competitor_analyses = {}
+        # to_dict() of each analysis, built once after step 3 and shared by steps 4/5 and the final result
+        self._competitor_analyses_dicts = {}
+        # Compact orjson encoding of each analysis dict, made as soon as the competitor finishes
+        self._competitor_analyses_json: Dict[str, bytes] = {}
         self.final_report = None
         self.alerts = None
+        self.analysis_metadata = None
 
         # Prompts directory
-        self.prompts_dir = os.path.join(
-            os.path.dirname(__file__),
-            "prompts",
-            "competitive_intelligence"
-        )
+        self.prompts_dir = PROMPTS_DIR
 
         logger.info(f"Initialized MultiAgentCompetitiveIntelligence for {company_name}")
 
@@ -113,8 +239,7 @@ class MultiAgentCompetitiveIntelligence:
         """Load prompt from file"""
         prompt_path = os.path.join(self.prompts_dir, f"{prompt_name}.md")
         try:
-            with open(prompt_path, "r", encoding="utf-8") as f:
-                return f.read()
+            return _load_prompt_cached(prompt_path)
         except FileNotFoundError:
             logger.error(f"Prompt file not found: {prompt_path}")
             raise
@@ -132,6 +257,18 @@ class MultiAgentCompetitiveIntelligence:
             "size": size or self.company_size
         }
 
+    def _record_progress(self, competitor: Dict[str, str], event_type: str) -> None:
+        """Record a step 3 progress event for a competitor"""
+        stage = f"compete.{competitor['name']}"
+        if self.telemetry is not None:
+            self.telemetry.record_event(stage=stage, event_type=event_type)
+        else:
+            logger.debug(f"{stage}.{event_type}")
+
+    def _plan_cache_key(self, step: str, *params) -> Tuple:
+        """Plan cache key for a step run against this workflow's company"""
+        return (self.company_name.lower(), self.company_domain.lower(), self.company_industry.lower(), step, *params)
+
     async def step1_company_research(self) -> Dict[str, Any]:
         """
         Step 1: Research target company
@@ -145,9 +282,14 @@ class MultiAgentCompetitiveIntelligence:
         Returns:
             Company research results
         """
-        logger.info("=" * 80)
-        logger.info("STEP 1: COMPANY RESEARCH")
-        logger.info("=" * 80)
+        _log_banner("STEP 1: COMPANY RESEARCH")
+
+        cache_key = self._plan_cache_key("step1")
+        cached = _plan_cache_get(cache_key)
+        if cached is not None:
+            logger.info(f"Using cached company research for {self.company_name}")
+            self.company_research_result, self._company_research_json = cached
+            return self.company_research_result
 
         # Create company context
         company_context = self._create_company_context()
@@ -167,9 +309,11 @@ class MultiAgentCompetitiveIntelligence:
 
         # Load and format prompt
         prompt_template = self._load_prompt("01_company_research")
-        prompt = prompt_template.replace("{{company_name}}", self.company_name) \
-                                .replace("{{company_domain}}", self.company_domain) \
-                                .replace("{{company_industry}}", self.company_industry)
+        prompt = fill_prompt(prompt_template, {
+            "company_name": self.company_name,
+            "company_domain": self.company_domain,
+            "company_industry": self.company_industry
+        })
 
         # Run agent
         logger.info(f"Researching company: {self.company_name}")
@@ -177,6 +321,12 @@ class MultiAgentCompetitiveIntelligence:
 
         # Extract structured response
         self.company_research_result = ReactGraph.serialize_response(result)
+        self._company_research_json = orjson.dumps(
+            self.company_research_result, option=orjson.OPT_NON_STR_KEYS
+        ).decode()
+        # Only a real synthesis is reused; a missing or failed one is retried by the next run
+        if result.get("structured_response") and ReactGraph._synthesis_succeeded(self.company_research_result):
+            _plan_cache_put(cache_key, (self.company_research_result, self._company_research_json))
 
         logger.info(f"Company research completed. Confidence: {self.company_research_result.get('confidence', 0):.2%}")
 
@@ -191,9 +341,14 @@ class MultiAgentCompetitiveIntelligence:
         Returns:
             List of competitors with name and domain
         """
-        logger.info("=" * 80)
-        logger.info("STEP 2: COMPETITOR DISCOVERY")
-        logger.info("=" * 80)
+        _log_banner("STEP 2: COMPETITOR DISCOVERY")
+
+        cache_key = self._plan_cache_key("step2", self.max_competitors)
+        cached = _plan_cache_get(cache_key)
+        if cached is not None:
+            logger.info(f"Using cached competitors for {self.company_name}")
+            self.competitors_discovered = cached
+            return self.competitors_discovered
 
         # Create company context
         company_context = self._create_company_context()
@@ -217,11 +372,13 @@ class MultiAgentCompetitiveIntelligence:
         # Include company research findings
         company_research_summary = self.company_research_result.get('answer', 'No prior research available')
 
-        prompt = prompt_template.replace("{{company_name}}", self.company_name) \
-                                .replace("{{company_domain}}", self.company_domain) \
-                                .replace("{{company_industry}}", self.company_industry) \
-                                .replace("{{max_competitors}}", str(self.max_competitors)) \
-                                .replace("{{company_research_summary}}", company_research_summary)
+        prompt = fill_prompt(prompt_template, {
+            "company_name": self.company_name,
+            "company_domain": self.company_domain,
+            "company_industry": self.company_industry,
+            "max_competitors": str(self.max_competitors),
+            "company_research_summary": company_research_summary
+        })
 
         # Run agent
         logger.info(f"Discovering competitors for {self.company_name}")
@@ -236,6 +393,8 @@ class MultiAgentCompetitiveIntelligence:
         competitors = self._parse_competitors_from_text(answer)
 
         self.competitors_discovered = competitors[:self.max_competitors]
+        if self.competitors_discovered:
+            _plan_cache_put(cache_key, self.competitors_discovered)
 
         logger.info(f"Discovered {len(self.competitors_discovered)} competitors: {[c['name'] for c in self.competitors_discovered]}")
 
@@ -253,33 +412,22 @@ class MultiAgentCompetitiveIntelligence:
             List of {name, domain} dicts
         """
         competitors = []
-        lines = text.split('\n')
 
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-
-            # Try to extract name and domain
+        for line in text.split('\n'):
             # Pattern 1: "1. Name (domain.com)"
-            if '(' in line and ')' in line:
-                parts = line.split('(')
-                if len(parts) >= 2:
-                    name = parts[0].strip().lstrip('0123456789.- ')
-                    domain = parts[1].split(')')[0].strip()
-
-                    if name and domain:
-                        competitors.append({
-                            "name": name,
-                            "domain": domain
-                        })
+            match = _NUMBERED_RE.match(line.strip())
+            # The marker prefix can backtrack and leave a lone "." as the name; skip such lines
+            if match and any(c.isalnum() for c in match.group(1)):
+                competitors.append({
+                    "name": match.group(1),
+                    "domain": match.group(2)
+                })
 
         # If no competitors found with pattern, try simple extraction
         if not competitors:
             logger.warning("No competitors found with standard pattern, using fallback extraction")
             # Fallback: just use domains mentioned in citations
-            import re
-            domains = re.findall(r'[\w\-]+\.[\w\-]+\.?[\w]*', text)
+            domains = _DOMAIN_RE.findall(text)
             for domain in domains[:self.max_competitors]:
                 competitors.append({
                     "name": domain.split('.')[0].title(),
@@ -302,42 +450,79 @@ class MultiAgentCompetitiveIntelligence:
         competitor_name = competitor['name']
         competitor_domain = competitor['domain']
 
-        logger.info("=" * 80)
-        logger.info(f"STEP 3: ANALYZING COMPETITOR - {competitor_name}")
-        logger.info("=" * 80)
+        _log_banner(f"STEP 3: ANALYZING COMPETITOR - {competitor_name}")
 
         result = CompetitorAnalysisResult(competitor_name, competitor_domain)
 
-        # Run 5 agents in parallel
+        # Run 5 agents in parallel; each has its own timeout so a slow one doesn't
+        # discard the datapoints the others already finished
         tasks = [
-            self._analyze_competitor_products(competitor),
-            self._compare_products(competitor),
-            self._analyze_customer_reviews(competitor),
-            self._analyze_strategy(competitor),
-            self._monitor_news(competitor)
+            asyncio.wait_for(analysis, timeout=self.per_datapoint_timeout)
+            for analysis in (
+                self._analyze_competitor_products(competitor),
+                self._compare_products(competitor),
+                self._analyze_customer_reviews(competitor),
+                self._analyze_strategy(competitor),
+                self._monitor_news(competitor)
+            )
         ]
 
         results = await asyncio.gather(*tasks, return_exceptions=True)
 
-        # Assign results
-        result.products_analysis = results[0] if not isinstance(results[0], Exception) else None
-        result.product_comparison = results[1] if not isinstance(results[1], Exception) else None
-        result.customer_reviews = results[2] if not isinstance(results[2], Exception) else None
-        result.strategy_analysis = results[3] if not isinstance(results[3], Exception) else None
-        result.news_monitoring = results[4] if not isinstance(results[4], Exception) else None
-
-        # Log any errors
-        for i, res in enumerate(results):
-            if isinstance(res, Exception):
-                logger.error(f"Competitor analysis task {i} failed: {res}")
+        # Assign results (failed analyses stay None) and log any errors
+        for field_name, res in zip(_ANALYSIS_FIELDS, results):
+            if isinstance(res, asyncio.TimeoutError):
+                logger.error(f"Competitor analysis task {field_name} timed out after {self.per_datapoint_timeout}s")
+            elif isinstance(res, Exception):
+                logger.error(f"Competitor analysis task {field_name} failed: {res}")
+            else:
+                setattr(result, field_name, res)
 
         logger.info(f"Completed analysis for {competitor_name}")
 
         return result
 
+    async def step3_analyze_all_competitors(self) -> Dict[str, CompetitorAnalysisResult]:
+        """
+        Step 3 for every discovered competitor at once
+
+        All competitors (and their 5 agents each) run in a single gather, at most
+        competitor_concurrency of them at a time. An agent still running after
+        per_datapoint_timeout seconds is cancelled and its datapoint left empty, so one
+        hung LLM call can't hold up the whole workflow or drop the finished datapoints.
+
+        Each finished competitor is converted and JSON-encoded for the step 4/5 prompts
+        straight away, overlapping that prep with the competitors still running; only
+        the join of the pieces is left once the last straggler arrives.
+
+        Returns:
+            Competitor name -> CompetitorAnalysisResult for the successful analyses
+        """
+        async def _bounded(competitor: Dict[str, str]) -> Tuple[CompetitorAnalysisResult, Dict[str, Any], bytes]:
+            async with self._competitor_sem:
+                analysis = await self.step3_analyze_competitor(competitor)
+            analysis_dict = analysis.to_dict()
+            analysis_json = await asyncio.to_thread(orjson.dumps, analysis_dict, option=orjson.OPT_NON_STR_KEYS)
+            return analysis, analysis_dict, analysis_json
+
+        tasks = [_bounded(competitor) for competitor in self.competitors_discovered]
+
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        for competitor, result in zip(self.competitors_discovered, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to analyze competitor {competitor['name']}: {result!r}")
+            else:
+                name = competitor['name']
+                (self.competitor_analyses[name],
+                 self._competitor_analyses_dicts[name],
+                 self._competitor_analyses_json[name]) = result
+
+        return self.competitor_analyses
+
     async def _analyze_competitor_products(self, competitor: Dict[str, str]) -> Dict[str, Any]:
         """Analyze competitor's products"""
-        logger.info(f"[{competitor['name']}] Analyzing products...")
+        self._record_progress(competitor, "analyze_products")
 
         company_context = self._create_company_context(
             company_name=competitor['name'],
@@ -353,8 +538,10 @@ class MultiAgentCompetitiveIntelligence:
         agent = ReactGraph(company_context, datapoint_context)
 
         prompt_template = self._load_prompt("03_competitor_products")
-        prompt = prompt_template.replace("{{competitor_name}}", competitor['name']) \
-                                .replace("{{competitor_domain}}", competitor['domain'])
+        prompt = fill_prompt(prompt_template, {
+            "competitor_name": competitor['name'],
+            "competitor_domain": competitor['domain']
+        })
 
         result = await agent.ainvoke(prompt=prompt)
 
@@ -362,7 +549,7 @@ class MultiAgentCompetitiveIntelligence:
 
     async def _compare_products(self, competitor: Dict[str, str]) -> Dict[str, Any]:
         """Compare our products vs competitor's products"""
-        logger.info(f"[{competitor['name']}] Comparing products...")
+        self._record_progress(competitor, "compare_products")
 
         company_context = self._create_company_context()
 
@@ -379,11 +566,13 @@ class MultiAgentCompetitiveIntelligence:
         # Include our company's products from research
         our_products_summary = self.company_research_result.get('answer', 'Unknown products')
 
-        prompt = prompt_template.replace("{{our_company_name}}", self.company_name) \
-                                .replace("{{our_company_domain}}", self.company_domain) \
-                                .replace("{{competitor_name}}", competitor['name']) \
-                                .replace("{{competitor_domain}}", competitor['domain']) \
-                                .replace("{{our_products_summary}}", our_products_summary)
+        prompt = fill_prompt(prompt_template, {
+            "our_company_name": self.company_name,
+            "our_company_domain": self.company_domain,
+            "competitor_name": competitor['name'],
+            "competitor_domain": competitor['domain'],
+            "our_products_summary": our_products_summary
+        })
 
         result = await agent.ainvoke(prompt=prompt)
 
@@ -391,7 +580,7 @@ class MultiAgentCompetitiveIntelligence:
 
     async def _analyze_customer_reviews(self, competitor: Dict[str, str]) -> Dict[str, Any]:
         """Analyze customer reviews for competitor's products"""
-        logger.info(f"[{competitor['name']}] Analyzing customer reviews...")
+        self._record_progress(competitor, "analyze_customer_reviews")
 
         company_context = self._create_company_context(
             company_name=competitor['name'],
@@ -407,8 +596,10 @@ class MultiAgentCompetitiveIntelligence:
         agent = ReactGraph(company_context, datapoint_context)
 
         prompt_template = self._load_prompt("05_customer_reviews")
-        prompt = prompt_template.replace("{{competitor_name}}", competitor['name']) \
-                                .replace("{{competitor_domain}}", competitor['domain'])
+        prompt = fill_prompt(prompt_template, {
+            "competitor_name": competitor['name'],
+            "competitor_domain": competitor['domain']
+        })
 
         result = await agent.ainvoke(prompt=prompt)
 
@@ -416,7 +607,7 @@ class MultiAgentCompetitiveIntelligence:
 
     async def _analyze_strategy(self, competitor: Dict[str, str]) -> Dict[str, Any]:
         """Analyze competitor's business strategy"""
-        logger.info(f"[{competitor['name']}] Analyzing strategy...")
+        self._record_progress(competitor, "analyze_strategy")
 
         company_context = self._create_company_context(
             company_name=competitor['name'],
@@ -432,8 +623,10 @@ class MultiAgentCompetitiveIntelligence:
         agent = ReactGraph(company_context, datapoint_context)
 
         prompt_template = self._load_prompt("06_strategy_analysis")
-        prompt = prompt_template.replace("{{competitor_name}}", competitor['name']) \
-                                .replace("{{competitor_domain}}", competitor['domain'])
+        prompt = fill_prompt(prompt_template, {
+            "competitor_name": competitor['name'],
+            "competitor_domain": competitor['domain']
+        })
 
         result = await agent.ainvoke(prompt=prompt)
 
@@ -441,7 +634,7 @@ class MultiAgentCompetitiveIntelligence:
 
     async def _monitor_news(self, competitor: Dict[str, str]) -> Dict[str, Any]:
         """Monitor recent news about competitor"""
-        logger.info(f"[{competitor['name']}] Monitoring news...")
+        self._record_progress(competitor, "monitor_news")
 
         company_context = self._create_company_context(
             company_name=competitor['name'],
@@ -457,13 +650,24 @@ class MultiAgentCompetitiveIntelligence:
         agent = ReactGraph(company_context, datapoint_context)
 
         prompt_template = self._load_prompt("07_news_monitoring")
-        prompt = prompt_template.replace("{{competitor_name}}", competitor['name']) \
-                                .replace("{{competitor_domain}}", competitor['domain'])
+        prompt = fill_prompt(prompt_template, {
+            "competitor_name": competitor['name'],
+            "competitor_domain": competitor['domain']
+        })
 
         result = await agent.ainvoke(prompt=prompt)
 
         return ReactGraph.serialize_response(result)
 
+    def _serialize_competitor_analyses(self) -> str:
+        """
+        Compact JSON array of the competitor analyses for the step 4/5 prompts
+
+        Joins the per-competitor encodings step 3 produced as each competitor finished
+        (orjson in a worker thread; compact UTF-8, indentation only costs prompt tokens).
+        """
+        return (b"[" + b",".join(self._competitor_analyses_json.values()) + b"]").decode()
+
     async def step4_aggregate_and_report(self) -> Dict[str, Any]:
         """
         Step 4: Aggregate all competitor analyses into comprehensive report
@@ -471,9 +675,7 @@ class MultiAgentCompetitiveIntelligence:
         Returns:
             Final comprehensive comparison report
         """
-        logger.info("=" * 80)
-        logger.info("STEP 4: AGGREGATING RESULTS & GENERATING REPORT")
-        logger.info("=" * 80)
+        _log_banner("STEP 4: AGGREGATING RESULTS & GENERATING REPORT")
 
         company_context = self._create_company_context()
 
@@ -488,17 +690,14 @@ class MultiAgentCompetitiveIntelligence:
         prompt_template = self._load_prompt("08_aggregation_report")
 
         # Serialize all competitor analyses
-        competitors_data = []
-        for comp_name, analysis in self.competitor_analyses.items():
-            competitors_data.append(analysis.to_dict())
-
-        competitors_json = json.dumps(competitors_data, indent=2, ensure_ascii=False)
-        company_research_json = json.dumps(self.company_research_result, indent=2, ensure_ascii=False)
+        competitors_json = self._serialize_competitor_analyses()
 
-        prompt = prompt_template.replace("{{our_company_name}}", self.company_name) \
-                                .replace("{{our_company_domain}}", self.company_domain) \
-                                .replace("{{company_research_data}}", company_research_json) \
-                                .replace("{{competitors_data}}", competitors_json)
+        prompt = fill_prompt(prompt_template, {
+            "our_company_name": self.company_name,
+            "our_company_domain": self.company_domain,
+            "company_research_data": self._company_research_json,
+            "competitors_data": competitors_json
+        })
 
         logger.info("Generating comprehensive competitive intelligence report...")
         result = await agent.ainvoke(prompt=prompt)
@@ -519,9 +718,7 @@ class MultiAgentCompetitiveIntelligence:
         Returns:
             Alert analysis with priority threats
         """
-        logger.info("=" * 80)
-        logger.info("STEP 5: GENERATING COMPETITIVE THREAT ALERTS")
-        logger.info("=" * 80)
+        _log_banner("STEP 5: GENERATING COMPETITIVE THREAT ALERTS")
 
         company_context = self._create_company_context()
 
@@ -536,17 +733,14 @@ class MultiAgentCompetitiveIntelligence:
         prompt_template = self._load_prompt("09_alert_system")
 
         # Serialize all competitor analyses
-        competitors_data = []
-        for comp_name, analysis in self.competitor_analyses.items():
-            competitors_data.append(analysis.to_dict())
+        competitors_json = self._serialize_competitor_analyses()
 
-        competitors_json = json.dumps(competitors_data, indent=2, ensure_ascii=False)
-        company_research_json = json.dumps(self.company_research_result, indent=2, ensure_ascii=False)
-
-        prompt = prompt_template.replace("{{our_company_name}}", self.company_name) \
-                                .replace("{{our_company_domain}}", self.company_domain) \
-                                .replace("{{company_research_data}}", company_research_json) \
-                                .replace("{{competitors_data}}", competitors_json)
+        prompt = fill_prompt(prompt_template, {
+            "our_company_name": self.company_name,
+            "our_company_domain": self.company_domain,
+            "company_research_data": self._company_research_json,
+            "competitors_data": competitors_json
+        })
 
         logger.info("Analyzing competitive threats and generating alerts...")
         result = await agent.ainvoke(prompt=prompt)
@@ -557,6 +751,22 @@ class MultiAgentCompetitiveIntelligence:
 
         return self.alerts
 
+    def serialize(self) -> Dict[str, Any]:
+        """
+        Results of the workflow as a JSON-ready dict
+
+        Built from the stored step results without copying them: each competitor
+        analysis was converted with to_dict() once, right after step 3.
+        """
+        return {
+            "company_research": self.company_research_result,
+            "competitors_discovered": self.competitors_discovered,
+            "competitor_analyses": self._competitor_analyses_dicts,
+            "final_report": self.final_report,
+            "alerts": self.alerts,
+            "metadata": asdict(self.analysis_metadata) if self.analysis_metadata is not None else None
+        }
+
     async def run_full_analysis(self) -> Dict[str, Any]:
         """
         Run complete competitive intelligence workflow
@@ -568,12 +778,12 @@ class MultiAgentCompetitiveIntelligence:
             - competitor_analyses
             - final_report
             - alerts
+            - metadata (AnalysisMetadata fields as a dict)
         """
-        logger.info("=" * 80)
-        logger.info(f"STARTING FULL COMPETITIVE INTELLIGENCE ANALYSIS FOR {self.company_name}")
-        logger.info("=" * 80)
+        _log_banner(f"STARTING FULL COMPETITIVE INTELLIGENCE ANALYSIS FOR {self.company_name}")
 
-        start_time = datetime.now()
+        analysis_date = datetime.now(timezone.utc).isoformat()
+        start_time = time.monotonic()  # immune to wall-clock adjustments during long runs
 
         try:
             # Step 1: Research our company
@@ -583,20 +793,7 @@ class MultiAgentCompetitiveIntelligence:
             await self.step2_competitor_discovery()
 
             # Step 3: Analyze each competitor (parallel)
-            competitor_tasks = [
-                self.step3_analyze_competitor(competitor)
-                for competitor in self.competitors_discovered
-            ]
-
-            competitor_results = await asyncio.gather(*competitor_tasks, return_exceptions=True)
-
-            # Store results
-            for i, result in enumerate(competitor_results):
-                if not isinstance(result, Exception):
-                    competitor_name = self.competitors_discovered[i]['name']
-                    self.competitor_analyses[competitor_name] = result
-                else:
-                    logger.error(f"Failed to analyze competitor {i}: {result}")
+            await self.step3_analyze_all_competitors()
 
             # Step 4: Aggregate and generate report
             await self.step4_aggregate_and_report()
@@ -604,30 +801,19 @@ class MultiAgentCompetitiveIntelligence:
             # Step 5: Generate alerts
             await self.step5_generate_alerts()
 
-            end_time = datetime.now()
-            duration = (end_time - start_time).total_seconds()
-
-            logger.info("=" * 80)
-            logger.info(f"COMPETITIVE INTELLIGENCE ANALYSIS COMPLETED in {duration:.1f}s")
-            logger.info("=" * 80)
-
-            return {
-                "company_research": self.company_research_result,
-                "competitors_discovered": self.competitors_discovered,
-                "competitor_analyses": {
-                    name: analysis.to_dict()
-                    for name, analysis in self.competitor_analyses.items()
-                },
-                "final_report": self.final_report,
-                "alerts": self.alerts,
-                "metadata": {
-                    "company_name": self.company_name,
-                    "company_domain": self.company_domain,
-                    "analysis_date": start_time.isoformat(),
-                    "duration_seconds": duration,
-                    "num_competitors_analyzed": len(self.competitor_analyses)
-                }
-            }
+            duration = time.monotonic() - start_time
+
+            _log_banner(f"COMPETITIVE INTELLIGENCE ANALYSIS COMPLETED in {duration:.1f}s")
+
+            self.analysis_metadata = AnalysisMetadata(
+                company_name=self.company_name,
+                company_domain=self.company_domain,
+                analysis_date=analysis_date,
+                duration_seconds=duration,
+                num_competitors_analyzed=len(self.competitor_analyses)
+            )
+
+            return self.serialize()
 
         except Exception as e:
             logger.error(f"Competitive intelligence analysis failed: {e}", exc_info=True)
@@ -658,8 +844,11 @@ async def main():
 
     # Save results to file
     output_file = f"competitive_intelligence_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
+    # Encode and write in worker threads so the event loop isn't blocked on a large dump
+    payload = await asyncio.to_thread(
+        orjson.dumps, results, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+    )
+    await asyncio.to_thread(Path(output_file).write_bytes, payload)
 
     logger.info(f"Results saved to {output_file}")
 
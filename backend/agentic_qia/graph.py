@@ -7,22 +7,238 @@ from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage, ToolMessage, RemoveMessage
 from langgraph.graph.message import REMOVE_ALL_MESSAGES
 from .state import AgenticRunState
-from .nodes import node_triage, node_controller, node_final_synthesis
+from .nodes import node_triage, node_controller, node_final_synthesis, SYNTHESIS_FAILED_PREFIX
 from .tools import create_budget_aware_tools, format_tools_for_llm
-from typing import Dict, Any, Callable, Optional, Type, List
+from .utils import fill_prompt
+from typing import Dict, Any, Callable, Optional, Type, List, Tuple
 from pydantic import BaseModel, Field
-from httpx import AsyncClient, Limits
+from httpx import AsyncClient, Client, Limits, Timeout
+from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
+import asyncio
+import functools
+import hashlib
 import logging
 import os
 import json
+import orjson
 import dataclasses
+import time
+import weakref
+from datetime import date
+from array import array
+from collections import OrderedDict
+from contextvars import ContextVar
 from dotenv import load_dotenv
 
+try:
+    import tiktoken
+    HAS_TIKTOKEN = True
+except ImportError:
+    # Fallback to the LLM's own message token counting in the pre-hook
+    HAS_TIKTOKEN = False
+
 load_dotenv()
 logger = logging.getLogger(__name__)
 
-@dataclasses.dataclass
+# OpenRouter HTTP connections are pooled and kept alive across ReactGraph instances, so the
+# many sequential model calls of a ReAct loop reuse a warm TLS connection
+LLM_HTTP_LIMITS = Limits(max_keepalive_connections=32, max_connections=64, keepalive_expiry=60.0)
+# Generous read timeout: non-streamed completions of up to max_tokens can take minutes
+LLM_HTTP_TIMEOUT = Timeout(180.0, connect=10.0)
+
+_llm_http_client: Optional[Client] = None
+# Async connections are bound to the event loop that opened them, so one client per loop
+_llm_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def _get_llm_http_clients() -> Tuple[Client, AsyncClient]:
+    """Shared (sync, async) HTTP clients for the LLM; the async one belongs to the running loop"""
+    global _llm_http_client
+    if _llm_http_client is None or _llm_http_client.is_closed:
+        _llm_http_client = Client(http2=True, limits=LLM_HTTP_LIMITS, timeout=LLM_HTTP_TIMEOUT)
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # Built outside an event loop: nothing to share the async pool with
+        return _llm_http_client, AsyncClient(http2=True, limits=LLM_HTTP_LIMITS, timeout=LLM_HTTP_TIMEOUT)
+
+    async_client = _llm_async_clients.get(loop)
+    if async_client is None or async_client.is_closed:
+        async_client = AsyncClient(http2=True, limits=LLM_HTTP_LIMITS, timeout=LLM_HTTP_TIMEOUT)
+        _llm_async_clients[loop] = async_client
+    return _llm_http_client, async_client
+
+
+# Chat formatting overhead (role, separators) added per message when counting tokens
+TOKENS_PER_MESSAGE = 4
+
+
+@functools.lru_cache(maxsize=1)
+def _get_token_encoding() -> "tiktoken.Encoding":
+    """Tokenizer used for rate-limit estimates (GPT-4o/GPT-5 family encoding)"""
+    return tiktoken.get_encoding("o200k_base")
+
+
+def _count_message_tokens(messages: List[Any]) -> int:
+    """Approximate input tokens for BaseMessage or dict messages (RemoveMessage markers skipped)"""
+    texts = []
+    for msg in messages:
+        if isinstance(msg, dict):
+            msg_type, content = msg.get("type"), msg.get("content", "")
+        else:
+            msg_type, content = getattr(msg, "type", None), getattr(msg, "content", str(msg))
+        if msg_type == "remove":
+            continue
+        if isinstance(content, list):
+            # Content blocks: count the text parts
+            content = "\n".join(
+                block.get("text", "") if isinstance(block, dict) else str(block) for block in content
+            )
+        texts.append(content if isinstance(content, str) else str(content))
+    encoded = _get_token_encoding().encode("\n".join(texts), disallowed_special=())
+    return len(encoded) + TOKENS_PER_MESSAGE * len(texts)
+
+
+# Triage plans reused by runs with the same answer cache key (same company, competitor,
+# datapoint and question) within the TTL; 0 disables
+TRIAGE_CACHE_TTL = int(os.getenv("TRIAGE_CACHE_TTL", "600"))
+TRIAGE_CACHE_SIZE = 256
+
+# answer cache key -> (expires_at, plan); LRU order
+_triage_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+
+def _triage_cache_get(key: str) -> Optional[Dict[str, Any]]:
+    """Cached triage plan for key, or None if missing or expired"""
+    cached = _triage_cache.get(key)
+    if cached is None or cached[0] <= time.time():
+        return None
+    _triage_cache.move_to_end(key)
+    return dict(cached[1])
+
+
+def _triage_cache_put(key: str, plan: Dict[str, Any]):
+    """Store a triage plan, evicting the least recently used entries past TRIAGE_CACHE_SIZE"""
+    if TRIAGE_CACHE_TTL <= 0:
+        return
+    _triage_cache[key] = (time.time() + TRIAGE_CACHE_TTL, dict(plan))
+    _triage_cache.move_to_end(key)
+    while len(_triage_cache) > TRIAGE_CACHE_SIZE:
+        _triage_cache.popitem(last=False)
+
+
+# Default cap on agents in flight in ReactGraph.abatch()
+BATCH_CONCURRENCY = int(os.getenv("REACT_BATCH_CONCURRENCY", "8"))
+
+# Redis-backed TPM limiter shared by every worker; off unless REACT_RATE_LIMIT=on
+RATE_LIMIT_ENABLED = os.getenv("REACT_RATE_LIMIT", "off").lower() == "on"
+
+# Pre-hook history trimming: above MAX_HISTORY_MESSAGES, keep the first system message
+# plus the last KEEP_RECENT_MESSAGES non-system messages
+MAX_HISTORY_MESSAGES = 25
+KEEP_RECENT_MESSAGES = 19
+
+
+def _is_system_message(msg: Any) -> bool:
+    return getattr(msg, "type", None) == "system"
+
+
+def _trim_history(messages: List[Any]) -> List[Any]:
+    """
+    Trimmed history: first system message + last KEEP_RECENT_MESSAGES non-system messages.
+
+    Walks back from the end only until the tail is full and stops at the first system
+    message from the front, instead of partitioning the whole history twice.
+    """
+    recent = []
+    for msg in reversed(messages):
+        if not _is_system_message(msg):
+            recent.append(msg)
+            if len(recent) == KEEP_RECENT_MESSAGES:
+                break
+    recent.reverse()
+    system_message = next((m for m in messages if _is_system_message(m)), None)
+    return [system_message, *recent] if system_message is not None else recent
+
+
+PROMPTS_DIR = os.path.join(os.path.dirname(__file__), "prompts")
+REACT_AGENT_PROMPT = os.path.join(PROMPTS_DIR, "react_agent.md")
+
+
+@functools.lru_cache(maxsize=None)
+def _read_prompt(path: str) -> str:
+    """Read a prompt template once per process; the templates are static"""
+    with open(path, "r") as f:
+        return f.read()
+
+
+# Concise synthesis prompt; the values are populated from the graph state automatically
+SYNTHESIS_INSTRUCTIONS = """# Synthesis Instructions
+
+You have completed research and gathered evidence. Now synthesize your findings into a structured response.
+
+**Your Task:**
+1. Review all evidence from tool results (SERP results, crawled pages, AI overviews)
+2. Filter out irrelevant content (navigation, ads, boilerplate)
+3. Extract key information that answers the original research question
+4. Map findings to datapoint value ranges if applicable
+5. Provide citations from crawled URLs
+6. Assess confidence based on evidence quality
+
+**Company Verification Rules:**
+- Only use information clearly tied to the target company
+- Match by domain name, or company name + location/industry/size
+- Ignore data from companies with similar names unless verified
+
+**Output Requirements:**
+- Answer: 4-6 sentences addressing the datapoint with inline citations like [Source Name]
+- Confidence: 0.0-1.0 based on evidence strength
+- Mapping Rationale: Explain why you selected the mapped range
+- Datapoint Value: Exact extracted value if available
+- Mapped Range: Selected range from datapoint definition
+- Evidence Summary: Key findings and limitations
+- Respect the output schema
+
+Be concise, factual, and transparent about evidence quality."""
+
+# OpenRouter providers that only cache prompt prefixes marked with cache_control breakpoints
+# (OpenAI-family models cache repeated prefixes automatically)
+PROMPT_CACHE_CONTROL_PREFIXES = ("anthropic/", "google/")
+
+# Seconds to reuse a ReactGraph answer for the same (company, competitor, datapoint, prompt); 0 disables
+AGENT_CACHE_TTL = int(os.getenv("AGENT_CACHE_TTL", "86400"))
+
+
+@functools.lru_cache(maxsize=1)
+def _get_agent_cache_redis() -> Optional[Redis]:
+    """Process-wide Redis pool for the answer cache in invoke(), or None without REDIS_URL"""
+    redis_url = os.getenv("REDIS_URL")
+    if not redis_url or AGENT_CACHE_TTL <= 0:
+        return None
+    try:
+        return Redis.from_url(redis_url, max_connections=20)
+    except Exception as e:
+        logger.warning(f"Failed to initialize ReactGraph answer cache: {e}")
+        return None
+
+
+@functools.lru_cache(maxsize=1)
+def _get_agent_cache_async_redis() -> Optional[AsyncRedis]:
+    """Process-wide Redis pool for the answer cache in ainvoke(), or None without REDIS_URL"""
+    redis_url = os.getenv("REDIS_URL")
+    if not redis_url or AGENT_CACHE_TTL <= 0:
+        return None
+    try:
+        return AsyncRedis.from_url(redis_url, max_connections=20)
+    except Exception as e:
+        logger.warning(f"Failed to initialize ReactGraph answer cache: {e}")
+        return None
+
+@dataclasses.dataclass(slots=True, frozen=True)
 class ContextSchema:
+    """Runtime context schema of the compiled agent; immutable so one instance can be shared"""
     company_name: str
     company_domain: str
     company_industry: str
@@ -50,6 +266,202 @@ class SynthesisResponse(BaseModel):
     dp_value: str = Field(default="", description="Extracted datapoint value")
     evidence_summary: EvidenceSummary = Field(description="Summary of key findings and limitations")
 
+
+def _inline_schema_refs(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """JSON schema with local $defs references expanded in place (not every provider resolves $ref)"""
+    defs = schema.get("$defs", {})
+
+    def _expand(node: Any) -> Any:
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if ref and ref.startswith("#/$defs/"):
+                return _expand(defs[ref[len("#/$defs/"):]])
+            return {key: _expand(value) for key, value in node.items() if key != "$defs"}
+        if isinstance(node, list):
+            return [_expand(item) for item in node]
+        return node
+
+    return _expand(schema)
+
+
+# OpenRouter response_format for the terminal synthesis call; the schema is generated once at import
+SYNTHESIS_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "synthesis_response", "schema": _inline_schema_refs(SynthesisResponse.model_json_schema())}
+}
+
+# LLM driving the ReAct loop (OpenRouter)
+LLM_MODEL = "openai/gpt-5.1"
+LLM_BASE_URL = "https://openrouter.ai/api/v1"
+
+# Tools closed over per-instance data (the prospect); agents using them can't be shared
+PROSPECT_BOUND_TOOLS = frozenset({"search_linkedin_posts_tool"})
+
+# ReactGraph whose run is executing in the current context; the hooks on a shared
+# compiled agent dispatch to it
+_active_graph: ContextVar[Optional["ReactGraph"]] = ContextVar("active_react_graph", default=None)
+
+
+def _create_llm(model: str, base_url: str) -> ChatOpenAI:
+    """Chat model on the shared pooled HTTP clients"""
+    http_client, http_async_client = _get_llm_http_clients()
+    return ChatOpenAI(
+        model=model,
+        api_key=os.getenv('OPENROUTER_API_KEY'),
+        base_url=base_url,
+        temperature=0,
+        max_tokens=3000,
+        http_client=http_client,
+        http_async_client=http_async_client
+    )
+
+
+def _tool_name(tool: Any) -> str:
+    return getattr(tool, "name", None) or tool.__name__
+
+
+async def _dispatch_prehook(state: Dict[str, Any]) -> Dict[str, Any]:
+    return await _active_graph.get()._prehook(state)
+
+
+def _dispatch_posthook(state: Dict[str, Any]) -> Dict[str, Any]:
+    return _active_graph.get()._posthook(state)
+
+
+def _compile_react_agent(llm: ChatOpenAI, tools: List[Any]) -> Any:
+    """Compile the ReAct agent; per-run behaviour comes from the active ReactGraph via the hooks"""
+    # Note: Don't bind_tools to model manually - let create_react_agent handle it
+    return create_react_agent(
+        model=llm,
+        tools=tools,
+        pre_model_hook=_dispatch_prehook,
+        post_model_hook=_dispatch_posthook,
+        state_schema=AgenticRunState,
+        context_schema=ContextSchema,
+        version="v2"
+    )
+
+
+# Compiled agents hold a ChatOpenAI whose async HTTP client belongs to one loop, so they are
+# shared per running loop (agents built outside a loop only serve the sync invoke())
+_loop_agents: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[Any, ...], Any]]" = weakref.WeakKeyDictionary()
+_sync_agents: Dict[Tuple[Any, ...], Any] = {}
+
+
+def _build_agent(tools_key: Tuple[str, ...], llm_key: Tuple[str, str]) -> Any:
+    """
+    Compiled agent shared by every ReactGraph on the running loop with the same tool set and model.
+
+    Only used for prospect-independent tools, which create_budget_aware_tools()
+    rebuilds identically from tools_key alone.
+    """
+    try:
+        agents = _loop_agents.setdefault(asyncio.get_running_loop(), {})
+    except RuntimeError:
+        agents = _sync_agents
+
+    agent = agents.get((tools_key, llm_key))
+    if agent is None:
+        tools = create_budget_aware_tools()
+        if tuple(sorted(map(_tool_name, tools))) != tools_key:
+            raise ValueError(f"Tool set {tools_key} can't be rebuilt without instance data")
+        logger.info(f"Compiling shared ReAct agent for {llm_key[0]} with tools {tools_key}")
+        agent = agents[(tools_key, llm_key)] = _compile_react_agent(_create_llm(*llm_key), tools)
+    return agent
+
+
+def _budget_label(tool: str) -> str:
+    """Unit shown after a tool's remaining count in the budget message"""
+    if tool == "urls":
+        return "URLs to crawl"
+    if tool == "serp":
+        return "SERP queries"
+    return f"{tool} tool calls"
+
+
+def _budget_count(value: Any) -> int:
+    """Triage budgets come from the LLM; anything that isn't an integer counts as 0"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _one_use(args: Dict[str, Any]) -> int:
+    return 1
+
+
+# Budget units consumed by a tool call, from its args; tools not listed count as 1 per call
+_USAGE_EXTRACTORS: Dict[str, Callable[[Dict[str, Any]], int]] = {
+    # serp budget is per query, not per tool call
+    "serp": lambda args: len(args.get("queries") or ()) or 1,
+    # crawl budget is per URL, not per tool call
+    "crawl": lambda args: len(args.get("urls") or ()) or 1,
+}
+
+
+def _is_finalize_result(message: Any) -> bool:
+    """True for the ToolMessage returned by the finalize tool"""
+    return getattr(message, "type", None) == "tool" and getattr(message, "name", None) == "finalize"
+
+
+def _messages_after(messages: List[Any], tool_call_id: Any) -> Optional[List[Any]]:
+    """Messages following the ToolMessage answering tool_call_id, or None if it is no longer in the history"""
+    for index in range(len(messages) - 1, -1, -1):
+        if getattr(messages[index], "tool_call_id", None) == tool_call_id:
+            return messages[index + 1:]
+    return None
+
+
+def _tool_call_pairs(message: Any) -> List[Tuple[Any, Any]]:
+    """(name, args) for each tool call on a model message"""
+    # Fast path: LangChain parses tool calls into ToolCall dicts on AIMessage.tool_calls
+    if isinstance(message, AIMessage) and message.tool_calls:
+        return [(tc["name"], tc["args"]) for tc in message.tool_calls]
+
+    # Other formats: tool calls as attributes, dicts or raw additional_kwargs
+    tool_calls = getattr(message, "tool_calls", None) or \
+                getattr(message, "additional_kwargs", {}).get("tool_calls")
+    if not tool_calls:
+        return []
+    return [
+        (tc.get('name'), tc.get('args')) if isinstance(tc, dict)
+        else (getattr(tc, 'name', 'unknown'), getattr(tc, 'args', {}))
+        for tc in tool_calls
+    ]
+
+
+def _render_react_prompt(plan: Dict[str, Any], context: Dict[str, str], current_date: str) -> str:
+    """Fill react_agent.md from a triage plan and the precomputed context substrings"""
+    # Format instructions - convert list to numbered string
+    instructions_raw = plan.get("instructions", [])
+    if isinstance(instructions_raw, list):
+        instructions_str = "\n".join([f"{i+1}. {instr}" for i, instr in enumerate(instructions_raw)])
+    else:
+        instructions_str = str(instructions_raw)
+
+    tools_budget_dict = plan.get("tools_budgeting", {})
+    tools_budget_str = ", ".join([f"{v} {k} tool calls" for k, v in tools_budget_dict.items()])
+
+    return fill_prompt(_read_prompt(REACT_AGENT_PROMPT), {
+        **context,
+        "goal": plan.get("goal", ""),
+        "instructions": instructions_str,
+        "stopping_criteria": plan.get("stopping_criteria", ""),
+        "current_datetime": current_date,
+        "tools_budgeting": tools_budget_str,
+        "max_serp": str(tools_budget_dict.get("serp", 5)),
+        "max_crawl": str(tools_budget_dict.get("crawl", 10)),
+        "max_ai_overview": str(tools_budget_dict.get("ai_overview", 2))
+    })
+
+
+@functools.lru_cache(maxsize=256)
+def _format_react_prompt(plan_json: str, context_blob: str, current_date: str) -> str:
+    """Cached _render_react_prompt keyed on the serialized plan and context"""
+    return _render_react_prompt(orjson.loads(plan_json), orjson.loads(context_blob), current_date)
+
+
 class ReactGraph:
     """
     Encapsulates the agentic QIA workflow using LangGraph's built-in ReAct agent.
@@ -75,16 +487,32 @@ class ReactGraph:
         self.competitor_context = competitor_context
         self.datapoint_context = datapoint_context
         self.prospect = prospect
-        self.prompts_dir = os.path.join(os.path.dirname(__file__), "prompts")
+        self.prompts_dir = PROMPTS_DIR
         self.react_prompt_path = os.path.join(self.prompts_dir, "react_system.md")
 
         # Initialize budget tracking
-        self.budget_remaining = {}
+        self._set_budget({})
+
+        # Context-derived ReAct prompt values, fixed for this instance
+        self._prompt_context = self._build_prompt_context()
+        self._prompt_context_blob = orjson.dumps(self._prompt_context).decode()
 
-        # Initialize rate limiter for TPM enforcement
-        from .rate_limiter import create_gemini_rate_limiter
-        # Disable rate limiter for testing
+        # Initialize rate limiter for TPM enforcement; each instance keeps its own token lease,
+        # handed back when a run ends. None when disabled or Redis is unreachable.
         self.rate_limiter = None
+        if RATE_LIMIT_ENABLED:
+            from .rate_limiter import create_gemini_rate_limiter
+            self.rate_limiter = create_gemini_rate_limiter()
+
+        # Pre-hook token count carried across ReAct steps (see _count_input_tokens)
+        self._counted_messages = 0
+        self._last_counted_message = None
+        self._history_tokens = 0
+
+        # Terminal synthesis started as soon as finalize returns (ainvoke only)
+        self._synthesis_kwargs: Optional[Dict[str, Any]] = None
+        # (tool_call_id of the finalize ToolMessage, synthesis task)
+        self._early_synthesis: Optional[Tuple[Any, asyncio.Task]] = None
 
         # Initialize model and tools
         # self.llm = ChatGoogleGenerativeAI(
@@ -93,20 +521,10 @@ class ReactGraph:
         #     temperature=0,
         #     max_output_tokens=2000,
         # )
-        api_key = os.getenv('OPENROUTER_API_KEY')
-        if not api_key:
+        if not os.getenv('OPENROUTER_API_KEY'):
             raise ValueError("OPENROUTER_API_KEY environment variable not set")
 
-        self.llm = ChatOpenAI(
-            model="openai/gpt-5.1",
-            api_key=api_key,
-            base_url="https://openrouter.ai/api/v1",
-            temperature=0,
-            max_tokens=3000,
-            http_async_client=AsyncClient(
-                limits=Limits(max_keepalive_connections=0)
-            )
-        )
+        self.llm = _create_llm(LLM_MODEL, LLM_BASE_URL)
 
         # self.llm = ChatXAI(
         #     model="grok-4-fast",
@@ -120,8 +538,12 @@ class ReactGraph:
         # Create tools with prospect bound via closure (if prospect provided)
         self.tools = create_budget_aware_tools(prospect=self.prospect)
 
-        # Build agent once during initialization
-        self.agent = self.build_agent()
+        # Reuse the compiled agent unless a tool is bound to this instance's prospect
+        tools_key = tuple(sorted(map(_tool_name, self.tools)))
+        if PROSPECT_BOUND_TOOLS.isdisjoint(tools_key):
+            self.agent = _build_agent(tools_key, (LLM_MODEL, LLM_BASE_URL))
+        else:
+            self.agent = self.build_agent()
         if not self.rate_limiter:
             logger.warning("Rate limiter is disabled for ReactGraph - no TPM enforcement!")
 
@@ -228,154 +650,162 @@ class ReactGraph:
         """
         logger.info("Running planning step (triage)")
         plan_update = node_triage(state)
-        logger.info(f"Planning complete: obtainability={plan_update.get('obtainability')}, " +
-                   f"budgets={plan_update.get('budgets')}")
+        logger.info("Planning complete: obtainability=%s, budgets=%s",
+                    plan_update.get('obtainability'), plan_update.get('budgets'))
         return plan_update
 
     def _load_synthesis_prompt(self) -> str:
         """
-        Load and format synthesis prompt for response_format.
+        Synthesis prompt for response_format.
 
         Returns concise synthesis instructions for structured output generation.
         """
-        # Load the full synthesis template
-        synthesis_prompt_path = os.path.join(self.prompts_dir, "final_synthesis.md")
-        with open(synthesis_prompt_path, "r") as f:
-            full_template = f.read()
-
-        # Create a concise prompt that references state fields
-        # The actual values will be populated from the graph state automatically
-        synthesis_instructions = """# Synthesis Instructions
-
-You have completed research and gathered evidence. Now synthesize your findings into a structured response.
-
-**Your Task:**
-1. Review all evidence from tool results (SERP results, crawled pages, AI overviews)
-2. Filter out irrelevant content (navigation, ads, boilerplate)
-3. Extract key information that answers the original research question
-4. Map findings to datapoint value ranges if applicable
-5. Provide citations from crawled URLs
-6. Assess confidence based on evidence quality
-
-**Company Verification Rules:**
-- Only use information clearly tied to the target company
-- Match by domain name, or company name + location/industry/size
-- Ignore data from companies with similar names unless verified
-
-**Output Requirements:**
-- Answer: 4-6 sentences addressing the datapoint with inline citations like [Source Name]
-- Confidence: 0.0-1.0 based on evidence strength
-- Mapping Rationale: Explain why you selected the mapped range
-- Datapoint Value: Exact extracted value if available
-- Mapped Range: Selected range from datapoint definition
-- Evidence Summary: Key findings and limitations
-- Respect the output schema
+        return SYNTHESIS_INSTRUCTIONS
 
-Be concise, factual, and transparent about evidence quality."""
-
-        return synthesis_instructions
-
-    def create_llm_prehook(self) -> Callable:
+    async def _prehook(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Create pre-model hook that runs before each LLM call in ReAct loop.
+        Pre-model hook that runs before each LLM call in ReAct loop.
 
-        Used for message history management (trimming, summarization).
+        Trim message history if it exceeds threshold.
+        Also enforce rate limiting by reserving tokens before LLM call.
 
-        Returns:
-            Callable with signature (state) -> state_update
+        Strategy: Keep system messages + last 19 conversation messages = max 20 total
         """
-        async def prehook(state: Dict[str, Any]) -> Dict[str, Any]:
-            """
-            Trim message history if it exceeds threshold.
-            Also enforce rate limiting by reserving tokens before LLM call.
-
-            Strategy: Keep system messages + last 19 conversation messages = max 20 total
-            """
-            import time
-            logging.info("Pre-hook: Checking message history for trimming")
-            messages = state.get("messages", [])
-
-            # If more than 25 messages, trim to last 20
-            if len(messages) > 25:
-                logger.info(f"Trimming messages from {len(messages)} to 20")
-
-                # Preserve system messages and keep last 19 non-system messages
-                system_messages = [m for m in messages if hasattr(m, 'type') and m.type == "system"][:1]
-                non_system_messages = [m for m in messages if not (hasattr(m, 'type') and m.type == "system")][-19:]
-
-                # Clear history by only returning trimmed messages (don't use RemoveMessage with agent.invoke)
-                # RemoveMessage objects cause "Got unknown type" errors when passed through agent
-                return {
-                    "messages": [
-                        *system_messages,
-                        *non_system_messages
-                    ]
-                }
-
-            logger.info(f"Messages count {len(messages)} within limit, no trimming needed")
-
-            # Rate limiting: Reserve tokens for upcoming LLM call
-            if self.rate_limiter:
-                try:
+        logger.info("Pre-hook: Checking message history for trimming")
+        messages = state.get("messages", [])
+
+        # finalize just returned: the synthesis input is now fixed, so start the synthesis
+        # call while the agent takes its closing turn
+        if self._synthesis_kwargs is not None and self._early_synthesis is None and messages \
+                and _is_finalize_result(messages[-1]):
+            logger.info("Pre-hook: finalize returned - starting terminal synthesis early")
+            self._early_synthesis = (messages[-1].tool_call_id, asyncio.create_task(asyncio.to_thread(
+                node_final_synthesis, results={"messages": list(messages)}, **self._synthesis_kwargs
+            )))
+
+        # If more than 25 messages, trim to last 20
+        if len(messages) > MAX_HISTORY_MESSAGES:
+            logger.info(f"Trimming messages from {len(messages)} to 20")
+
+            # Clear history by only returning trimmed messages (don't use RemoveMessage with agent.invoke)
+            # RemoveMessage objects cause "Got unknown type" errors when passed through agent
+            return {"messages": _trim_history(messages)}
+
+        logger.info(f"Messages count {len(messages)} within limit, no trimming needed")
+
+        # Rate limiting: Reserve tokens for upcoming LLM call
+        if self.rate_limiter:
+            try:
+                if HAS_TIKTOKEN:
+                    # Running total; only messages added since the previous step are encoded
+                    input_tokens = self._count_input_tokens(messages)
+                else:
                     # Convert messages to BaseMessage objects if needed for token counting
-                    converted_messages = []
-                    for msg in messages:
-                        # Already a BaseMessage
-                        if hasattr(msg, 'type'):
-                            converted_messages.append(msg)
-                        # Dict format - convert based on type
-                        elif isinstance(msg, dict):
-                            msg_type = msg.get('type', 'human')
-                            content = msg.get('content', '')
-
-                            if msg_type == 'remove':
-                                continue  # Skip RemoveMessage in token counting
-
-                            if msg_type == 'human':
-                                converted_messages.append(HumanMessage(content=content))
-                            elif msg_type in ['ai', 'assistant']:
-                                converted_messages.append(AIMessage(content=content))
-                            elif msg_type == 'system':
-                                converted_messages.append(SystemMessage(content=content))
-                            elif msg_type == 'tool':
-                                converted_messages.append(ToolMessage(content=content, tool_call_id=msg.get('tool_call_id', '')))
+                    # The agent's history is all BaseMessage (the initial prompt included), so
+                    # conversion only runs for callers that pass raw dict messages
+                    converted_messages = messages
+                    if not all(hasattr(msg, 'type') for msg in messages):
+                        converted_messages = []
+                        for msg in messages:
+                            # Already a BaseMessage
+                            if hasattr(msg, 'type'):
+                                converted_messages.append(msg)
+                            # Dict format - convert based on type
+                            elif isinstance(msg, dict):
+                                msg_type = msg.get('type', 'human')
+                                content = msg.get('content', '')
+
+                                if msg_type == 'remove':
+                                    continue  # Skip RemoveMessage in token counting
+
+                                if msg_type == 'human':
+                                    converted_messages.append(HumanMessage(content=content))
+                                elif msg_type in ['ai', 'assistant']:
+                                    converted_messages.append(AIMessage(content=content))
+                                elif msg_type == 'system':
+                                    converted_messages.append(SystemMessage(content=content))
+                                elif msg_type == 'tool':
+                                    converted_messages.append(ToolMessage(content=content, tool_call_id=msg.get('tool_call_id', '')))
+                                else:
+                                    # Default to HumanMessage
+                                    converted_messages.append(HumanMessage(content=str(msg)))
                             else:
-                                # Default to HumanMessage
+                                # Fallback for other formats
                                 converted_messages.append(HumanMessage(content=str(msg)))
-                        else:
-                            # Fallback for other formats
-                            converted_messages.append(HumanMessage(content=str(msg)))
 
                     # Use LLM's built-in token counting for accurate count
                     input_tokens = self.llm.get_num_tokens_from_messages(converted_messages)
 
-                    logger.info(f"Pre-hook: Counted {input_tokens:,} input tokens, calling rate limiter")
-
-                    # Track timing around rate limiter call
-                    rate_limiter_start = time.time()
+                # Fast path: covered by the limiter's local lease, no await and no Redis round trip
+                if self.rate_limiter.try_acquire(input_tokens):
+                    return {}
+
+                logger.info(f"Pre-hook: Counted {input_tokens:,} input tokens, calling rate limiter")
+
+                # Track timing around rate limiter call
+                rate_limiter_start = time.time()
+
+                # Reserve tokens (async, can be interrupted by timeouts)
+                success = await self.rate_limiter.reserve_tokens(
+                    token_count=input_tokens,
+                    max_wait=30.0  # Wait up to 30 seconds (reduced from 120s)
+                )
+
+                rate_limiter_duration = time.time() - rate_limiter_start
+                logger.info(f"Pre-hook: Rate limiter completed in {rate_limiter_duration:.2f}s (success={success})")
+
+                if not success:
+                    logger.error(f"Pre-hook: Rate limiter timeout after {rate_limiter_duration:.1f}s - proceeding anyway")
+            except Exception as e:
+                logger.error(f"Pre-hook: Rate limiter error: {e} - proceeding anyway", exc_info=True)
+
+        # No trimming needed
+        return {}
+
+    async def _take_early_synthesis(self, raw_result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Synthesis started at finalize, or None if there was none or the run moved past it"""
+        early, self._early_synthesis = self._early_synthesis, None
+        self._synthesis_kwargs = None
+        if early is None:
+            return None
+        finalize_call_id, task = early
+        # Located by id, since the pre-hook may have trimmed the history after the snapshot
+        after = _messages_after(raw_result.get("messages", []), finalize_call_id)
+        if after is None or any(_tool_call_pairs(m) for m in after):
+            # The agent kept researching after finalize; the early result is discarded
+            self._discard_task(task)
+            logger.info("Agent called tools after finalize - re-running synthesis on the full history")
+            return None
+        return await task
+
+    def _cancel_early_synthesis(self) -> None:
+        """Drop the synthesis started at finalize when the agent run did not complete"""
+        early, self._early_synthesis = self._early_synthesis, None
+        self._synthesis_kwargs = None
+        if early is not None:
+            self._discard_task(early[1])
 
-                    # Reserve tokens (async, can be interrupted by timeouts)
-                    success = await self.rate_limiter.reserve_tokens(
-                        token_count=input_tokens,
-                        max_wait=30.0  # Wait up to 30 seconds (reduced from 120s)
-                    )
-
-                    rate_limiter_duration = time.time() - rate_limiter_start
-                    logger.info(f"Pre-hook: Rate limiter completed in {rate_limiter_duration:.2f}s (success={success})")
-
-                    if not success:
-                        logger.error(f"Pre-hook: Rate limiter timeout after {rate_limiter_duration:.1f}s - proceeding anyway")
-                except Exception as e:
-                    logger.error(f"Pre-hook: Rate limiter error: {e} - proceeding anyway", exc_info=True)
-
-            # No trimming needed
-            return {}
-
-        return prehook
+    @staticmethod
+    def _discard_task(task: asyncio.Task) -> None:
+        """Cancel a task nobody will await, retrieving its outcome so failures are not reported as unhandled"""
+        task.cancel()
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+    def _count_input_tokens(self, messages: List[Any]) -> int:
+        """Token estimate for the history, encoding only the messages appended since the last call"""
+        counted = self._counted_messages
+        if counted and len(messages) >= counted and messages[counted - 1] is self._last_counted_message:
+            self._history_tokens += _count_message_tokens(messages[counted:])
+        else:
+            # First step, or the history was trimmed/replaced: recount from scratch
+            self._history_tokens = _count_message_tokens(messages)
+        self._counted_messages = len(messages)
+        self._last_counted_message = messages[-1] if messages else None
+        return self._history_tokens
 
-    def create_llm_posthook(self) -> Callable:
+    def _posthook(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Create post-model hook that runs after each LLM call in ReAct loop.
+        Post-model hook that runs after each LLM call in ReAct loop.
 
         Detects termination conditions and sets routing signals:
         - finalize tool called → should_continue=False
@@ -383,118 +813,107 @@ Be concise, factual, and transparent about evidence quality."""
         - Max steps reached → should_continue=False
 
         Also tracks tool usage and injects budget reminder messages.
+        """
+        messages = state.get("messages", [])
+        if not messages:
+            return {}
 
-        Returns:
-            Callable with signature (state) -> state_update
-        """
-        def posthook(state: Dict[str, Any]) -> Dict[str, Any]:
-            """
-            Detect termination conditions, track budget, and inject budget messages.
-            """
-            messages = state.get("messages", [])
-            if not messages:
-                return {}
-
-            last_message = messages[-1]
-            # logging.info("Remaining steps after LLM call:", extra={"remaining_steps": remaining_steps})
-
-            # Check if last message has tool calls (handle multiple formats)
-            tool_calls = getattr(last_message, "tool_calls", None) or \
-                        getattr(last_message, "additional_kwargs", {}).get("tool_calls")
-
-            # Check message type - is it an AI message?
-            message_type = getattr(last_message, "type", None) or last_message.get("type")
-            is_ai_message = message_type in ["ai", "assistant"]
-
-            # Track tool usage and decrement budget
-            if tool_calls:
-                tool_names = [tc.get('name') if isinstance(tc, dict) else getattr(tc, 'name', 'unknown')
-                             for tc in tool_calls]
-                logger.info(f"Post-hook: Agent called {len(tool_calls)} tool(s): {tool_names}")
-
-                # Decrement budget based on actual usage (parameters, not just tool calls)
-                for tc in tool_calls:
-                    tool_name = tc.get('name') if isinstance(tc, dict) else getattr(tc, 'name', 'unknown')
-
-                    # Extract args to count actual usage
-                    args = tc.get('args') if isinstance(tc, dict) else getattr(tc, 'args', {})
-
-                    # Calculate actual usage based on tool type
-                    if tool_name == 'serp':
-                        # serp budget is per query, not per tool call
-                        queries = args.get('queries', []) if isinstance(args, dict) else []
-                        usage_count = len(queries) if queries else 1
-                    elif tool_name == 'crawl':
-                        # crawl budget is per URL, not per tool call
-                        urls = args.get('urls', []) if isinstance(args, dict) else []
-                        usage_count = len(urls) if urls else 1
-                    else:
-                        # Other tools count as 1 per call
-                        usage_count = 1
-
-                    # Decrement budget (clamp at 0)
-                    if tool_name in self.budget_remaining:
-                        self.budget_remaining[tool_name] = max(0, self.budget_remaining[tool_name] - usage_count)
-                        logger.info(f"Post-hook: Decremented {tool_name} budget by {usage_count} to {self.budget_remaining[tool_name]}")
-
-                # Check if finalize was called
-                if "finalize" in tool_names:
-                    logger.info("Post-hook: Finalize tool called - stopping research loop")
-                    return {
-                        "should_continue": False,
-                        "termination_reason": "finalize_requested",
-                        "budget_remaining": self.budget_remaining.copy()
-                    }
-
-            # Format budget message
-            # budget_parts = [f"{count} {tool}" for tool, count in self.budget_remaining.items()]
-            budget_parts = []
-            for tool, count in self.budget_remaining.items():
-                if tool == "urls":
-                    budget_parts.append(f"{count} URLs to crawl")
-                elif tool == "serp":
-                    budget_parts.append(f"{count} SERP queries")
-                else:
-                    budget_parts.append(f"{count} {tool} tool calls")
-            budget_str = f"Budget Remaining: {', '.join(budget_parts)}"
-            logger.info(f"Post-hook: {budget_str}")
+        last_message = messages[-1]
+        # logging.info("Remaining steps after LLM call:", extra={"remaining_steps": remaining_steps})
 
-            # Inject budget message into conversation
-            from langchain_core.messages import HumanMessage
-            budget_message = HumanMessage(content=f"[System] {budget_str}")
+        # (name, args) for each tool call on the last message
+        tool_calls = _tool_call_pairs(last_message)
 
-            # Continue the loop with budget message
-            return {
-                "budget_remaining": self.budget_remaining.copy(),
-                "messages": [budget_message]
-            }
+        # Check message type - is it an AI message?
+        message_type = getattr(last_message, "type", None) or last_message.get("type")
+        is_ai_message = message_type in ["ai", "assistant"]
+
+        # Track tool usage and decrement budget
+        if tool_calls:
+            tool_names = [tool_name for tool_name, _ in tool_calls]
+            logger.info("Post-hook: Agent called %d tool(s): %s", len(tool_calls), tool_names)
+
+            # Decrement budget based on actual usage (parameters, not just tool calls)
+            budget_index, budget_counts = self._budget_index, self._budget_counts
+            for tool_name, args in tool_calls:
+                # Calculate actual usage based on tool type
+                usage_count = _USAGE_EXTRACTORS.get(tool_name, _one_use)(args if isinstance(args, dict) else {})
 
-        return posthook
+                # Decrement budget (clamp at 0)
+                idx = budget_index.get(tool_name)
+                if idx is not None:
+                    budget_counts[idx] = max(0, budget_counts[idx] - usage_count)
+                    logger.info(f"Post-hook: Decremented {tool_name} budget by {usage_count} to {budget_counts[idx]}")
+
+            # Check if finalize was called
+            if "finalize" in tool_names:
+                logger.info("Post-hook: Finalize tool called - stopping research loop")
+                return {
+                    "should_continue": False,
+                    "termination_reason": "finalize_requested",
+                    "budget_remaining": self.budget_remaining
+                }
+
+        # Only remind the agent when a budget moved since the last reminder; an unchanged
+        # reminder just adds prompt tokens to every following turn
+        snapshot = tuple(self._budget_counts)
+        if snapshot == self._last_budget_snapshot:
+            return {"budget_remaining": self.budget_remaining}
+        self._last_budget_snapshot = snapshot
+
+        # Format budget message
+        budget_str = self._budget_fmt.format(*snapshot)
+        logger.info(f"Post-hook: {budget_str}")
+
+        # Inject budget message into conversation
+        from langchain_core.messages import HumanMessage
+        budget_message = HumanMessage(content=f"[System] {budget_str}")
+
+        # Continue the loop with budget message
+        return {
+            "budget_remaining": self.budget_remaining,
+            "messages": [budget_message]
+        }
+
+    def _set_budget(self, tools_budgeting: Dict[str, Any]):
+        """Load per-tool budgets into parallel arrays and precompile the budget message format"""
+        self._budget_tools = list(tools_budgeting)
+        self._budget_index = {tool: idx for idx, tool in enumerate(self._budget_tools)}
+        self._budget_counts = array('i', map(_budget_count, tools_budgeting.values()))
+        self._budget_fmt = "Budget Remaining: " + ", ".join(
+            "{} " + _budget_label(tool).replace("{", "{{").replace("}", "}}") for tool in self._budget_tools
+        )
+        # Budgets as last shown to the agent (the ReAct prompt lists the initial ones)
+        self._last_budget_snapshot = tuple(self._budget_counts)
+
+    @property
+    def budget_remaining(self) -> Dict[str, int]:
+        """Snapshot of the remaining per-tool budgets"""
+        return dict(zip(self._budget_tools, self._budget_counts))
 
     def create_react_prompt(self, plan: Dict[str, Any]) -> str:
         """
         Load and format the ReAct agent prompt from react_agent.md template.
 
+        Memoized on the serialized plan, this instance's context and the date; plans that
+        orjson can't serialize are formatted without the cache.
+
         Args:
             plan: Plan dict from triage with goal, instructions, stopping_criteria, etc.
 
         Returns:
             Formatted prompt string for ReAct agent
         """
-        from datetime import datetime
-
-        react_agent_prompt_path = os.path.join(self.prompts_dir, "react_agent.md")
-
-        with open(react_agent_prompt_path, "r") as f:
-            prompt_template = f.read()
-
-        # Format instructions - convert list to numbered string
-        instructions_raw = plan.get("instructions", [])
-        if isinstance(instructions_raw, list):
-            instructions_str = "\n".join([f"{i+1}. {instr}" for i, instr in enumerate(instructions_raw)])
-        else:
-            instructions_str = str(instructions_raw)
+        # Get current date for time-aware agent execution
+        current_date = date.today().isoformat()
+        try:
+            plan_json = orjson.dumps(plan).decode()
+        except TypeError:
+            return _render_react_prompt(plan, self._prompt_context, current_date)
+        return _format_react_prompt(plan_json, self._prompt_context_blob, current_date)
 
+    def _build_prompt_context(self) -> Dict[str, str]:
+        """ReAct prompt placeholders that depend only on the company and datapoint context"""
         # Format company context
         company_context_str = f"""
 - Industry: {self.company_context.get('industry', 'N/A')}
@@ -503,28 +922,30 @@ Be concise, factual, and transparent about evidence quality."""
 - Description: {self.company_context.get('description', 'N/A')}
         """.strip()
 
-        # Get current date for time-aware agent execution
-        current_datetime = datetime.now().date().isoformat()
-
-        tools_budget_dict = plan.get("tools_budgeting", {})
-        tools_budget_str = ", ".join([f"{v} {k} tool calls" for k, v in tools_budget_dict.items()])
-
-        prompt = prompt_template.replace("{{goal}}", plan.get("goal", "")) \
-                                .replace("{{instructions}}", instructions_str) \
-                                .replace("{{stopping_criteria}}", plan.get("stopping_criteria", "")) \
-                                .replace("{{dp_name}}", self.datapoint_context.get("dp_name", "")) \
-                                .replace("{{company_domain}}", self.company_context.get("domain", "")) \
-                                .replace("{{company_name}}", self.company_context.get("name", "")) \
-                                .replace("{{company_context}}", company_context_str) \
-                                .replace("{{current_datetime}}", current_datetime) \
-                                .replace("{{definition}}", self.datapoint_context.get("description", "")) \
-                                .replace("{{value_ranges}}", json.dumps(self.datapoint_context.get("value_ranges", {}), indent=2)) \
-                                .replace("{{tools_budgeting}}", tools_budget_str) \
-                                .replace("{{max_serp}}", str(plan.get("tools_budgeting", {}).get("serp", 5))) \
-                                .replace("{{max_crawl}}", str(plan.get("tools_budgeting", {}).get("crawl", 10))) \
-                                .replace("{{max_ai_overview}}", str(plan.get("tools_budgeting", {}).get("ai_overview", 2))) \
-
-        return prompt
+        return {
+            "dp_name": self.datapoint_context.get("dp_name", ""),
+            "company_domain": self.company_context.get("domain", ""),
+            "company_name": self.company_context.get("name", ""),
+            "company_context": company_context_str,
+            "definition": self.datapoint_context.get("description", ""),
+            "value_ranges": json.dumps(self.datapoint_context.get("value_ranges", {}), indent=2),
+        }
+
+    def _react_prompt_message(self, formatted_prompt: str) -> HumanMessage:
+        """
+        Initial ReAct message carrying the formatted prompt.
+
+        The prompt is the first message of every model call in the ReAct loop (up to ~50),
+        so it is the prefix the provider can cache. Providers that need an explicit
+        breakpoint get it marked with cache_control; the prompt text is unchanged.
+        Built as a HumanMessage up front so the history never holds a dict that the
+        hooks would have to convert on every step.
+        """
+        if self.llm.model_name.startswith(PROMPT_CACHE_CONTROL_PREFIXES):
+            content = [{"type": "text", "text": formatted_prompt, "cache_control": {"type": "ephemeral"}}]
+        else:
+            content = formatted_prompt
+        return HumanMessage(content=content)
 
     def build_agent(self) -> Any:
         """
@@ -533,9 +954,6 @@ Be concise, factual, and transparent about evidence quality."""
         Returns:
             Compiled LangGraph agent
         """
-
-        # Load synthesis prompt for response_format
-        synthesis_prompt = self._load_synthesis_prompt()
         # state = self.initialize_state("Initial prompt for agent build")
 
         # # Step 2: Run planning step to generate plan
@@ -546,17 +964,7 @@ Be concise, factual, and transparent about evidence quality."""
         # print(formatted_prompt)
 
         # Create ReAct agent with response_format for structured synthesis
-        # Note: Don't bind_tools to model manually - let create_react_agent handle it
-        agent = create_react_agent(
-            model=self.llm,
-            tools=self.tools,
-            # prompt=formatted_prompt,
-            pre_model_hook=self.create_llm_prehook(),
-            post_model_hook=self.create_llm_posthook(),
-            state_schema=self.create_state_schema(),
-            context_schema=ContextSchema,
-            version="v2"
-        )
+        agent = _compile_react_agent(self.llm, self.tools)
 
         logger.info("ReAct agent built successfully with structured synthesis response")
         return agent
@@ -578,22 +986,36 @@ Be concise, factual, and transparent about evidence quality."""
         Returns:
             Final state dict with results
         """
-        logger.info(f"ReactGraph.invoke() called with prompt: {prompt}")
+        logger.info("ReactGraph.invoke() called with prompt: %s", prompt)
+
+        redis = _get_agent_cache_redis()
+        cache_key = self._cache_key(prompt)
+        if redis is not None:
+            try:
+                hit = redis.get(cache_key)
+                if hit:
+                    logger.info(f"ReactGraph answer cache hit for {self.datapoint_context.get('dp_name', 'unknown')}")
+                    return orjson.loads(hit)
+            except Exception as e:
+                logger.warning(f"ReactGraph answer cache read failed: {e}")
         # from leadora.adapters.agentic_adapters.llm_adapter import LLMAdapter
         
         # Step 1: Initialize state with user message
         state = self.initialize_state(prompt)
 
         # Step 2: Run planning step to generate plan
-        plan = self.run_planning_step(state)
+        plan = _triage_cache_get(cache_key)
+        if plan is None:
+            plan = self.run_planning_step(state)
+            _triage_cache_put(cache_key, plan)
         state["goal"] = plan.get("goal", "")
         state["instructions"] = plan.get("instructions", "")
         state["stopping_criteria"] = plan.get("stopping_criteria", "")
         state["tools_budgeting"] = plan.get("tools_budgeting", {})
 
         # Initialize budget tracking from triage
-        self.budget_remaining = plan.get("tools_budgeting", {}).copy()
-        state["budget_remaining"] = self.budget_remaining.copy()
+        self._set_budget(plan.get("tools_budgeting", {}))
+        state["budget_remaining"] = self.budget_remaining
 
         # Step 3: Create formatted prompt using plan
         formatted_prompt = self.create_react_prompt(plan)
@@ -601,8 +1023,7 @@ Be concise, factual, and transparent about evidence quality."""
 
         # Step 4: Generate thread_id for budget tracking
 
-        logging.info("Generated plan for ReAct agent:")
-        logging.info(json.dumps(plan, indent=2))
+        self._log_plan(plan)
 
         # Step 5: Invoke agent with formatted prompt
         logger.info("Invoking ReAct agent with formatted prompt")
@@ -612,17 +1033,20 @@ Be concise, factual, and transparent about evidence quality."""
             config = {}
         config["recursion_limit"] = 100  # Increase from default 25 to 100
 
-        raw_result = self.agent.invoke(
-            {
-                "messages": [
-                    {
-                        "type": "human",
-                        "content": formatted_prompt
-                    }
-                ],
-            },
-            config=config
-        )
+        # The compiled agent may be shared; its hooks dispatch to this instance
+        active_token = _active_graph.set(self)
+        try:
+            raw_result = self.agent.invoke(
+                {
+                    "messages": [self._react_prompt_message(formatted_prompt)],
+                },
+                config=config
+            )
+        finally:
+            _active_graph.reset(active_token)
+            if self.rate_limiter:
+                # Unspent leased tokens go back to the shared TPM window
+                self.rate_limiter.release_lease()
         logger.info("ReAct agent completed - running terminal synthesis")
 
         # Step 6: Run terminal synthesis to generate structured response
@@ -639,7 +1063,7 @@ Be concise, factual, and transparent about evidence quality."""
 
         # Check if search_linkedin_posts_tool was used and add LinkedIn URL to citations
         tools_used = synthesis_result.get('tools_used', [])
-        logger.info(f"Tools used in synthesis: {tools_used}")
+        logger.info("Tools used in synthesis: %s", tools_used)
         if self.prospect and 'search_linkedin_posts_tool' in tools_used:
             linkedin_simple = getattr(self.prospect, 'linkedin_simple_data', None)
             linkedin_url = getattr(linkedin_simple, 'linkedin_url', None) if linkedin_simple else None
@@ -652,7 +1076,15 @@ Be concise, factual, and transparent about evidence quality."""
 
         raw_result["structured_response"] = synthesis_result
 
-        logger.info(f"Pipeline complete - termination: {synthesis_result}")
+        # Failed syntheses aren't cached, so the next run retries instead of serving the fallback
+        if redis is not None and self._synthesis_succeeded(synthesis_result):
+            try:
+                redis.set(cache_key, self._cache_payload(raw_result), ex=AGENT_CACHE_TTL)
+            except Exception as e:
+                logger.warning(f"ReactGraph answer cache write failed: {e}")
+
+        # Lazy %-formatting: the synthesis dict is only rendered if the record is emitted
+        logger.info("Pipeline complete - termination: %s", synthesis_result)
         # print("Final result:")
         # print(raw_result)
         # print(json.dumps(raw_result, indent=2))
@@ -677,28 +1109,42 @@ Be concise, factual, and transparent about evidence quality."""
         Returns:
             Final state dict with results
         """
-        logger.info(f"ReactGraph.ainvoke() called with prompt: {prompt}")
+        logger.info("ReactGraph.ainvoke() called with prompt: %s", prompt)
+
+        redis = _get_agent_cache_async_redis()
+        cache_key = self._cache_key(prompt)
+        if redis is not None:
+            try:
+                hit = await redis.get(cache_key)
+                if hit:
+                    logger.info(f"ReactGraph answer cache hit for {self.datapoint_context.get('dp_name', 'unknown')}")
+                    return orjson.loads(hit)
+            except Exception as e:
+                logger.warning(f"ReactGraph answer cache read failed: {e}")
 
         # Step 1: Initialize state with user message
         state = self.initialize_state(prompt)
 
-        # Step 2: Run planning step to generate plan
-        plan = self.run_planning_step(state)
+        # Step 2: Run planning step to generate plan; triage is a blocking LLM call, so it
+        # runs in a worker thread and other agents on this loop keep making progress
+        plan = _triage_cache_get(cache_key)
+        if plan is None:
+            plan = await asyncio.to_thread(self.run_planning_step, state)
+            _triage_cache_put(cache_key, plan)
         state["goal"] = plan.get("goal", "")
         state["instructions"] = plan.get("instructions", "")
         state["stopping_criteria"] = plan.get("stopping_criteria", "")
         state["tools_budgeting"] = plan.get("tools_budgeting", {})
 
         # Initialize budget tracking from triage
-        self.budget_remaining = plan.get("tools_budgeting", {}).copy()
-        state["budget_remaining"] = self.budget_remaining.copy()
+        self._set_budget(plan.get("tools_budgeting", {}))
+        state["budget_remaining"] = self.budget_remaining
 
         # Step 3: Create formatted prompt using plan
         formatted_prompt = self.create_react_prompt(plan)
 
         # Step 4: Generate thread_id for budget tracking
-        logging.info("Generated plan for ReAct agent:")
-        logging.info(json.dumps(plan, indent=2))
+        self._log_plan(plan)
 
         # Step 5: Invoke agent with formatted prompt (async)
         logger.info("Invoking ReAct agent with formatted prompt (async)")
@@ -708,34 +1154,54 @@ Be concise, factual, and transparent about evidence quality."""
             config = {}
         config["recursion_limit"] = 100  # Increase from default 25 to 100
 
-        raw_result = await self.agent.ainvoke(
-            {
-                "messages": [
-                    {
-                        "type": "human",
-                        "content": formatted_prompt
-                    }
-                ],
-            },
-            config=config
-        )
+        # Synthesis inputs, so the pre-hook can start synthesis once finalize returns
+        self._synthesis_kwargs = {
+            "company_context": self.company_context,
+            "competitor_context": self.competitor_context,
+            "datapoint_definition": self.datapoint_context,
+            "goal": state["goal"],
+            "instructions": state["instructions"],
+        }
+        self._early_synthesis = None
+
+        # The compiled agent may be shared; its hooks dispatch to this instance
+        active_token = _active_graph.set(self)
+        agent_finished = False
+        try:
+            raw_result = await self.agent.ainvoke(
+                {
+                    "messages": [self._react_prompt_message(formatted_prompt)],
+                },
+                config=config
+            )
+            agent_finished = True
+        finally:
+            _active_graph.reset(active_token)
+            if not agent_finished:
+                # The run raised or was cancelled: the early synthesis would never be awaited
+                self._cancel_early_synthesis()
+            if self.rate_limiter:
+                # Unspent leased tokens go back to the shared TPM window
+                self.rate_limiter.release_lease()
         logger.info("ReAct agent completed - running terminal synthesis")
 
         # Step 6: Run terminal synthesis to generate structured response
-        # This ALWAYS runs regardless of how the ReAct loop ended
-
-        synthesis_result = node_final_synthesis(
-            results=raw_result,
-            company_context=self.company_context,
-            competitor_context=self.competitor_context,
-            datapoint_definition=self.datapoint_context,
-            goal=state["goal"],
-            instructions=state["instructions"],
-        )
+        # This ALWAYS runs regardless of how the ReAct loop ended; when finalize was called
+        # it is usually already in flight from the pre-hook
+        synthesis_result = await self._take_early_synthesis(raw_result)
+        if synthesis_result is None:
+            synthesis_result = node_final_synthesis(
+                results=raw_result,
+                company_context=self.company_context,
+                competitor_context=self.competitor_context,
+                datapoint_definition=self.datapoint_context,
+                goal=state["goal"],
+                instructions=state["instructions"],
+            )
 
         # Check if search_linkedin_posts_tool was used and add LinkedIn URL to citations
         tools_used = synthesis_result.get('tools_used', [])
-        logger.info(f"Tools used in synthesis: {tools_used}")
+        logger.info("Tools used in synthesis: %s", tools_used)
         if self.prospect and 'search_linkedin_posts_tool' in tools_used:
             linkedin_simple = getattr(self.prospect, 'linkedin_simple_data', None)
             linkedin_url = getattr(linkedin_simple, 'linkedin_url', None) if linkedin_simple else None
@@ -748,17 +1214,116 @@ Be concise, factual, and transparent about evidence quality."""
 
         raw_result["structured_response"] = synthesis_result
 
-        logger.info(f"Pipeline complete - termination: {synthesis_result}")
+        # Failed syntheses aren't cached, so the next run retries instead of serving the fallback
+        if redis is not None and self._synthesis_succeeded(synthesis_result):
+            try:
+                await redis.set(cache_key, self._cache_payload(raw_result), ex=AGENT_CACHE_TTL)
+            except Exception as e:
+                logger.warning(f"ReactGraph answer cache write failed: {e}")
 
-        # Cleanup: Close async client to prevent resource warnings
-        try:
-            if hasattr(self.llm, 'async_client') and self.llm.async_client:
-                await self.llm.async_client.aclose()
-        except Exception as e:
-            logger.warning(f"Failed to close LLM async client: {e}")
+        # Lazy %-formatting: the synthesis dict is only rendered if the record is emitted
+        logger.info("Pipeline complete - termination: %s", synthesis_result)
 
+        # The LLM HTTP clients are shared across instances; they're closed by ReactGraph.close()
         return raw_result
 
+    @classmethod
+    async def abatch(
+        cls,
+        items: List[Tuple[str, Dict[str, Any], Dict[str, Any], Dict[str, Any]]],
+        concurrency: int = BATCH_CONCURRENCY,
+        config: Optional[Dict[str, Any]] = None
+    ) -> List[Any]:
+        """
+        Run many agents concurrently on the current event loop.
+
+        All instances share the pooled LLM HTTP clients and the pre-loaded prompt
+        templates; the semaphore caps how many agents are in flight at once.
+
+        Args:
+            items: (prompt, company_context, competitor_context, datapoint_context) tuples
+            concurrency: Max agents running at the same time
+            config: Optional LangGraph config, copied per agent
+
+        Returns:
+            One entry per item, in order: the ainvoke() result, or the exception it raised
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _run(prompt, company_context, competitor_context, datapoint_context):
+            async with semaphore:
+                graph = cls(company_context, competitor_context, datapoint_context)
+                return await graph.ainvoke(prompt, config=dict(config) if config else None)
+
+        logger.info(f"ReactGraph.abatch(): {len(items)} agents, concurrency={concurrency}")
+        return await asyncio.gather(*(_run(*item) for item in items), return_exceptions=True)
+
+    @staticmethod
+    def _log_plan(plan: Dict[str, Any]):
+        """Log the triage plan; serialization is skipped when INFO is disabled"""
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Generated plan for ReAct agent:\n%s",
+                        orjson.dumps(plan, option=orjson.OPT_INDENT_2, default=str).decode())
+
+    def _cache_key(self, prompt: Optional[str]) -> str:
+        """Answer cache key: the research target, the datapoint and the question"""
+        canonical = orjson.dumps({
+            "company": (self.company_context or {}).get("domain"),
+            "competitor": (self.competitor_context or {}).get("domain"),
+            "dp": self.datapoint_context.get("dp_name"),
+            "definition": self.datapoint_context.get("description") or self.datapoint_context.get("definition"),
+            "prompt": prompt
+        }, option=orjson.OPT_SORT_KEYS)
+        return f"agent:{hashlib.sha256(canonical).hexdigest()}"
+
+    @staticmethod
+    def _synthesis_succeeded(synthesis_result: Dict[str, Any]) -> bool:
+        """False for node_final_synthesis's error fallback"""
+        return not str(synthesis_result.get("answer", "")).startswith(SYNTHESIS_FAILED_PREFIX)
+
+    @staticmethod
+    def _cache_payload(raw_result: Dict[str, Any]) -> bytes:
+        """
+        The part of a run serialize_response() reads
+
+        LangChain messages aren't cached: a cache hit carries an empty "messages" list,
+        so parse_result_messages() yields no tool calls or results for it.
+        """
+        return orjson.dumps({
+            "messages": [],
+            "structured_response": raw_result.get("structured_response"),
+            "metrics": raw_result.get("metrics", {})
+        }, default=str)
+
+    @staticmethod
+    async def close():
+        """Close the shared LLM HTTP connection pools and answer cache pools (call once on shutdown)"""
+        global _llm_http_client
+        for async_client in list(_llm_async_clients.values()):
+            try:
+                await async_client.aclose()
+            except Exception as e:
+                logger.warning(f"Failed to close LLM async client: {e}")
+        _llm_async_clients.clear()
+        # Cached agents reference the clients just closed
+        _loop_agents.clear()
+        _sync_agents.clear()
+        if _llm_http_client is not None:
+            _llm_http_client.close()
+            _llm_http_client = None
+
+        async_redis = _get_agent_cache_async_redis()
+        redis = _get_agent_cache_redis()
+        _get_agent_cache_async_redis.cache_clear()
+        _get_agent_cache_redis.cache_clear()
+        try:
+            if async_redis is not None:
+                await async_redis.close()
+            if redis is not None:
+                redis.close()
+        except Exception as e:
+            logger.warning(f"Failed to close ReactGraph answer cache: {e}")
+
     @staticmethod
     def serialize_response(result: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -788,8 +1353,6 @@ Be concise, factual, and transparent about evidence quality."""
             }
         """
         logger.info("Serializing ReactGraph response - extracting synthesis results")
-        print("Result before db serialization:")
-        print(result)
         # Extract structured_response (SynthesisResponse)
         structured_response = result.get('structured_response')
         metrics = result.get('metrics', {})
@@ -8,6 +8,7 @@ Node Responsibilities:
 """
 import logging
 import os
+import orjson
 from typing import Dict, Any, Optional
 from dataclasses import dataclass, field
 from .state import AgenticRunState
@@ -98,6 +99,9 @@ TRIAGE_PROMPT = os.path.join(PROMPTS_DIR, "triage.md")
 QIA_PROMPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "qia_agent", "agentic_prompts")
 FINAL_SYNTHESIS_PROMPT = os.path.join(QIA_PROMPTS_DIR, "final_raw_synthesis.md")
 
+# Prefix of the fallback answer node_final_synthesis returns when synthesis raised
+SYNTHESIS_FAILED_PREFIX = "Synthesis failed: "
+
 def node_triage(state: AgenticRunState) -> Dict[str, Any]:
     """
     Planning node: Convert user prompt to research plan using comprehensive triage prompt
@@ -151,7 +155,7 @@ def node_triage(state: AgenticRunState) -> Dict[str, Any]:
         )
 
         # Parse JSON response
-        result = json.loads(response_text.strip().replace("```json", "").replace("```", ""))
+        result = orjson.loads(response_text.strip().replace("```json", "").replace("```", ""))
 
         logger.info(f"Triage result: {result}")
         # Build budgets
@@ -340,7 +344,7 @@ def node_final_synthesis(results, company_context: Dict[str, Any], competitor_co
         Dict with: structured_response (SynthesisResponse), final_answer (str), final_confidence (float)
     """
     from .utils import pack_messages_for_synthesis
-    from .graph import SynthesisResponse
+    from .graph import SYNTHESIS_RESPONSE_FORMAT
     import os
 
     logger.info(f"Final synthesis starting - termination reason: {results.get('termination_reason', 'unknown')}")
@@ -395,28 +399,6 @@ If no finalize was called, synthesize based on all evidence collected throughout
 - Match by domain name, or company name + location/industry/size
 - Ignore data from companies with similar names unless verified
 
-**Output Format (respond with valid JSON only):**
-{{{{
-  "answer": "4-6 sentence summary about the COMPETITOR with evidence",
-  "insights": [
-    "Short insight 1 about the competitor (one sentence)",
-    "Short insight 2 about the competitor (one sentence)",
-    "Short insight 3 about the competitor (one sentence)"
-  ],
-  "suggested_actions": [
-    "Specific recommendation 1 for YOUR company based on competitor finding",
-    "Specific recommendation 2 for YOUR company based on competitor finding"
-  ],
-  "concern_level": 1-5,
-  "concern_rationale": "Why this datapoint should concern YOUR company at this level",
-  "confidence": 0.0-1.0,
-  "dp_value": "exact extracted value",
-  "evidence_summary": {{{{
-    "key_findings": ["finding 1", "finding 2"],
-    "limitations": ["limitation 1"]
-  }}}}
-}}}}
-
 **Field Requirements:**
 - answer: 4-6 sentences summary about the COMPETITOR in non-technical language
 - insights: 3-5 short, actionable insights about the COMPETITOR (one sentence each)
@@ -432,7 +414,7 @@ Compacted conversation history:
 
 {packed_messages}
 
-Now produce the final synthesis as valid JSON adhering to the format and requirements above.
+Now produce the final synthesis as valid JSON adhering to the response schema and the requirements above.
 """
 
         # Use OpenRouterAdapter for synthesis
@@ -453,11 +435,13 @@ Now produce the final synthesis as valid JSON adhering to the format and require
             prompt=prompt,
             model="google/gemini-2.5-flash",
             temperature=0,
-            max_output_tokens=4000
+            max_output_tokens=4000,
+            # Provider-native structured output; the JSON shape comes from SynthesisResponse
+            extra_body={"response_format": SYNTHESIS_RESPONSE_FORMAT}
         )
 
         # Parse JSON response
-        synthesis_dict = json.loads(response_text.strip().replace("```json", "").replace("```", ""))
+        synthesis_dict = orjson.loads(response_text.strip().replace("```json", "").replace("```", ""))
 
         logger.info(f"Final synthesis completed - answer: {synthesis_dict.get('answer', 'N/A')}, confidence: {synthesis_dict.get('confidence', 0.0)}")
         # Add tools_used metadata to synthesis_dict
@@ -470,7 +454,7 @@ Now produce the final synthesis as valid JSON adhering to the format and require
 
         # Return a valid synthesis dict structure on error
         return {
-            "answer": f"Synthesis failed: {str(e)}",
+            "answer": f"{SYNTHESIS_FAILED_PREFIX}{str(e)}",
             "confidence": 0.0,
             "mapping_rationale": "",
             "dp_value": "",
@@ -8,11 +8,17 @@ import redis
 import time
 import asyncio
 import logging
+import os
 import uuid
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# Cap on the tokens reserved ahead of need per slow-path reservation. The lease is sized from
+# the observed per-step growth, spent by try_acquire() without a Redis round trip and its
+# unspent part handed back by release_lease() (0 disables leasing)
+LEASE_TOKENS = int(os.getenv("RATE_LIMIT_LEASE_TOKENS", "50000"))
+
 
 class RedisRateLimiter:
     """
@@ -26,7 +32,7 @@ class RedisRateLimiter:
     All operations are atomic without needing transactions.
     """
 
-    def __init__(self, redis_client: redis.Redis, bucket_key: str, tpm_limit: int):
+    def __init__(self, redis_client: redis.Redis, bucket_key: str, tpm_limit: int, lease_tokens: int = LEASE_TOKENS):
         """
         Initialize rate limiter.
 
@@ -34,6 +40,7 @@ class RedisRateLimiter:
             redis_client: Redis connection
             bucket_key: Redis key for this rate limiter
             tpm_limit: Tokens per minute limit (e.g., 1,000,000 for Gemini)
+            lease_tokens: Max tokens reserved ahead of need per Redis reservation (kept as local lease)
         """
         if tpm_limit <= 0:
             raise ValueError("TPM limit must be positive.")
@@ -43,6 +50,16 @@ class RedisRateLimiter:
         self.limit = tpm_limit
         self.window_seconds = 60  # 1 minute window
 
+        # Local lease: tokens already recorded in Redis but not yet used, valid for one window
+        self.lease_tokens = min(max(0, lease_tokens), tpm_limit)
+        self._lease_remaining = 0
+        self._lease_expires = 0.0
+        # Sorted-set member and score of the reservation holding the lease (for release_lease)
+        self._lease_member: Optional[str] = None
+        self._lease_score = 0.0
+        # Previous request size; the next request is expected to grow by the same delta
+        self._last_request_tokens = 0
+
         logger.info(f"RedisRateLimiter initialized: key={bucket_key}, limit={tpm_limit:,} TPM")
 
     def _cleanup_expired(self):
@@ -92,6 +109,45 @@ class RedisRateLimiter:
         except Exception as e:
             logger.error(f"Failed to get current usage: {e}")
             return 0
+    def try_acquire(self, token_count: int) -> bool:
+        """
+        Take tokens from the local lease without touching Redis (never waits).
+
+        The lease was already counted in the shared window when it was reserved, so
+        spending it keeps the distributed total correct.
+
+        Returns:
+            True if the lease covered the request, False if reserve_tokens() is needed
+        """
+        if token_count <= self._lease_remaining and time.monotonic() < self._lease_expires:
+            self._lease_remaining -= token_count
+            self._last_request_tokens = token_count
+            return True
+        return False
+
+    def release_lease(self):
+        """
+        Hand the unspent lease back to the shared window.
+
+        The reservation's member is rewritten with the tokens actually used, at its original
+        timestamp, so other workers see the freed tokens straight away.
+        """
+        remaining, self._lease_remaining = self._lease_remaining, 0
+        member, self._lease_member = self._lease_member, None
+        if not remaining or member is None or time.monotonic() >= self._lease_expires:
+            return
+
+        request_id, reserved = member.rsplit(':', 1)
+        try:
+            # MULTI/EXEC: readers never see the reservation both removed and re-added
+            pipe = self.redis.pipeline()
+            pipe.zrem(self.bucket_key, member)
+            pipe.zadd(self.bucket_key, {f"{request_id}:{int(reserved) - remaining}": self._lease_score})
+            pipe.execute()
+            logger.debug(f"Rate limiter: Released {remaining:,} leased tokens")
+        except Exception as e:
+            logger.warning(f"Rate limiter: Failed to release {remaining:,} leased tokens: {e}")
+
     # TODO TEST THIS LOGIC PROPERLY
     async def reserve_tokens(self, token_count: int, max_wait: float = 60.0, request_id: Optional[str] = None) -> bool:
         """
@@ -113,6 +169,9 @@ class RedisRateLimiter:
         if request_id is None:
             request_id = str(uuid.uuid4())
 
+        # The current lease can't cover this request; return what's left of it first
+        self.release_lease()
+
         start_time = time.time()
         retry_count = 0
 
@@ -137,9 +196,14 @@ class RedisRateLimiter:
                 available = self.limit - current_usage
 
                 if available >= token_count:
-                    # We have space - reserve the tokens
+                    # We have space - reserve the tokens, plus a lease for about one more step:
+                    # the history resent by the next call grows by roughly this step's delta
+                    step_delta = max(0, token_count - self._last_request_tokens) if self._last_request_tokens else 0
+                    lease = min(token_count + step_delta, self.lease_tokens, available - token_count)
+                    reserved = token_count + lease
+                    self._last_request_tokens = token_count
                     now = time.time()
-                    member_name = f"{request_id}:{token_count}"
+                    member_name = f"{request_id}:{reserved}"
 
                     # Add to sorted set with current timestamp as score
                     self.redis.zadd(self.bucket_key, {member_name: now})
@@ -147,6 +211,13 @@ class RedisRateLimiter:
                     # Set expiration on the key to prevent memory leak
                     self.redis.expire(self.bucket_key, self.window_seconds * 2)
 
+                    # The reservation leaves the window after window_seconds, so must its lease
+                    self._lease_remaining = lease
+                    self._lease_expires = time.monotonic() + self.window_seconds
+                    if lease:
+                        self._lease_member = member_name
+                        self._lease_score = now
+
                     total_wait = time.time() - start_time
                     logger.info(
                         f"Rate limiter: ✅ Reserved {token_count:,} tokens after {total_wait:.2f}s "
@@ -48,6 +48,9 @@ async def pdf_tool(
     except Exception as e:
         logger.error(f"PDF tool failed: {e}")
         return f"Error processing PDF: {str(e)}"
+
+    finally:
+        await pdf_adapter.close()
     
 async def google_ads_tool(
     domain: str,
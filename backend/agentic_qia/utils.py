@@ -1,7 +1,30 @@
 import json
+import orjson
+import re
+from functools import lru_cache
 from typing import Any, Dict, List, Tuple
 import logging
 
+# "{{name}}" prompt template placeholders
+_PLACEHOLDER_RE = re.compile(r'{{(\w+)}}')
+
+
+@lru_cache(maxsize=64)
+def _split_prompt(template: str) -> Tuple[str, ...]:
+    """Split a template once into alternating literal text and placeholder names"""
+    return tuple(_PLACEHOLDER_RE.split(template))
+
+
+def fill_prompt(template: str, values: Dict[str, str]) -> str:
+    """Substitute {{name}} placeholders in one pass; unknown placeholders are left as-is"""
+    parts = _split_prompt(template)
+    out = list(parts)
+    for i in range(1, len(parts), 2):
+        name = parts[i]
+        out[i] = values.get(name, "{{" + name + "}}")
+    return "".join(out)
+
+
 def _coerce_tool_args(args: Any) -> Dict[str, Any]:
     """Args may be dicts or JSON strings; normalize to dict."""
     if args is None:
@@ -296,7 +319,7 @@ def pack_messages_for_synthesis(state: Dict[str, Any]) -> tuple[List[Dict[str, s
             # Format content
             if isinstance(finalize_content, (dict, list)):
                 try:
-                    content_str = json.dumps(finalize_content, ensure_ascii=False, indent=2)
+                    content_str = orjson.dumps(finalize_content, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
                 except (TypeError, ValueError):
                     content_str = str(finalize_content)
             else:
@@ -338,7 +361,7 @@ def pack_messages_for_synthesis(state: Dict[str, Any]) -> tuple[List[Dict[str, s
             # Format content for LLM
             if isinstance(content, (dict, list)):
                 try:
-                    content_str = json.dumps(content, ensure_ascii=False, indent=2)
+                    content_str = orjson.dumps(content, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
                 except (TypeError, ValueError) as e:
                     # JSON serialization failed - fall back to string
                     print(f"Warning: JSON serialization failed for message {i}: {e}")
@@ -4,17 +4,23 @@ FastAPI backend for company profile and solutions analysis.
 
 Endpoints:
   GET /profile_competitors_solution - Generate company profile and solutions list
+  POST /profile_competitors_solution_batch - Generate profiles for several domains concurrently
   POST /save_company_profile - Save company profile to database and run agentic pipeline
   GET /health - Health check
 """
 
+import os
+import asyncio
+import re
 import logging
-import json
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 
+import msgspec
+import orjson
 from fastapi import FastAPI, HTTPException, Query, Depends
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
@@ -22,7 +28,7 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm.attributes import flag_modified
 
 from api_clients.gemini_adapter import GeminiAPI
-from database import get_db
+from database import get_db, SessionLocal
 from db_models import *
 
 # Configure logging
@@ -36,11 +42,72 @@ logger = logging.getLogger(__name__)
 WORKSPACE_ROOT = Path(__file__).parent
 PROMPTS_DIR = WORKSPACE_ROOT / "prompts"
 
+# Strips an optional scheme and a single trailing slash from a lowercased domain
+_DOMAIN_STRIP = re.compile(r'^(?:https?://)?(.*?)/?$', re.DOTALL)
+
+# Markdown code fences around JSON in LLM responses
+_JSON_FENCE_OPEN = b"```json"
+_JSON_FENCE_CLOSE = b"```"
+
+# Prompt templates are read from disk once per process; set PROMPT_CACHE=off to re-read on every call
+PROMPT_CACHE_ENABLED = os.getenv("PROMPT_CACHE", "on").lower() != "off"
+
+# Fixed wrappers around the Gemini prompt templates, built once at import. The templates
+# themselves contain literal braces (JSON examples), so they are appended rather than formatted.
+_COMPANY_QUERY_HEAD = """
+Please analyze the company at domain {domain} and generate a comprehensive company profile.
+
+Use Web Search Grounding to:
+1. Find website content about the company
+2. Find LinkedIn company information
+3. Research competitors in the market
+4. Validate market position and offerings
+
+Then generate the JSON profile according to the OUTPUT_STRUCTURE.
+
+Company Domain: {domain}
+
+"""
+
+_SOLUTIONS_QUERY_HEAD = """
+Please analyze the solutions provided by {domain} based on the following company profile and their website content.
+
+Use Web Search Grounding to:
+1. Find information about each solution/product
+2. Gather customer reviews and testimonials
+3. Identify competitive alternatives
+4. Research market adoption and pricing
+5. Validate benefits and use cases
+
+Company Profile:
+"""
+
+_SOLUTIONS_QUERY_TAIL = """
+
+Generate the JSON array of enhanced solution profiles according to the FINAL OUTPUT STRUCTURE.
+"""
+
+# Max domains analyzed concurrently by the batch endpoint (size to the Gemini QPM tier)
+BATCH_MAX_CONCURRENT_DOMAINS = int(os.getenv("BATCH_MAX_CONCURRENT_DOMAINS", "5"))
+
+# Shared msgspec JSON encoder for the profile endpoints' Struct responses
+_MSGSPEC_ENCODER = msgspec.json.Encoder()
+
+
+class MsgspecResponse(JSONResponse):
+    """JSON response rendered with msgspec's encoder."""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return _MSGSPEC_ENCODER.encode(content)
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Company Intelligence API",
     description="API for generating company profiles and solutions analysis",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -60,14 +127,45 @@ class HealthResponse(BaseModel):
     message: str = Field(..., description="Status message")
 
 
-class ProfileCompetitorsSolutionResponse(BaseModel):
-    """Response model for profile competitors solution endpoint."""
+class ProfileCompetitorsSolutionResponse(msgspec.Struct):
+    """
+    Response model for profile competitors solution endpoint.
+    
+    A msgspec Struct rather than a pydantic model: the payload is built from trusted
+    internal data, so it is encoded directly by MsgspecResponse without validation.
+    """
+    domain: str  # Company domain analyzed
+    company_profile: Dict[str, Any]  # Company profile JSON
+    solutions_profile: List[Dict[str, Any]]  # Solutions profile array
+    analysis_metadata: Dict[str, Any]  # Analysis metadata
+
+
+class ProfileCompetitorsSolutionBatchRequest(BaseModel):
+    """Request model for the batch profile competitors solution endpoint."""
+    domains: List[str] = Field(..., description="Company domains to analyze")
+    model: str = Field("gemini-3-pro-preview", description="Gemini model to use")
+
+
+class ProfileCompetitorsSolutionBatchResponse(msgspec.Struct):
+    """Response model for the batch profile competitors solution endpoint."""
+    results: List[ProfileCompetitorsSolutionResponse]  # Successfully analyzed domains
+    errors: Dict[str, str] = msgspec.field(default_factory=dict)  # Error message per failed domain
+
+
+class ProfileCompetitorsSolutionSchema(BaseModel):
+    """OpenAPI schema of ProfileCompetitorsSolutionResponse; documentation only, never instantiated."""
     domain: str = Field(..., description="Company domain analyzed")
     company_profile: Dict[str, Any] = Field(..., description="Company profile JSON")
     solutions_profile: List[Dict[str, Any]] = Field(..., description="Solutions profile array")
     analysis_metadata: Dict[str, Any] = Field(..., description="Analysis metadata")
 
 
+class ProfileCompetitorsSolutionBatchSchema(BaseModel):
+    """OpenAPI schema of ProfileCompetitorsSolutionBatchResponse; documentation only, never instantiated."""
+    results: List[ProfileCompetitorsSolutionSchema] = Field(..., description="Successfully analyzed domains")
+    errors: Dict[str, str] = Field(default_factory=dict, description="Error message per failed domain")
+
+
 class ErrorResponse(BaseModel):
     """Error response model."""
     error: str = Field(..., description="Error message")
@@ -187,7 +285,15 @@ class TimelineResponse(BaseModel):
 
 
 def load_prompt_template(prompt_name: str) -> str:
-    """Load a prompt template from the prompts directory."""
+    """Load a prompt template from the prompts directory (cached in memory unless PROMPT_CACHE=off)."""
+    if PROMPT_CACHE_ENABLED:
+        return _read_prompt_template(prompt_name)
+    return _read_prompt_template.__wrapped__(prompt_name)
+
+
+@lru_cache(maxsize=None)
+def _read_prompt_template(prompt_name: str) -> str:
+    """Read a prompt template from disk."""
     prompt_path = PROMPTS_DIR / prompt_name
     if not prompt_path.exists():
         logger.error(f"Prompt file not found: {prompt_path}")
@@ -199,43 +305,27 @@ def load_prompt_template(prompt_name: str) -> str:
 
 def clean_domain(domain: str) -> str:
     """Clean up domain input."""
-    domain = domain.lower().strip()
-    if domain.startswith("http://"):
-        domain = domain[7:]
-    if domain.startswith("https://"):
-        domain = domain[8:]
-    if domain.endswith("/"):
-        domain = domain[:-1]
-    return domain
+    return _DOMAIN_STRIP.match(domain.lower().strip()).group(1)
 
 
 def parse_json_response(response: str, field_name: str) -> Any:
     """Parse JSON from response text, handling markdown code blocks."""
     try:
-        cleaned_response = response.strip()
+        # Extract content between ```json and the closing ``` (or the end of the text),
+        # even when the model wrote text before the code block. Surrounding whitespace
+        # is valid JSON, so the payload is decoded without further trimming.
+        # The response is encoded once and orjson reads a zero-copy view of the payload.
+        data = response.encode()
+        payload = memoryview(data)
         
-        # Handle case where response has text before the JSON code block
-        if "```json" in cleaned_response:
-            # Extract content between ```json and ```
-            start_marker = "```json"
-            end_marker = "```"
-            
-            start_idx = cleaned_response.find(start_marker)
-            if start_idx != -1:
-                # Start after the ```json marker
-                start_idx += len(start_marker)
-                # Find the closing ``` after the start
-                end_idx = cleaned_response.find(end_marker, start_idx)
-                if end_idx != -1:
-                    cleaned_response = cleaned_response[start_idx:end_idx]
-                else:
-                    # No closing marker, take everything after ```json
-                    cleaned_response = cleaned_response[start_idx:]
-        
-        cleaned_response = cleaned_response.strip()
+        start = data.find(_JSON_FENCE_OPEN)
+        if start != -1:
+            start += len(_JSON_FENCE_OPEN)
+            end = data.find(_JSON_FENCE_CLOSE, start)
+            payload = payload[start:end if end != -1 else len(data)]
         
-        return json.loads(cleaned_response)
-    except json.JSONDecodeError as e:
+        return orjson.loads(payload)
+    except orjson.JSONDecodeError as e:
         logger.error(f"Failed to parse {field_name} JSON: {e}")
         logger.error(f"Response was: {response[:500]}...")
         raise ValueError(f"Invalid JSON response for {field_name}")
@@ -286,7 +376,7 @@ def run_agentic_pipeline(profile_data: dict) -> dict:
     return mock_result
 
 
-def generate_company_profile(gemini_api: GeminiAPI, domain: str) -> dict:
+async def generate_company_profile(gemini_api: GeminiAPI, domain: str) -> dict:
     """
     Generate a company profile for the given domain.
     
@@ -303,25 +393,16 @@ def generate_company_profile(gemini_api: GeminiAPI, domain: str) -> dict:
     template = load_prompt_template("company_profile.md")
     
     # Create the search query
-    search_query = f"""
-Please analyze the company at domain {domain} and generate a comprehensive company profile.
-
-Use Web Search Grounding to:
-1. Find website content about the company
-2. Find LinkedIn company information
-3. Research competitors in the market
-4. Validate market position and offerings
-
-Then generate the JSON profile according to the OUTPUT_STRUCTURE.
-
-Company Domain: {domain}
-
-{template}
-"""
+    search_query = "".join((
+        _COMPANY_QUERY_HEAD.format_map({"domain": domain}),
+        template,
+        "\n",
+    ))
     
     try:
-        # Get the response from Gemini with Google Search
-        response = gemini_api.get_google_search_response(
+        # Get the response from Gemini with Google Search (blocking SDK call, run off the event loop)
+        response = await asyncio.to_thread(
+            gemini_api.get_google_search_response,
             prompt=search_query,
             model_name="gemini-3-pro-preview",
             thinking_budget=2000,
@@ -339,7 +420,7 @@ Company Domain: {domain}
         raise
 
 
-def generate_solutions_profile(gemini_api: GeminiAPI, domain: str, company_profile: dict) -> list:
+async def generate_solutions_profile(gemini_api: GeminiAPI, domain: str, company_profile: dict) -> list:
     """
     Generate solutions profile based on company profile.
     
@@ -357,30 +438,21 @@ def generate_solutions_profile(gemini_api: GeminiAPI, domain: str, company_profi
     template = load_prompt_template("solutions_profile.md")
     
     # Convert company profile to formatted string
-    company_profile_str = json.dumps(company_profile, indent=2)
+    company_profile_str = orjson.dumps(company_profile, option=orjson.OPT_INDENT_2).decode()
     
     # Create the search query
-    search_query = f"""
-Please analyze the solutions provided by {domain} based on the following company profile and their website content.
-
-Use Web Search Grounding to:
-1. Find information about each solution/product
-2. Gather customer reviews and testimonials
-3. Identify competitive alternatives
-4. Research market adoption and pricing
-5. Validate benefits and use cases
-
-Company Profile:
-{company_profile_str}
-
-{template}
-
-Generate the JSON array of enhanced solution profiles according to the FINAL OUTPUT STRUCTURE.
-"""
+    search_query = "".join((
+        _SOLUTIONS_QUERY_HEAD.format_map({"domain": domain}),
+        company_profile_str,
+        "\n\n",
+        template,
+        _SOLUTIONS_QUERY_TAIL,
+    ))
     
     try:
-        # Get the response from Gemini with Google Search
-        response = gemini_api.get_google_search_response(
+        # Get the response from Gemini with Google Search (blocking SDK call, run off the event loop)
+        response = await asyncio.to_thread(
+            gemini_api.get_google_search_response,
             prompt=search_query,
             model_name="gemini-3-pro-preview",
             thinking_budget=3000,
@@ -560,7 +632,7 @@ async def get_company_profile(
     gemini_api = GeminiAPI(model_id="gemini-3-pro-preview")
 
     # Generate company profile
-    company_profile = generate_company_profile(gemini_api, clean_domain_str)
+    company_profile = await generate_company_profile(gemini_api, clean_domain_str)
 
     # Save to database
     if company:
@@ -622,7 +694,7 @@ async def get_solutions(
     # We need the company profile first
     if not company or not company.profile:
         gemini_api = GeminiAPI(model_id="gemini-3-pro-preview")
-        company_profile = generate_company_profile(gemini_api, clean_domain_str)
+        company_profile = await generate_company_profile(gemini_api, clean_domain_str)
 
         if not company:
             company = Company(domain=clean_domain_str, profile=company_profile, solutions=[])
@@ -637,7 +709,7 @@ async def get_solutions(
         gemini_api = GeminiAPI(model_id="gemini-3-pro-preview")
 
     # Generate solutions
-    solutions_profile = generate_solutions_profile(gemini_api, clean_domain_str, company_profile)
+    solutions_profile = await generate_solutions_profile(gemini_api, clean_domain_str, company_profile)
 
     company.solutions = solutions_profile
     flag_modified(company, "solutions")
@@ -1370,9 +1442,107 @@ async def health_check():
     )
 
 
+async def analyze_domain(clean_domain_str: str, model: str, db: Session) -> ProfileCompetitorsSolutionResponse:
+    """
+    Return the cached analysis for a cleaned domain, or generate and auto-save a new one.
+    
+    Args:
+        clean_domain_str: Domain already passed through clean_domain
+        model: Gemini model to use
+        db: Database session
+    
+    Returns:
+        ProfileCompetitorsSolutionResponse: Company profile and solutions profiles
+    """
+    # Step 1: Check if company exists in database
+    logger.info(f"Checking database for cached profile: {clean_domain_str}")
+    cached_company = db.query(Company).filter(
+        Company.domain == clean_domain_str
+    ).first()
+    
+    if cached_company:
+        logger.info(f"✓ Found cached company in database for {clean_domain_str}")
+        
+        # Optional: Deserialize using schema classes for validation/manipulation
+        # profile_obj = CompanyProfileSchema.from_dict(cached_company.profile)
+        # solutions_objs = [SolutionSchema.from_dict(s) for s in cached_company.solutions]
+        
+        return ProfileCompetitorsSolutionResponse(
+            domain=cached_company.domain,
+            company_profile=cached_company.profile,
+            solutions_profile=cached_company.solutions,
+            analysis_metadata={
+                "source": "database_cache",
+                "cached": True,
+                "company_id": cached_company.id
+            }
+        )
+    
+    logger.info(f"Profile not found in database, generating new analysis for {clean_domain_str}")
+    
+    # Initialize Gemini API
+    gemini_api = GeminiAPI(model_id=model)
+    logger.info(f"Initialized Gemini API with model: {model}")
+    
+    # Step 2: Generate company profile
+    logger.info("Starting company profile generation...")
+    company_profile = await generate_company_profile(gemini_api, clean_domain_str)
+    
+    # Step 3: Generate solutions profile
+    logger.info("Starting solutions profile generation...")
+    solutions_profile = await generate_solutions_profile(gemini_api, clean_domain_str, company_profile)
+    
+    # Prepare metadata
+    analysis_metadata = {
+        "input_tokens": gemini_api.input_tokens,
+        "output_tokens": gemini_api.output_tokens,
+        "thinking_tokens": gemini_api.thinking_tokens,
+        "model_used": model,
+        "company_name": company_profile.get("name", "Unknown"),
+        "solutions_count": len(solutions_profile),
+        "industry": company_profile.get("core_business", {}).get("industry", "Unknown"),
+        "source": "generated",
+        "cached": False
+    }
+    
+    logger.info(f"Analysis complete for {clean_domain_str}")
+    
+    # Step 4: Auto-save the generated profile to the database
+    logger.info(f"Auto-saving generated profile to database for {clean_domain_str}")
+    try:
+        # Optional: Validate using schema classes before saving
+        # profile_obj = CompanyProfileSchema.from_dict(company_profile)
+        # validated_profile = profile_obj.to_dict()
+        # solutions_objs = [SolutionSchema.from_dict(s) for s in solutions_profile]
+        # validated_solutions = [s.to_dict() for s in solutions_objs]
+        
+        new_company = Company(
+            domain=clean_domain_str,
+            profile=company_profile,  # Store raw dict in JSONB
+            solutions=solutions_profile  # Store raw list in JSONB
+        )
+        db.add(new_company)
+        db.commit()
+        logger.info(f"✓ Profile auto-saved to database with ID: {new_company.id}")
+    except IntegrityError:
+        db.rollback()
+        logger.warning(f"Company already exists in database, skipping auto-save")
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"Failed to auto-save company: {e}")
+    
+    return ProfileCompetitorsSolutionResponse(
+        domain=clean_domain_str,
+        company_profile=company_profile,
+        solutions_profile=solutions_profile,
+        analysis_metadata=analysis_metadata
+    )
+
+
 @app.get(
     "/profile_competitors_solution",
-    response_model=ProfileCompetitorsSolutionResponse,
+    response_class=MsgspecResponse,
+    responses={200: {"model": ProfileCompetitorsSolutionSchema}},
     summary="Generate Company Profile and Solutions Analysis",
     description="Analyzes a company domain and returns its profile, competitors, and solutions with comprehensive market intelligence. Returns cached data from database if available."
 )
@@ -1388,7 +1558,7 @@ async def profile_competitors_solution(
         example="gemini-3-pro-preview"
     ),
     db: Session = Depends(get_db)
-) -> ProfileCompetitorsSolutionResponse:
+) -> Response:
     """
     Generate company profile and solutions analysis for a given domain.
     
@@ -1405,7 +1575,7 @@ async def profile_competitors_solution(
         db: Database session (injected)
     
     Returns:
-        ProfileCompetitorsSolutionResponse: Company profile and solutions profiles
+        MsgspecResponse: Encoded ProfileCompetitorsSolutionResponse
     
     Raises:
         HTTPException: If analysis fails
@@ -1422,89 +1592,7 @@ async def profile_competitors_solution(
                 detail=f"Invalid domain format: {domain}"
             )
         
-        # Step 1: Check if company exists in database
-        logger.info(f"Checking database for cached profile: {clean_domain_str}")
-        cached_company = db.query(Company).filter(
-            Company.domain == clean_domain_str
-        ).first()
-        
-        if cached_company:
-            logger.info(f"✓ Found cached company in database for {clean_domain_str}")
-            
-            # Optional: Deserialize using schema classes for validation/manipulation
-            # profile_obj = CompanyProfileSchema.from_dict(cached_company.profile)
-            # solutions_objs = [SolutionSchema.from_dict(s) for s in cached_company.solutions]
-            
-            return ProfileCompetitorsSolutionResponse(
-                domain=cached_company.domain,
-                company_profile=cached_company.profile,
-                solutions_profile=cached_company.solutions,
-                analysis_metadata={
-                    "source": "database_cache",
-                    "cached": True,
-                    "company_id": cached_company.id
-                }
-            )
-        
-        logger.info(f"Profile not found in database, generating new analysis for {clean_domain_str}")
-        
-        # Initialize Gemini API
-        gemini_api = GeminiAPI(model_id=model)
-        logger.info(f"Initialized Gemini API with model: {model}")
-        
-        # Step 2: Generate company profile
-        logger.info("Starting company profile generation...")
-        company_profile = generate_company_profile(gemini_api, clean_domain_str)
-        
-        # Step 3: Generate solutions profile
-        logger.info("Starting solutions profile generation...")
-        solutions_profile = generate_solutions_profile(gemini_api, clean_domain_str, company_profile)
-        
-        # Prepare metadata
-        analysis_metadata = {
-            "input_tokens": gemini_api.input_tokens,
-            "output_tokens": gemini_api.output_tokens,
-            "thinking_tokens": gemini_api.thinking_tokens,
-            "model_used": model,
-            "company_name": company_profile.get("name", "Unknown"),
-            "solutions_count": len(solutions_profile),
-            "industry": company_profile.get("core_business", {}).get("industry", "Unknown"),
-            "source": "generated",
-            "cached": False
-        }
-        
-        logger.info(f"Analysis complete for {clean_domain_str}")
-        
-        # Step 4: Auto-save the generated profile to the database
-        logger.info(f"Auto-saving generated profile to database for {clean_domain_str}")
-        try:
-            # Optional: Validate using schema classes before saving
-            # profile_obj = CompanyProfileSchema.from_dict(company_profile)
-            # validated_profile = profile_obj.to_dict()
-            # solutions_objs = [SolutionSchema.from_dict(s) for s in solutions_profile]
-            # validated_solutions = [s.to_dict() for s in solutions_objs]
-            
-            new_company = Company(
-                domain=clean_domain_str,
-                profile=company_profile,  # Store raw dict in JSONB
-                solutions=solutions_profile  # Store raw list in JSONB
-            )
-            db.add(new_company)
-            db.commit()
-            logger.info(f"✓ Profile auto-saved to database with ID: {new_company.id}")
-        except IntegrityError:
-            db.rollback()
-            logger.warning(f"Company already exists in database, skipping auto-save")
-        except Exception as e:
-            db.rollback()
-            logger.warning(f"Failed to auto-save company: {e}")
-        
-        return ProfileCompetitorsSolutionResponse(
-            domain=clean_domain_str,
-            company_profile=company_profile,
-            solutions_profile=solutions_profile,
-            analysis_metadata=analysis_metadata
-        )
+        return MsgspecResponse(content=await analyze_domain(clean_domain_str, model, db))
         
     except HTTPException:
         raise
@@ -1516,10 +1604,122 @@ async def profile_competitors_solution(
         )
 
 
+@app.post(
+    "/profile_competitors_solution_batch",
+    response_class=MsgspecResponse,
+    responses={200: {"model": ProfileCompetitorsSolutionBatchSchema}},
+    summary="Generate Company Profiles and Solutions Analysis for Several Domains",
+    description="Runs the profile_competitors_solution pipeline for each domain concurrently. Failed domains are reported in `errors` instead of failing the whole batch."
+)
+async def profile_competitors_solution_batch(
+    request: ProfileCompetitorsSolutionBatchRequest
+) -> Response:
+    """
+    Generate company profile and solutions analysis for several domains at once.
+    
+    Domains are analyzed concurrently, at most BATCH_MAX_CONCURRENT_DOMAINS at a time,
+    each with its own database session.
+    
+    Args:
+        request: Domains to analyze and Gemini model to use
+    
+    Returns:
+        MsgspecResponse: Encoded ProfileCompetitorsSolutionBatchResponse
+    
+    Raises:
+        HTTPException: If no valid domain is provided
+    """
+    errors: Dict[str, str] = {}
+    clean_domains: List[str] = []
+    for domain in request.domains:
+        clean_domain_str = clean_domain(domain)
+        if not clean_domain_str or '.' not in clean_domain_str:
+            errors[domain] = f"Invalid domain format: {domain}"
+        elif clean_domain_str not in clean_domains:
+            clean_domains.append(clean_domain_str)
+    
+    if not clean_domains:
+        raise HTTPException(
+            status_code=400,
+            detail="No valid domains provided"
+        )
+    
+    logger.info(f"Processing batch request for {len(clean_domains)} domains")
+    semaphore = asyncio.Semaphore(BATCH_MAX_CONCURRENT_DOMAINS)
+    
+    async def run_one(clean_domain_str: str) -> ProfileCompetitorsSolutionResponse:
+        async with semaphore:
+            # A Session isn't safe to share between concurrent tasks (and the scoped
+            # Session is per thread, so every task would get the same one)
+            db = SessionLocal()
+            try:
+                response = await analyze_domain(clean_domain_str, request.model, db)
+                db.commit()
+                return response
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+    
+    outcomes = await asyncio.gather(
+        *(run_one(d) for d in clean_domains),
+        return_exceptions=True
+    )
+    
+    results: List[ProfileCompetitorsSolutionResponse] = []
+    for clean_domain_str, outcome in zip(clean_domains, outcomes):
+        if isinstance(outcome, Exception):
+            logger.error(f"Error analyzing {clean_domain_str} in batch: {outcome}")
+            errors[clean_domain_str] = str(outcome)
+        else:
+            results.append(outcome)
+    
+    logger.info(f"Batch analysis complete: {len(results)} succeeded, {len(errors)} failed")
+    
+    return MsgspecResponse(content=ProfileCompetitorsSolutionBatchResponse(
+        results=results,
+        errors=errors
+    ))
+
+
+@app.post(
+    "/webhooks/apify",
+    summary="Apify Actor Run Webhook",
+    description="Receives Apify ad-hoc webhooks for finished actor runs started with APIFY_WEBHOOK_URL "
+                "and APIFY_WEBHOOK_SECRET set. Requires the shared secret as the token query parameter."
+)
+async def apify_webhook(payload: Dict[str, Any], token: Optional[str] = Query(None)):
+    """
+    Wake the Google Ads scrape waiting on a finished Apify actor run.
+    
+    Only the run ID is taken from the payload; the scrape re-fetches the run from the Apify API.
+    
+    Args:
+        payload: Apify webhook payload; the run object is in its "resource" field
+        token: Shared secret (APIFY_WEBHOOK_SECRET) embedded in the webhook URL
+    
+    Returns:
+        dict: Acknowledgement
+    
+    Raises:
+        HTTPException: 403 if the secret is missing or wrong
+    """
+    from agentic_adapters.google_adds_adapter import resolve_apify_run, verify_apify_webhook_secret
+    
+    if not verify_apify_webhook_secret(token):
+        raise HTTPException(status_code=403, detail="Invalid webhook token")
+    
+    run_id = (payload.get("resource") or {}).get("id")
+    logger.info(f"Apify webhook {payload.get('eventType')} for run {run_id}")
+    resolve_apify_run(run_id)
+    return {"status": "success"}
+
+
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
     """Custom HTTP exception handler."""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "error": "Request failed",
@@ -1532,7 +1732,7 @@ async def http_exception_handler(request, exc):
 async def general_exception_handler(request, exc):
     """General exception handler."""
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": "Internal server error",
@@ -1546,6 +1746,21 @@ async def startup_event():
     """Initialize database on startup."""
     logger.info("Initializing database on startup...")
     logger.info("Database initialization complete")
+    from agentic_adapters.utils import start_log_listener
+    start_log_listener()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close shared connection pools on shutdown."""
+    from agentic_adapters.api_crawlers import close_scrapingdog_clients
+    await close_scrapingdog_clients()
+    from agentic_adapters.pdf_adapter import close_pdf_resources
+    await close_pdf_resources()
+    from agentic_adapters.google_adds_adapter import close_google_ads_resources
+    await close_google_ads_resources()
+    from agentic_adapters.utils import stop_log_listener
+    stop_log_listener()
 
 
 if __name__ == "__main__":